@@ -1,70 +1,58 @@
 # A Basic  Cralwer for getting the Job Title and Description
 # from schwarzesbrett.bremen.de
 
-import requests
-from lxml import html
+import asyncio
+
+from extractors import parse
+from fetch_engine import AsyncFetchEngine
+from status_diagnostics import ErrorReport, StatusExplainer
 
 print()
-# HTTP-Anfrage
-def request_page(url):
-    print(f"Try to connect to: {url}")
-    response = requests.get(url)
-    print(f"Response Status Code: {response.status_code}" )
+# Auswertung einer HTTP-Antwort (Abruf über die gemeinsame AsyncFetchEngine)
+def request_page(result, error_report):
+    print(f"Try to connect to: {result.url}")
+    print(f"Response Status Code: {result.status}" )
 
-    if response.status_code == 200:
+    if result.ok:
         print("--> Seite erfolgreich geladen!")
-        return response.content, response.status_code
-    
+        return result.content
+
     else:
         print("--> Fehler beim Abrufen der Seite!")
-        response_code = response.status_code
-
-        print("\nFehlercode Analyse ...")
-        moz_url = "https://developer.mozilla.org/en-US/docs/Web/HTTP/Reference/Status/"
-        moz_full_url = moz_url + str(response_code)
-        print(f"Fehlerbeschreibung gefunden: {moz_full_url}")
-
-        moz_response = requests.get(moz_full_url)
-        # print(moz_response.status_code)
-
-        return moz_response.content, response.status_code
+        if result.status is None:
+            print(f"Keine Antwort: {result.error}")
+        # Fehler nur sammeln, die Erklärung gibt es einmal pro Status am Ende des Laufs
+        error_report.add(result.url, result.status)
+        return None
 
 
 def parse_html(content):
-    tree = html.fromstring(content)
+    tree = parse(content)
     return tree
 
-def extract_statuscode_details(tree):
-    page_title = tree.xpath('/html/body/div[1]/div/div[3]/main/article/header/h1/text()') # Need to add the text() to the copied stuff to get the text!!
-    if page_title:
-        page_title = page_title[0].strip()
-    else:
-        page_title = "No H1 Title"
 
-    page_description_paragraphs = tree.xpath('/html/body/div[1]/div/div[3]/main/article/div/p')
-    page_description = ""
-    for paragraph in page_description_paragraphs:
-        # Extrahiert nur den Text 
-        text_nodes = paragraph.xpath('string()')    # liest auch Tags aus
-        page_description += text_nodes.strip() + " "
-    
-    page_description.strip()
-    print("\n Info about the Response Code from MDN \n")
-    print(f"Response Code: {page_title}")
-    print(f"Description: {page_description} \n")
+async def main():
+    urls = [
+        "https://schwarzesbrett.bremen.de/verkauf-angebote/rubrik/arbeitsplatzangebote.html",
+        # "https://www.wikipedia.org/test",
+    ]
 
+    error_report = ErrorReport()
+    # Statuscodes aus der mitgelieferten Tabelle, unbekannte einmalig von MDN (Cache in status_cache.json)
+    explainer = StatusExplainer()
 
-def main():
-    url = "https://schwarzesbrett.bremen.de/verkauf-angebote/rubrik/arbeitsplatzangebote.html"
-    # url = "https://www.wikipedia.org/test"
+    async with AsyncFetchEngine() as engine:
+        # Alle Seiten gleichzeitig abrufen, Auswertung in der Reihenfolge der Antworten
+        async for result in engine.fetch_all(urls):
+            response_content = request_page(result, error_report)
 
-    response_content, status_code = request_page(url)
+            if response_content:
+                tree = parse_html(response_content)
+                print("HTML erfolgreich geparst")
 
-    if status_code != 200:
-        tree = parse_html(response_content)
-        extract_statuscode_details(tree)
-    else:
-        tree = parse_html(response_content)
-        print("HTML erfolgreich geparst")
+        if error_report:
+            print("\nFehlercode Analyse ...\n")
+            print(await error_report.summary(explainer, engine))
+            print()
 
-main()
\ No newline at end of file
+asyncio.run(main())
@@ -0,0 +1,98 @@
+# benchmark_extractors.py
+# Vergleicht die Auswertung von Produktseiten: BeautifulSoup (html.parser, wie bisher in
+# crawl_multi_page.py) gegen lxml mit den vorkompilierten Selektoren aus extractors.py.
+# Gemessen wird auf gespeicherten Seiten, damit das Netzwerk keine Rolle spielt.
+#
+# Seiten einmal speichern:  python benchmark_extractors.py --download 20 --pages-dir saved_pages
+# Messen:                   python benchmark_extractors.py --pages-dir saved_pages [--repeat 5]
+
+import argparse
+import os
+import statistics
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+from extractors import SCRAPEME_LISTING, SCRAPEME_PRODUCT, parse
+
+
+def extract_product_bs4(content: bytes) -> dict:
+    """
+    Bisheriger Weg aus crawl_multi_page.py.
+    """
+    product_soup = BeautifulSoup(content.decode('utf-8'), 'html.parser')
+    title = product_soup.find('h1', class_='product_title').text
+    description = product_soup.find('div', class_='woocommerce-product-details__short-description').text.strip() if product_soup.find('div', class_='woocommerce-product-details__short-description') else 'No description available'
+    price = product_soup.find('p', class_='price').text.strip()
+    return {'title': title, 'description': description, 'price': price}
+
+
+def extract_product_lxml(content: bytes) -> dict:
+    return SCRAPEME_PRODUCT.extract(parse(content))
+
+
+def download_pages(pages_dir: str, count: int):
+    os.makedirs(pages_dir, exist_ok=True)
+    response = requests.get('https://scrapeme.live/shop/')
+    response.raise_for_status()
+    for i, product in enumerate(SCRAPEME_LISTING.extract(parse(response.content))[:count]):
+        product_response = requests.get(product['link'])
+        if product_response.status_code == 200:
+            with open(os.path.join(pages_dir, f"product_{i:03d}.html"), 'wb') as f:
+                f.write(product_response.content)
+    print(f"Seiten gespeichert in '{pages_dir}'.")
+
+
+def load_pages(pages_dir: str) -> list:
+    pages = []
+    for filename in sorted(os.listdir(pages_dir)):
+        if filename.endswith('.html'):
+            with open(os.path.join(pages_dir, filename), 'rb') as f:
+                pages.append(f.read())
+    return pages
+
+
+def time_per_page(extract, pages: list, repeat: int) -> list:
+    """
+    Beste Zeit aus `repeat` Läufen pro Seite, in Millisekunden.
+    """
+    timings = []
+    for content in pages:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extract(content)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None or elapsed < best else best
+        timings.append(best * 1000)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vergleicht BeautifulSoup und vorkompilierte lxml-Selektoren.")
+    parser.add_argument("--pages-dir", default="saved_pages", help="Verzeichnis mit gespeicherten Produktseiten")
+    parser.add_argument("--download", type=int, metavar="N", help="Zuerst N Produktseiten herunterladen")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen pro Seite")
+    args = parser.parse_args()
+
+    if args.download:
+        download_pages(args.pages_dir, args.download)
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        parser.error(f"Keine .html-Dateien in '{args.pages_dir}' (mit --download N speichern).")
+
+    # Beide Wege müssen dieselben Felder liefern
+    mismatches = sum(1 for content in pages if extract_product_bs4(content) != extract_product_lxml(content))
+
+    bs4_times = time_per_page(extract_product_bs4, pages, args.repeat)
+    lxml_times = time_per_page(extract_product_lxml, pages, args.repeat)
+
+    print(f"{len(pages)} Seiten, durchschnittlich {statistics.mean(len(p) for p in pages) / 1024:.0f} KB, "
+          f"{mismatches} mit abweichendem Ergebnis")
+    print(f"{'':<14} | {'Median ms':>10} | {'Mittel ms':>10} | {'Summe ms':>9}")
+    print("-" * 52)
+    for name, timings in (("bs4", bs4_times), ("lxml", lxml_times)):
+        print(f"{name:<14} | {statistics.median(timings):>10.2f} | {statistics.mean(timings):>10.2f} | {sum(timings):>9.1f}")
+    print(f"Beschleunigung: {sum(bs4_times) / sum(lxml_times):.1f}x")
@@ -1,50 +1,56 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+
+from lxml import etree
+
+from extractors import SCRAPEME_LISTING, SCRAPEME_PRODUCT, parse
+from fetch_engine import AsyncFetchEngine
 
 base_url = 'https://scrapeme.live/shop/'
 
-response = requests.get(base_url)
-
-if response.status_code == 200:
-    # Parse the HTML content
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # Find all product containers
-    products = soup.find_all('li', class_='product')
-
-    product_details = []
-
-    # Loop through each product to get the link
-    for product in products:
-        product_link = product.find('a')['href']
-        
-        # Send a GET request to the product page
-        product_response = requests.get(product_link)
-        
-        if product_response.status_code == 200:
-            # Parse the product page HTML
-            product_soup = BeautifulSoup(product_response.text, 'html.parser')
-            
-            # Extract title
-            title = product_soup.find('h1', class_='product_title').text
-            
-            # Extract description
-            description = product_soup.find('div', class_='woocommerce-product-details__short-description').text.strip() if product_soup.find('div', class_='woocommerce-product-details__short-description') else 'No description available'
-
-            # Extract Price
-            price = product_soup.find('p', class_='price').text.strip()
-            
-           
-            product_details.append({
-                'url': product_link,
-                'title': title,
-                'description': description,
-                'price': price
-            })
-        else:
-            print(f'Failed to retrieve product page: {product_link}. Status code: {product_response.status_code}')
-    
-    
+
+async def main():
+    # Eine Engine (ein Connection-Pool) für Listen- und Produktseiten
+    async with AsyncFetchEngine(max_concurrency=16) as engine:
+        response = await engine.fetch(base_url)
+
+        if not response.ok:
+            print(f'Failed to retrieve the shop page. Status code: {response.status or response.error}')
+            return
+
+        # Parse the HTML content (lxml, Selektoren sind in extractors.py vorkompiliert)
+        try:
+            products = SCRAPEME_LISTING.extract(parse(response.content))
+        except (etree.ParserError, ValueError) as e:
+            print(f'Failed to parse the shop page: {e}')
+            return
+        product_links = [product['link'] for product in products if product['link']]
+
+        product_details = []
+
+        # Alle Produktseiten gleichzeitig abrufen, Auswertung sobald eine Seite da ist
+        async for product_response in engine.fetch_all(product_links):
+            if product_response.ok:
+                # Parse the product page HTML and extract title, description and price
+                try:
+                    product = SCRAPEME_PRODUCT.extract(parse(product_response.content))
+                except (etree.ParserError, ValueError) as e:     # leere 200-Antwort oder kein HTML
+                    print(f'Failed to parse product page: {product_response.url} ({e})')
+                    continue
+
+                product_details.append({
+                    'url': product_response.url,
+                    'title': product['title'],
+                    'description': product['description'],
+                    'price': product['price']
+                })
+            else:
+                print(f'Failed to retrieve product page: {product_response.url}. Status code: {product_response.status or product_response.error}')
+
+    # Ausgabe in der Reihenfolge der Listenseite
+    position = {}
+    for i, link in enumerate(product_links):
+        position.setdefault(link, i)
+    product_details.sort(key=lambda detail: position[detail['url']])
     for detail in product_details:
         print(f'URL: {detail["url"]}')
         print(f'Title: {detail["title"]}')
@@ -53,5 +59,5 @@ if response.status_code == 200:
         print('---')
     print("Anzahl Shopseiten:", len(product_details))
 
-else:
-    print(f'Failed to retrieve the shop page. Status code: {response.status_code}')
+
+asyncio.run(main())
@@ -1,5 +1,6 @@
 import requests
-from lxml import html
+
+from extractors import SCRAPEME_LISTING, parse
 
 base_url = 'https://scrapeme.live/shop/'
 
@@ -7,19 +8,15 @@ response = requests.get(base_url)
 
 if response.status_code == 200:
     # Parse the HTML content
-    tree = html.fromstring(response.content)
-    
-    # Find all product titles and prices using XPath
-    titles = tree.xpath('//h2[@class="woocommerce-loop-product__title"]/text()')
-    prices = tree.xpath('//span[@class="woocommerce-Price-amount amount"]/text()')
+    tree = parse(response.content)
 
     product_details = []
 
-    # Loop through each title and corresponding price
-    for title, price in zip(titles, prices):
+    # Titel und Preis pro Produktkarte (vorkompilierte XPath aus extractors.py)
+    for product in SCRAPEME_LISTING.extract(tree):
         product_details.append({
-            'title': title.strip(),
-            'price': price.strip()
+            'title': product['title'],
+            'price': product['price']
         })
 
     for detail in product_details:
@@ -0,0 +1,103 @@
+# extractors.py
+# Vorkompilierte Selektoren für die Crawler-Skripte.
+# Jede XPath (bzw. jeder in XPath übersetzte CSS-Selektor) wird beim Import einmal
+# mit lxml.etree.XPath kompiliert und danach für jedes Dokument nur noch ausgeführt.
+# Geparst wird mit lxml direkt aus den Bytes der Antwort (Encoding erkennt lxml selbst).
+#
+# Nutzung:
+#   tree = parse(response.content)
+#   product = SCRAPEME_PRODUCT.extract(tree)        # {'title': ..., 'description': ..., 'price': ...}
+#   cards = SCRAPEME_LISTING.extract(tree)          # [{'link': ..., 'title': ..., 'price': ...}, ...]
+
+from cssselect import HTMLTranslator
+from lxml import etree, html
+
+_css_translator = HTMLTranslator()
+
+
+def css(selector: str) -> str:
+    """
+    Übersetzt einen CSS-Selektor in XPath (relativ zum aktuellen Knoten).
+    """
+    return _css_translator.css_to_xpath(selector)
+
+
+def parse(content: bytes):
+    return html.fromstring(content)
+
+
+def _string_value(node) -> str:
+    # Attribut- und Textknoten kommen als Strings zurück, Elemente als ganzer Text inkl. Kindknoten
+    return node if isinstance(node, str) else node.text_content()
+
+
+class Field:
+    """
+    Ein Feld mit kompilierter XPath.
+    mode "first": Text des ersten Treffers, "join": Texte aller Treffer mit Leerzeichen verbunden,
+    "list": Texte aller Treffer als Liste. Texte werden gestrippt.
+    """
+
+    def __init__(self, xpath: str, mode: str = "first", default=None):
+        if mode not in ("first", "join", "list"):
+            raise ValueError(f"Unbekannter Modus: {mode}")
+        self.xpath = etree.XPath(xpath)
+        self.mode = mode
+        self.default = default
+
+    def __call__(self, node):
+        values = [_string_value(match).strip() for match in self.xpath(node)]
+        if self.mode == "list":
+            return values
+        if not values:
+            return self.default
+        return values[0] if self.mode == "first" else " ".join(values)
+
+
+class Extractor:
+    """
+    Benannte Felder für eine Seitenart. Mit rows wird pro Treffer (z. B. Produktkarte)
+    ein Dict geliefert, sonst ein Dict für die ganze Seite.
+    """
+
+    def __init__(self, name: str, fields: dict, rows: str = None):
+        self.name = name
+        self.fields = fields
+        self.rows = etree.XPath(rows) if rows else None
+
+    def _extract_one(self, node) -> dict:
+        return {key: field(node) for key, field in self.fields.items()}
+
+    def extract(self, tree):
+        if self.rows is None:
+            return self._extract_one(tree)
+        return [self._extract_one(row) for row in self.rows(tree)]
+
+
+# scrapeme.live: Produktkarten der Listenseite
+SCRAPEME_LISTING = Extractor("scrapeme_listing", rows=css("li.product"), fields={
+    "link": Field("(.//a/@href)[1]"),
+    "title": Field('.//h2[@class="woocommerce-loop-product__title"]/text()'),
+    "price": Field('.//span[@class="woocommerce-Price-amount amount"]/text()'),
+})
+
+# scrapeme.live: Produktseite
+SCRAPEME_PRODUCT = Extractor("scrapeme_product", fields={
+    "title": Field(css("h1.product_title")),
+    "description": Field(css("div.woocommerce-product-details__short-description"), default="No description available"),
+    "price": Field(css("p.price")),
+})
+
+# developer.mozilla.org: Beschreibung eines HTTP-Statuscodes
+MDN_STATUS = Extractor("mdn_status", fields={
+    "title": Field('/html/body/div[1]/div/div[3]/main/article/header/h1/text()', default="No H1 Title"),
+    "description": Field('/html/body/div[1]/div/div[3]/main/article/div/p', mode="join", default=""),
+})
+
+# Beliebige Seite: Titel und alle Links (für site_crawler.py)
+PAGE_LINKS = Extractor("page_links", fields={
+    "title": Field("//title", default=""),
+    "links": Field("//a/@href", mode="list"),
+})
+
+EXTRACTORS = {extractor.name: extractor for extractor in (SCRAPEME_LISTING, SCRAPEME_PRODUCT, MDN_STATUS, PAGE_LINKS)}
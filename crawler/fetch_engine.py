@@ -0,0 +1,175 @@
+# fetch_engine.py
+# Wiederverwendbarer asynchroner Abruf für die Crawler-Skripte.
+# Aufgebaut wie AsyncEdekaJobScraper._make_request (edk_crawler/async_edk_scraper/):
+# ein gemeinsamer httpx.AsyncClient (Connection-Pool), begrenzte Parallelität,
+# Timeouts und Fehlerbehandlung an einer Stelle. fetch_all() liefert die Ergebnisse
+# in der Reihenfolge, in der sie fertig werden, statt auf die langsamste Seite zu warten.
+#
+# Nutzung:
+#   async with AsyncFetchEngine(max_concurrency=16) as engine:
+#       result = await engine.fetch(url)
+#       async for result in engine.fetch_all(urls):
+#           ...
+# Mit scheduler=PolitenessScheduler(...) (politeness.py) gelten robots.txt und ein
+# Ratenlimit pro Host, und fetch_all() verteilt die Anfragen abwechselnd auf die Hosts.
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Optional
+
+import httpx
+
+from politeness import PolitenessScheduler, host_of
+
+
+@dataclass
+class FetchResult:
+    """
+    Ergebnis eines Abrufs. Bei Netzwerkfehlern ist status None und error gesetzt.
+    url ist die angefragte URL, final_url die nach allen Weiterleitungen (Basis für relative Links).
+    """
+    url: str
+    status: Optional[int] = None
+    content: bytes = b""
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    final_url: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+
+class AsyncFetchEngine:
+    """
+    Begrenzte Anzahl gleichzeitiger Anfragen über einen gemeinsamen Client.
+    Statuscodes ungleich 200 sind kein Fehler der Engine, sie stehen im FetchResult.
+    """
+
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+
+    LOOKAHEAD = 10  # URLs pro Platz, die fetch_all() zum Verteilen auf Hosts vorausliest
+
+    def __init__(self, max_concurrency: int = 16, timeout: float = 30.0, headers: Optional[dict] = None,
+                 scheduler: Optional[PolitenessScheduler] = None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.headers = headers or self.HEADERS
+        self.scheduler = scheduler
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._tasks = set()     # Laufende Abrufe aus fetch_all()
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Bricht der Aufrufer fetch_all() ab (break), laufen dessen Abrufe noch: vor dem Schließen beenden
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._client.aclose()
+        self._client = None
+
+    async def fetch(self, url: str) -> FetchResult:
+        """
+        Ruft eine URL ab. Gibt immer ein FetchResult zurück, Fehler werden protokolliert.
+        """
+        async with self._semaphore:
+            # Token des Hosts erst mit freiem Platz nehmen, sonst gehen gestaute Reservierungen gleichzeitig raus
+            if self.scheduler is not None and not await self.scheduler.acquire(url, self._client):
+                return FetchResult(url, error="Durch robots.txt gesperrt")
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            try:
+                response = await self._client.get(url)
+                return FetchResult(url, response.status_code, response.content, elapsed=loop.time() - start,
+                                   final_url=str(response.url))
+            except httpx.TimeoutException as e:
+                error_msg = f"Timeout bei {url}: {e!r}"
+            except httpx.RequestError as e:
+                error_msg = f"Request Fehler bei {url}: {e}"
+            except Exception as e:   # Fängt allgemeine Fehler ab
+                error_msg = f"Unerwarteter Fehler bei Anfrage an {url}: {e}"
+            logging.error(error_msg)
+            return FetchResult(url, error=error_msg, elapsed=loop.time() - start)
+
+    async def fetch_all(self, urls: Iterable[str]) -> AsyncIterator[FetchResult]:
+        """
+        Ruft alle URLs ab und liefert die Ergebnisse in Fertigstellungsreihenfolge.
+        Es laufen höchstens max_concurrency Tasks gleichzeitig, weitere URLs werden
+        erst nachgeschoben, wenn ein Platz frei wird (auch für sehr lange Listen).
+        urls darf None liefern ("gerade keine URL, später wieder fragen"), solange noch
+        Abrufe laufen, z. B. eine Frontier, die erst durch deren Ergebnisse wieder wächst.
+        Nachgefragt wird, nachdem der Aufrufer die fertigen Ergebnisse verarbeitet hat.
+        """
+        next_url = self._interleaved(iter(urls)) if self.scheduler is not None else iter(urls).__next__
+        pending = set()
+
+        def fill():
+            while len(pending) < self.max_concurrency:
+                try:
+                    url = next_url()
+                except StopIteration:
+                    return
+                if url is None:
+                    return
+                task = asyncio.ensure_future(self.fetch(url))
+                task.add_done_callback(self._tasks.discard)
+                self._tasks.add(task)
+                pending.add(task)
+
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                yield task.result()
+            fill()
+
+    def _interleaved(self, url_iter):
+        """
+        Liest bis zu LOOKAHEAD * max_concurrency URLs voraus, gruppiert nach Host, und gibt
+        jeweils eine URL des Hosts zurück, dessen Bucket als nächstes frei ist. So warten
+        lange Folgen von URLs eines Hosts nicht vor denen anderer Hosts.
+        """
+        queues = OrderedDict()
+        buffered = 0
+        exhausted = False
+
+        def next_url():
+            nonlocal buffered, exhausted
+            while not exhausted and buffered < self.LOOKAHEAD * self.max_concurrency:
+                url = next(url_iter, False)
+                if url is False:
+                    exhausted = True
+                elif url is None:
+                    break   # Quelle hat gerade nichts, später erneut lesen
+                else:
+                    queues.setdefault(host_of(url), deque()).append(url)
+                    buffered += 1
+            if not queues:
+                if exhausted:
+                    raise StopIteration
+                return None
+            host = min(queues, key=lambda h: self.scheduler.ready_in(h))
+            queue = queues[host]
+            url = queue.popleft()
+            buffered -= 1
+            if not queue:
+                del queues[host]
+            else:
+                queues.move_to_end(host)    # bei Gleichstand reihum
+            return url
+
+        return next_url
@@ -0,0 +1,226 @@
+# frontier.py
+# URL-Frontier für Crawls über viele Seiten: welche URL als nächstes geladen wird.
+# - URLs werden normalisiert (Schema/Host klein, Standardport und Fragment weg,
+#   Query sortiert), damit dieselbe Seite nur einmal in die Warteschlange kommt.
+# - Priorität = Tiefe - Score (kleiner = früher), pro Host eine eigene Warteschlange,
+#   pop() wechselt zwischen den Hosts ab (mit ready_in: der Host, der als nächstes laden darf).
+# - Jede URL steht in einer SQLite-Datei (gesehen/wartend/in Arbeit/fertig). Im Speicher
+#   liegen höchstens max_in_memory wartende URLs, der Rest bleibt auf der Festplatte und
+#   wird nachgeladen. Nach einem Neustart geht es mit den noch offenen URLs weiter.
+#
+# Nutzung:
+#   frontier = URLFrontier("frontier.sqlite")
+#   frontier.add("https://schwarzesbrett.bremen.de/")
+#   entry = frontier.pop()            # (url, depth) oder None
+#   frontier.done(entry[0])
+#   frontier.close()
+
+import heapq
+import itertools
+import logging
+import sqlite3
+import time
+from typing import Callable, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from w3lib.url import canonicalize_url
+
+from politeness import host_of
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Zustände in der Tabelle urls
+QUEUED, LOADED, IN_PROGRESS, DONE = 0, 1, 2, 3
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Kanonische Form einer (ggf. relativen) URL oder None für Nicht-HTTP-Links (mailto:, javascript:, ...).
+    """
+    try:
+        if base:
+            url = urljoin(base, url.strip())
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parts.hostname:
+            return None
+        netloc = parts.hostname.lower()
+        port = parts.port
+    except ValueError:      # kaputte Links wie "http://[::1" oder "http://host:99999"
+        return None
+    if port and port != DEFAULT_PORTS[scheme]:
+        netloc += f":{port}"
+    # canonicalize_url: Query sortieren, Prozent-Kodierung vereinheitlichen, Fragment entfernen
+    return canonicalize_url(urlunsplit((scheme, netloc, parts.path or "/", parts.query, "")))
+
+
+class URLFrontier:
+    """
+    Prioritätswarteschlange pro Host mit SQLite im Hintergrund.
+    """
+
+    COMMIT_EVERY = 500      # Änderungen gesammelt schreiben
+    REFILL_SIZE = 1000      # So viele URLs werden auf einmal von der Festplatte nachgeladen
+
+    def __init__(self, path: str = "frontier.sqlite", max_in_memory: int = 10000):
+        self.path = path
+        self.max_in_memory = max_in_memory
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            "url TEXT PRIMARY KEY, host TEXT NOT NULL, priority REAL NOT NULL, depth INTEGER NOT NULL, "
+            "state INTEGER NOT NULL, seq INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS urls_queue ON urls (state, priority, seq)")
+        # Neustart: geladene und angefangene URLs wieder in die Warteschlange
+        interrupted = self._conn.execute("SELECT COUNT(*) FROM urls WHERE state = ?", (IN_PROGRESS,)).fetchone()[0]
+        self._conn.execute("UPDATE urls SET state = ? WHERE state IN (?, ?)", (QUEUED, LOADED, IN_PROGRESS))
+        self._conn.commit()
+
+        self._heaps = {}        # Host -> Heap aus (priority, seq, url, depth)
+        # Ein Eintrag pro Host mit wartenden URLs: (frühester Ladezeitpunkt, Reihenfolge, Host).
+        # Der Zeitpunkt ist eine untere Schranke und wird erst geprüft, wenn der Host oben liegt.
+        self._hosts = []
+        self._host_order = itertools.count()
+        self._in_memory = 0
+        self._changes = 0
+        self._seq = itertools.count(self._conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM urls").fetchone()[0])
+        self._on_disk = self._conn.execute("SELECT COUNT(*) FROM urls WHERE state = ?", (QUEUED,)).fetchone()[0]
+        if self._on_disk:
+            logging.info(f"Frontier '{path}': {self._on_disk} offene URLs ({interrupted} davon im letzten Lauf unterbrochen).")
+
+    def __len__(self):
+        """
+        Anzahl wartender URLs (Speicher und Festplatte).
+        """
+        return self._in_memory + self._on_disk
+
+    def _touch(self):
+        self._changes += 1
+        if self._changes >= self.COMMIT_EVERY:
+            self._conn.commit()
+            self._changes = 0
+
+    def _push(self, host: str, priority: float, seq: int, url: str, depth: int):
+        heap = self._heaps.get(host)
+        if heap is None:
+            heap = self._heaps[host] = []
+            heapq.heappush(self._hosts, (0.0, next(self._host_order), host))
+        heapq.heappush(heap, (priority, seq, url, depth))
+        self._in_memory += 1
+
+    def add(self, url: str, depth: int = 0, score: float = 0.0, base: Optional[str] = None) -> bool:
+        """
+        Nimmt eine URL auf. False, wenn sie ungültig ist oder schon einmal gesehen wurde.
+        """
+        url = normalize_url(url, base)
+        if url is None:
+            return False
+        host = host_of(url)
+        priority = depth - score
+        seq = next(self._seq)
+        in_memory = self._in_memory < self.max_in_memory and self._on_disk == 0
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO urls (url, host, priority, depth, state, seq) VALUES (?, ?, ?, ?, ?, ?)",
+            (url, host, priority, depth, LOADED if in_memory else QUEUED, seq),
+        )
+        if cursor.rowcount == 0:
+            return False
+        self._touch()
+        if in_memory:
+            self._push(host, priority, seq, url, depth)
+        else:
+            # Speicher voll (oder ältere URLs warten noch auf der Festplatte): nur in SQLite
+            self._on_disk += 1
+        return True
+
+    def _refill(self):
+        rows = self._conn.execute(
+            "SELECT url, host, priority, depth, seq FROM urls WHERE state = ? ORDER BY priority, seq LIMIT ?",
+            (QUEUED, min(self.REFILL_SIZE, self.max_in_memory)),
+        ).fetchall()
+        self._conn.executemany("UPDATE urls SET state = ? WHERE url = ?", [(LOADED, row[0]) for row in rows])
+        self._conn.commit()
+        self._changes = 0
+        for url, host, priority, depth, seq in rows:
+            self._push(host, priority, seq, url, depth)
+        self._on_disk -= len(rows)
+
+    def pop(self, ready_in: Optional[Callable[[str], float]] = None) -> Optional[Tuple[str, int]]:
+        """
+        Nächste URL als (url, depth) oder None, wenn nichts mehr wartet.
+        Mit ready_in (z. B. PolitenessScheduler.ready_in) wird der Host gewählt, der als
+        nächstes wieder laden darf, sonst reihum.
+        """
+        if self._in_memory == 0 and self._on_disk:
+            self._refill()
+        if not self._hosts:
+            return None
+
+        if ready_in is not None:
+            # Nur den obersten Host prüfen: Liegt er später als gespeichert, neu einsortieren.
+            # Die übrigen Zeitpunkte sind untere Schranken, also ist der erste passende Host der früheste.
+            now = time.monotonic()
+            while True:
+                ready_at, order, host = self._hosts[0]
+                wait = ready_in(host)
+                actual = now + wait if wait > 0 else 0.0
+                if actual <= ready_at:
+                    break
+                heapq.heapreplace(self._hosts, (actual, order, host))
+        _, _, host = heapq.heappop(self._hosts)
+
+        heap = self._heaps[host]
+        priority, seq, url, depth = heapq.heappop(heap)
+        self._in_memory -= 1
+        if heap:
+            # Hinten anstellen: bereite Hosts kommen reihum dran
+            heapq.heappush(self._hosts, (0.0, next(self._host_order), host))
+        else:
+            del self._heaps[host]
+
+        self._conn.execute("UPDATE urls SET state = ? WHERE url = ?", (IN_PROGRESS, url))
+        self._touch()
+        return url, depth
+
+    def done(self, url: str):
+        self._conn.execute("UPDATE urls SET state = ? WHERE url = ?", (DONE, url))
+        self._touch()
+
+    def mark_done(self, url: str):
+        """
+        Vermerkt eine URL als erledigt, die nicht über die Frontier geladen wurde
+        (z. B. das Ziel einer Weiterleitung), damit sie nicht noch einmal eingeplant wird.
+        """
+        url = normalize_url(url)
+        if url is None:
+            return
+        # Wartet sie noch auf der Festplatte oder im Speicher, wird sie ebenfalls übersprungen
+        if self._conn.execute("UPDATE urls SET state = ? WHERE url = ? AND state = ?", (DONE, url, QUEUED)).rowcount:
+            self._on_disk -= 1
+        if self._conn.execute("UPDATE urls SET state = ? WHERE url = ? AND state = ?", (DONE, url, LOADED)).rowcount:
+            self._drop_loaded(host_of(url), url)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO urls (url, host, priority, depth, state, seq) VALUES (?, ?, 0, 0, ?, ?)",
+            (url, host_of(url), DONE, next(self._seq)),
+        )
+        self._touch()
+
+    def _drop_loaded(self, host: str, url: str):
+        # Selten (nur Weiterleitungsziele), daher genügt lineares Suchen im Heap des Hosts
+        heap = self._heaps.get(host)
+        if heap is None:
+            return
+        remaining = [entry for entry in heap if entry[2] != url]
+        self._in_memory -= len(heap) - len(remaining)
+        if remaining:
+            heapq.heapify(remaining)
+            self._heaps[host] = remaining
+        else:
+            del self._heaps[host]
+            self._hosts = [entry for entry in self._hosts if entry[2] != host]
+            heapq.heapify(self._hosts)
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
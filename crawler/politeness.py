@@ -0,0 +1,237 @@
+# politeness.py
+# Höflichkeit pro Host für die requests/httpx-Crawler (in den Scrapy-Projekten
+# übernimmt das ROBOTSTXT_OBEY und AutoThrottle).
+# - Ein Token-Bucket pro Host statt einem globalen time.sleep(): fremde Hosts
+#   warten nicht aufeinander, ein Host bekommt trotzdem nie mehr als `rate` Anfragen/s.
+# - robots.txt wird pro Host einmal geladen, geparst und für ROBOTS_TTL Sekunden
+#   gecacht. Ein Crawl-delay daraus senkt die Rate für diesen Host (entfällt es in einer
+#   neueren robots.txt, gilt wieder die normale Rate). Ist die robots.txt nicht erreichbar,
+#   wird vorerst alles erlaubt und mit wachsendem Abstand erneut versucht.
+#   Token erst nehmen, wenn die Anfrage wirklich losgehen kann (nach einem Semaphore),
+#   sonst stauen sich Reservierungen und gehen danach gleichzeitig raus.
+#
+# Nutzung:
+#   scheduler = PolitenessScheduler(rate=5, burst=5)
+#   if scheduler.wait(url): requests.get(url)                     # Threads / requests
+#   if await scheduler.acquire(url, client): await client.get(url)  # asyncio / httpx
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import requests
+
+
+def host_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+class TokenBucket:
+    """
+    Token-Bucket mit Reservierung: reserve() nimmt sofort ein Token und gibt zurück,
+    wie lange der Aufrufer bis zu "seinem" Token warten muss. Dadurch kann
+    dasselbe Objekt von Threads (time.sleep) und Coroutinen (asyncio.sleep) genutzt werden.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            # Negativer Bestand = bereits vergebene Reservierungen in der Zukunft
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def ready_in(self) -> float:
+        """
+        Sekunden bis zum nächsten freien Token (ohne es zu nehmen).
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def set_rate(self, rate: float, capacity: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity
+            self.tokens = min(self.tokens, capacity)
+
+
+class RobotsRules:
+    """
+    Geparste robots.txt eines Hosts mit Ablaufzeit.
+    """
+
+    def __init__(self, parser: Optional[RobotFileParser], expires: float, allow_all: bool = False):
+        self.parser = parser
+        self.expires = expires
+        self.allow_all = allow_all
+
+    def can_fetch(self, user_agent: str, url: str) -> bool:
+        if self.allow_all or self.parser is None:
+            return True
+        return self.parser.can_fetch(user_agent, url)
+
+    def crawl_delay(self, user_agent: str) -> Optional[float]:
+        if self.parser is None:
+            return None
+        delay = self.parser.crawl_delay(user_agent)
+        return float(delay) if delay is not None else None
+
+
+class PolitenessScheduler:
+    """
+    Entscheidet pro URL, ob sie geladen werden darf, und wartet auf den Bucket ihres Hosts.
+    """
+
+    ROBOTS_TTL = 3600           # Sekunden, die eine robots.txt gültig bleibt
+    ROBOTS_ERROR_TTL = 60       # Bei Server-/Netzwerkfehlern nach so vielen Sekunden erneut versuchen, danach doppelt so lange
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+    def __init__(self, rate: float = 5.0, burst: float = 5.0, obey_robots: bool = True,
+                 user_agent: Optional[str] = None, robots_ttl: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.obey_robots = obey_robots
+        self.user_agent = user_agent or self.USER_AGENT
+        self.robots_ttl = robots_ttl if robots_ttl is not None else self.ROBOTS_TTL
+        self._buckets = {}
+        self._robots = {}
+        self._robots_failures = {}  # Host -> Fehlversuche in Folge beim Laden der robots.txt
+        self._lock = threading.Lock()
+        self._thread_locks = {}     # pro Host: nur ein Thread lädt die robots.txt
+        self._async_locks = {}      # dasselbe für Coroutinen
+        self.disallowed = 0
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def ready_in(self, url: str) -> float:
+        """
+        Sekunden, bis für den Host der URL wieder ein Token frei ist (für das Verteilen auf Hosts).
+        """
+        return self._bucket(host_of(url)).ready_in()
+
+    def _cached_rules(self, host: str) -> Optional[RobotsRules]:
+        rules = self._robots.get(host)
+        return rules if rules is not None and rules.expires > time.monotonic() else None
+
+    def _rules_from_response(self, host: str, status: Optional[int], text: str) -> RobotsRules:
+        now = time.monotonic()
+        if status is not None and 400 <= status < 500:
+            # Keine robots.txt: alles erlaubt (RFC 9309)
+            rules = RobotsRules(None, now + self.robots_ttl, allow_all=True)
+        elif status is None or status >= 500:
+            # Vorerst alles erlaubt (das Ratenlimit gilt weiter), erneuter Versuch mit Backoff
+            failures = self._robots_failures.get(host, 0) + 1
+            self._robots_failures[host] = failures
+            retry_in = min(self.ROBOTS_ERROR_TTL * 2 ** (failures - 1), self.robots_ttl)
+            logging.warning(f"robots.txt von {host} nicht erreichbar (Status {status}), "
+                            f"vorerst alles erlaubt, neuer Versuch in {retry_in:.0f}s.")
+            rules = RobotsRules(None, now + retry_in, allow_all=True)
+        else:
+            parser = RobotFileParser()
+            parser.parse(text.splitlines())
+            rules = RobotsRules(parser, now + self.robots_ttl)
+        if status is not None and status < 500:
+            self._robots_failures.pop(host, None)
+
+        # Crawl-delay begrenzt die Rate dieses Hosts (ohne Burst), ohne Crawl-delay gilt wieder die normale Rate
+        bucket = self._bucket(host)
+        delay = rules.crawl_delay(self.user_agent)
+        if delay:
+            bucket.set_rate(min(self.rate, 1.0 / delay), 1.0)
+            logging.info(f"Crawl-delay {delay}s für {host}")
+        elif (bucket.rate, bucket.capacity) != (self.rate, self.burst):
+            bucket.set_rate(self.rate, self.burst)
+            logging.info(f"Kein Crawl-delay mehr für {host}, wieder {self.rate} Anfragen/s")
+        self._robots[host] = rules
+        return rules
+
+    def _rules_sync(self, host: str) -> RobotsRules:
+        rules = self._cached_rules(host)
+        if rules is not None:
+            return rules
+        with self._lock:
+            host_lock = self._thread_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            rules = self._cached_rules(host)
+            if rules is None:
+                try:
+                    response = requests.get(host + "/robots.txt", headers={'User-Agent': self.user_agent}, timeout=10)
+                    rules = self._rules_from_response(host, response.status_code, response.text)
+                except requests.exceptions.RequestException as e:
+                    logging.warning(f"Fehler beim Laden der robots.txt von {host}: {e}")
+                    rules = self._rules_from_response(host, None, "")
+            return rules
+
+    async def _rules_async(self, host: str, client: Optional[httpx.AsyncClient]) -> RobotsRules:
+        rules = self._cached_rules(host)
+        if rules is not None:
+            return rules
+        host_lock = self._async_locks.setdefault(host, asyncio.Lock())
+        async with host_lock:
+            rules = self._cached_rules(host)
+            if rules is None:
+                try:
+                    if client is None:
+                        async with httpx.AsyncClient(follow_redirects=True) as own_client:
+                            response = await own_client.get(host + "/robots.txt", headers={'User-Agent': self.user_agent}, timeout=10)
+                    else:
+                        response = await client.get(host + "/robots.txt", headers={'User-Agent': self.user_agent}, timeout=10, follow_redirects=True)
+                    rules = self._rules_from_response(host, response.status_code, response.text)
+                except httpx.HTTPError as e:
+                    logging.warning(f"Fehler beim Laden der robots.txt von {host}: {e}")
+                    rules = self._rules_from_response(host, None, "")
+            return rules
+
+    def _disallow(self, url: str) -> bool:
+        logging.info(f"Durch robots.txt gesperrt: {url}")
+        self.disallowed += 1
+        return False
+
+    def wait(self, url: str) -> bool:
+        """
+        Für Threads: blockiert bis zum Token des Hosts. False, wenn robots.txt die URL sperrt.
+        """
+        host = host_of(url)
+        if self.obey_robots and not self._rules_sync(host).can_fetch(self.user_agent, url):
+            return self._disallow(url)
+        delay = self._bucket(host).reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    async def acquire(self, url: str, client: Optional[httpx.AsyncClient] = None) -> bool:
+        """
+        Für asyncio: wartet (ohne zu blockieren) auf das Token des Hosts.
+        False, wenn robots.txt die URL sperrt.
+        """
+        host = host_of(url)
+        if self.obey_robots and not (await self._rules_async(host, client)).can_fetch(self.user_agent, url):
+            return self._disallow(url)
+        delay = self._bucket(host).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return True
@@ -1,29 +1,74 @@
+import os
+import sys
+
 import scrapy
 
+# Gemeinsame Hilfen der Scrapy-Projekte (scrapy_shared/ im Hauptverzeichnis des Repositorys)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "scrapy_shared"))
+from pagination import follow_listing_pages
+
 class ShopMultipageSpider(scrapy.Spider):
+    """
+    Produkte mit Beschreibung. Name, Preis und Link stehen schon in der Produktkarte
+    der Listenseite, nur die Beschreibung braucht die Produktseite.
+    Über detail_fields wird festgelegt, welche Felder von der Produktseite kommen:
+        scrapy crawl shopMultipage                              # alles von der Produktseite (bisheriges Verhalten)
+        scrapy crawl shopMultipage -a detail_fields=description # nur die Beschreibung nachladen
+        scrapy crawl shopMultipage -a detail_fields=            # nur Listenseiten, keine Produktseiten
+    """
     name = 'shopMultipage'
     start_urls = ['https://scrapeme.live/shop/']
 
-    def parse(self, response):
+    FIELD_ORDER = ('name', 'price', 'description', 'link')
+    # Felder aus der Produktkarte der Listenseite
+    LISTING_XPATHS = {
+        'name': './/h2[@class="woocommerce-loop-product__title"]/text()',
+        'price': './/span[@class="woocommerce-Price-amount amount"]/text()',
+    }
+    # Felder, für die die Produktseite geladen werden muss
+    DETAIL_XPATHS = {
+        'name': '/html/body/div[1]/div[2]/div/div[2]/main/div/div[2]/h1/text()',
+        'price': '/html/body/div[1]/div[2]/div/div[2]/main/div/div[2]/p[1]/span/text()',
+        'description': '//div[@class="woocommerce-product-details__short-description"]/p/text()',
+    }
+
+    def __init__(self, detail_fields="name,price,description", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.detail_fields = [field.strip() for field in detail_fields.split(",") if field.strip()]
+        unknown = set(self.detail_fields) - set(self.DETAIL_XPATHS)
+        if unknown:
+            raise ValueError(f"Unbekannte Felder in detail_fields: {', '.join(sorted(unknown))}")
+
+    def parse(self, response, fan_out=True):
         # Extract product information
         products = response.xpath('//li[contains(@class, "product")]')
         for product in products:
-            name = product.xpath('.//h2[@class="woocommerce-loop-product__title"]/text()').get()
-            page_link = self.start_urls[0] + name
-
-            yield response.follow(page_link, self.parse_product)
-
-        # Follow pagination links
-        next_page = response.xpath('//a[@class="next page-numbers"]/@href').get()
-        if next_page:
-            yield response.follow(next_page, self.parse)
-
-    
-    def parse_product(self, response):
-        # Extract product details from the product page
-        yield {
-            'name': response.xpath('/html/body/div[1]/div[2]/div/div[2]/main/div/div[2]/h1/text()').get(),
-            'price': response.xpath('/html/body/div[1]/div[2]/div/div[2]/main/div/div[2]/p[1]/span/text()').get(),
-            'description': ' '.join(response.xpath('//div[@class="woocommerce-product-details__short-description"]/p/text()').getall()),
-            'link': response.url,
-        }
\ No newline at end of file
+            # Link des Produkts verwenden, der Name ergibt nicht immer eine gültige URL
+            page_link = product.xpath('.//a/@href').get()
+            if not page_link:
+                continue
+            product_data = {field: product.xpath(xpath).get() for field, xpath in self.LISTING_XPATHS.items()}
+            product_data['link'] = response.urljoin(page_link)
+
+            if self.detail_fields:
+                yield response.follow(page_link, self.parse_product, cb_kwargs={'product_data': product_data})
+            else:
+                self.crawler.stats.inc_value('shop/detail_requests_skipped')
+                yield self._ordered(product_data)
+
+        # Auf der ersten Seite alle Listenseiten auf einmal einplanen (Seitenzahl aus dem Paginierungs-Widget)
+        if fan_out:
+            yield from follow_listing_pages(response, self.parse)
+
+    def parse_product(self, response, product_data):
+        # Nur die gewünschten Felder von der Produktseite, der Rest bleibt aus der Listenseite
+        for field in self.detail_fields:
+            if field == 'description':
+                product_data[field] = ' '.join(response.xpath(self.DETAIL_XPATHS[field]).getall())
+            else:
+                product_data[field] = response.xpath(self.DETAIL_XPATHS[field]).get()
+        product_data['link'] = response.url
+        yield self._ordered(product_data)
+
+    def _ordered(self, product_data):
+        return {field: product_data[field] for field in self.FIELD_ORDER if field in product_data}
@@ -1,10 +1,17 @@
+import os
+import sys
+
 import scrapy
 
+# Gemeinsame Hilfen der Scrapy-Projekte (scrapy_shared/ im Hauptverzeichnis des Repositorys)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "scrapy_shared"))
+from pagination import follow_listing_pages
+
 class ShopSpider(scrapy.Spider):
     name = 'shop'
     start_urls = ['https://scrapeme.live/shop/']
 
-    def parse(self, response):
+    def parse(self, response, fan_out=True):
         # Extract product information
         products = response.xpath('//li[contains(@class, "product")]')
         for product in products:
@@ -14,7 +21,6 @@ class ShopSpider(scrapy.Spider):
                 'link': product.xpath('.//a/@href').get(),
             }
 
-        # Follow pagination links
-        next_page = response.xpath('//a[@class="next page-numbers"]/@href').get()
-        if next_page:
-            yield response.follow(next_page, self.parse)
+        # Auf der ersten Seite alle Listenseiten auf einmal einplanen (Seitenzahl aus dem Paginierungs-Widget)
+        if fan_out:
+            yield from follow_listing_pages(response, self.parse)
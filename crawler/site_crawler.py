@@ -0,0 +1,105 @@
+# site_crawler.py
+# Crawlt ganze Sites über die URL-Frontier (frontier.py): Startseiten rein, Links jeder
+# geladenen Seite zurück in die Frontier, bis nichts mehr offen ist oder --max-pages erreicht ist.
+# Abgerufen wird über AsyncFetchEngine mit PolitenessScheduler (robots.txt, Rate pro Host).
+# Die Frontier liegt in einer SQLite-Datei: ein abgebrochener Crawl läuft beim nächsten
+# Aufruf mit derselben Datei an der Stelle weiter.
+#
+# Aufruf: python site_crawler.py https://schwarzesbrett.bremen.de/ --max-pages 500 --output pages.ndjson
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from lxml import etree
+
+from extractors import PAGE_LINKS, parse
+from fetch_engine import AsyncFetchEngine
+from frontier import URLFrontier, normalize_url
+from politeness import PolitenessScheduler, host_of
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+async def crawl(frontier: URLFrontier, max_pages: int, max_depth: int, same_host: bool,
+                concurrency: int, rate: float, output_file=None) -> int:
+    scheduler = PolitenessScheduler(rate=rate, burst=rate)
+    depths = {}     # Tiefe der gerade laufenden URLs
+    pages = 0
+
+    def next_urls():
+        # Wird von fetch_all() nach Bedarf gelesen. Ist die Frontier gerade leer, während noch
+        # Seiten laden (deren Links sie wieder füllen können), kommt None: später erneut fragen.
+        while pages + len(depths) < max_pages:
+            entry = frontier.pop(scheduler.ready_in)
+            if entry is None:
+                if not depths:
+                    return
+                yield None
+                continue
+            url, depth = entry
+            depths[url] = depth
+            yield url
+
+    async with AsyncFetchEngine(max_concurrency=concurrency, scheduler=scheduler) as engine:
+        async for result in engine.fetch_all(next_urls()):
+            depth = depths.pop(result.url)
+            frontier.done(result.url)
+            pages += 1
+
+            # Nach Weiterleitungen gelten Links relativ zur Zielseite, das Ziel selbst ist damit erledigt
+            page_url = result.final_url or result.url
+            if page_url != result.url:
+                frontier.mark_done(page_url)
+
+            title = ""
+            if result.ok and result.content:
+                try:
+                    page = PAGE_LINKS.extract(parse(result.content))
+                except (etree.ParserError, ValueError) as e:     # kein HTML (PDF, Bild, ...)
+                    logging.warning(f"Kein auswertbares HTML: {result.url} ({e})")
+                    page = {"title": "", "links": []}
+                title = page["title"]
+                if depth < max_depth:
+                    for link in page["links"]:
+                        link = normalize_url(link, base=page_url)
+                        if link and (not same_host or host_of(link) == host_of(page_url)):
+                            frontier.add(link, depth=depth + 1)
+
+            logging.info(f"[{pages}] {result.status or result.error} {page_url} (Tiefe {depth}, offen: {len(frontier)})")
+            if output_file:
+                output_file.write(json.dumps({"url": result.url, "final_url": page_url, "status": result.status,
+                                              "depth": depth, "title": title}, ensure_ascii=False) + "\n")
+    return pages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawlt Sites über eine URL-Frontier auf der Festplatte.")
+    parser.add_argument("seeds", nargs="*", help="Start-URLs (bei Fortsetzung nicht nötig)")
+    parser.add_argument("--frontier", default="frontier.sqlite", help="SQLite-Datei der Frontier")
+    parser.add_argument("--max-pages", type=int, default=1000)
+    parser.add_argument("--max-depth", type=int, default=5)
+    parser.add_argument("--max-in-memory", type=int, default=10000, help="Wartende URLs im Speicher, der Rest auf der Festplatte")
+    parser.add_argument("--all-hosts", action="store_true", help="Auch Links auf andere Hosts folgen")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=2.0, help="Anfragen pro Sekunde und Host")
+    parser.add_argument("--output", help="NDJSON-Datei mit URL, Status und Titel jeder Seite")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    frontier = URLFrontier(args.frontier, max_in_memory=args.max_in_memory)
+    for seed in args.seeds:
+        frontier.add(seed)
+
+    output_file = open(args.output, 'a', encoding='utf-8') if args.output else None
+    try:
+        pages = asyncio.run(crawl(frontier, args.max_pages, args.max_depth, not args.all_hosts,
+                                  args.concurrency, args.rate, output_file))
+    finally:
+        frontier.close()
+        if output_file:
+            output_file.close()
+
+    logging.info(f"{pages} Seiten geladen, {len(frontier)} URLs offen. Laufzeit: {time.time() - start_time:.2f} Sekunden.")
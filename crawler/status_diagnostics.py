@@ -0,0 +1,146 @@
+# status_diagnostics.py
+# Erklärungen zu HTTP-Statuscodes ohne eine MDN-Anfrage pro Fehler.
+# 1. Mitgelieferte Tabelle mit den üblichen Codes (funktioniert offline)
+# 2. Datei-Cache (status_cache.json) für alle anderen Codes: MDN wird pro Code
+#    höchstens einmal überhaupt abgefragt, nicht einmal pro fehlerhafter Seite
+# Dazu ErrorReport: sammelt die Fehler eines Laufs (Anzahl pro Status und Host)
+# und gibt am Ende eine Zusammenfassung mit einer Erklärung pro Status aus.
+
+import asyncio
+import json
+import logging
+import os
+from collections import Counter
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+from extractors import MDN_STATUS, parse
+
+MOZ_URL = "https://developer.mozilla.org/en-US/docs/Web/HTTP/Reference/Status/"
+
+# Status -> (Titel, Kurzbeschreibung)
+STATUS_TABLE = {
+    301: ("301 Moved Permanently", "Die Seite ist dauerhaft unter einer neuen URL erreichbar (Location-Header)."),
+    302: ("302 Found", "Die Seite ist vorübergehend unter einer anderen URL erreichbar (Location-Header)."),
+    304: ("304 Not Modified", "Die zwischengespeicherte Version ist noch aktuell, es wird kein Inhalt gesendet."),
+    307: ("307 Temporary Redirect", "Vorübergehende Weiterleitung, Methode und Body bleiben gleich."),
+    308: ("308 Permanent Redirect", "Dauerhafte Weiterleitung, Methode und Body bleiben gleich."),
+    400: ("400 Bad Request", "Der Server kann die Anfrage wegen eines Fehlers auf Client-Seite nicht verarbeiten (z. B. ungültige Syntax)."),
+    401: ("401 Unauthorized", "Für die Seite ist eine Anmeldung nötig, es wurden keine gültigen Zugangsdaten gesendet."),
+    403: ("403 Forbidden", "Der Server hat die Anfrage verstanden, verweigert aber den Zugriff (oft Bot-Schutz oder fehlende Rechte)."),
+    404: ("404 Not Found", "Unter dieser URL gibt es keine Seite (gelöscht, verschoben oder falsch geschrieben)."),
+    405: ("405 Method Not Allowed", "Die HTTP-Methode wird für diese URL nicht unterstützt."),
+    406: ("406 Not Acceptable", "Der Server kann keine Antwort im gewünschten Format (Accept-Header) liefern."),
+    408: ("408 Request Timeout", "Der Server hat zu lange auf die vollständige Anfrage gewartet und die Verbindung geschlossen."),
+    410: ("410 Gone", "Die Seite wurde dauerhaft entfernt und kommt nicht zurück."),
+    418: ("418 I'm a teapot", "Der Server weigert sich, Kaffee mit einer Teekanne zu kochen (Scherz-Code, manchmal als Bot-Abwehr)."),
+    429: ("429 Too Many Requests", "Zu viele Anfragen in kurzer Zeit (Rate-Limit). Langsamer crawlen, Retry-After beachten."),
+    451: ("451 Unavailable For Legal Reasons", "Die Seite ist aus rechtlichen Gründen nicht verfügbar."),
+    500: ("500 Internal Server Error", "Unerwarteter Fehler auf dem Server, meist nicht durch die Anfrage verursacht."),
+    501: ("501 Not Implemented", "Der Server unterstützt die angefragte Funktion nicht."),
+    502: ("502 Bad Gateway", "Ein Gateway oder Proxy hat vom dahinterliegenden Server eine ungültige Antwort bekommen."),
+    503: ("503 Service Unavailable", "Der Server ist überlastet oder in Wartung. Später erneut versuchen (Retry-After)."),
+    504: ("504 Gateway Timeout", "Ein Gateway oder Proxy hat nicht rechtzeitig eine Antwort vom dahinterliegenden Server bekommen."),
+}
+
+
+class StatusExplainer:
+    """
+    Liefert (Titel, Beschreibung) zu einem Statuscode: Tabelle, dann Datei-Cache, zuletzt einmalig MDN.
+    """
+
+    def __init__(self, cache_path: Optional[str] = "status_cache.json", online: bool = True):
+        self.cache_path = cache_path
+        self.online = online
+        self._cache = {}
+        self._lookups = {}      # Laufende MDN-Abfragen pro Code (gleichzeitige Fehler teilen sich eine)
+        self.mdn_requests = 0
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self._cache = {int(code): tuple(entry) for code, entry in json.load(f).items()}
+            except (IOError, ValueError) as e:
+                logging.warning(f"Status-Cache '{cache_path}' nicht lesbar: {e}")
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({str(code): list(entry) for code, entry in self._cache.items()}, f, ensure_ascii=False, indent=2)
+        except IOError as e:
+            logging.error(f"Fehler beim Speichern des Status-Caches '{self.cache_path}': {e}")
+
+    def explain_offline(self, status: int) -> Optional[Tuple[str, str]]:
+        return STATUS_TABLE.get(status) or self._cache.get(status)
+
+    async def explain(self, status: int, engine=None) -> Tuple[str, str]:
+        """
+        Erklärung zu status. Mit engine (AsyncFetchEngine) wird ein unbekannter Code einmal bei MDN nachgeschlagen.
+        """
+        known = self.explain_offline(status)
+        if known:
+            return known
+        if engine is None or not self.online:
+            return (str(status), "Keine Beschreibung verfügbar.")
+
+        lookup = self._lookups.get(status)
+        if lookup is None:
+            lookup = self._lookups[status] = asyncio.ensure_future(self._fetch_mdn(status, engine))
+        return await lookup
+
+    async def _fetch_mdn(self, status: int, engine) -> Tuple[str, str]:
+        self.mdn_requests += 1
+        result = await engine.fetch(MOZ_URL + str(status))
+        if not result.ok:
+            return (str(status), "Keine Beschreibung verfügbar.")
+        details = MDN_STATUS.extract(parse(result.content))
+        entry = (details["title"], details["description"])
+        self._cache[status] = entry
+        self._save_cache()
+        return entry
+
+
+class ErrorReport:
+    """
+    Fehler eines Laufs, gezählt pro Status und Host. Netzwerkfehler ohne Status zählen als "Keine Antwort".
+    """
+
+    EXAMPLES_PER_STATUS = 3
+
+    def __init__(self):
+        self.counts = Counter()         # (status, host) -> Anzahl
+        self.examples = {}              # status -> erste URLs
+
+    def add(self, url: str, status: Optional[int]):
+        self.counts[(status, urlsplit(url).netloc)] += 1
+        examples = self.examples.setdefault(status, [])
+        if len(examples) < self.EXAMPLES_PER_STATUS:
+            examples.append(url)
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    async def summary(self, explainer: StatusExplainer, engine=None) -> str:
+        """
+        Zusammenfassung mit einer Erklärung pro Status (nicht pro Fehler).
+        """
+        if not self.counts:
+            return "Keine Fehler."
+        per_status = Counter()
+        for (status, _), count in self.counts.items():
+            per_status[status] += count
+
+        lines = [f"{len(self)} fehlerhafte Seiten:"]
+        for status, total in per_status.most_common():
+            if status is None:
+                lines.append(f"\n  Keine Antwort: {total}x")
+            else:
+                title, description = await explainer.explain(status, engine)
+                lines.append(f"\n  {title}: {total}x")
+                lines.append(f"    {description}")
+            for (s, host), count in sorted(self.counts.items(), key=lambda item: -item[1]):
+                if s == status:
+                    lines.append(f"    {host}: {count}")
+            lines.append(f"    z. B. {', '.join(self.examples[status])}")
+        return "\n".join(lines)
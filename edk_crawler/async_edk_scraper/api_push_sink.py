@@ -0,0 +1,144 @@
+# api_push_sink.py
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from typing import List, Optional
+
+import httpx
+
+
+class ApiPushSink:
+    """
+    Schickt fertig gescrapte Jobs direkt an die Jobs-API (/jobs/import/ndjson),
+    statt erst am Ende eine große JSON-Datei zu schreiben.
+    Jobs werden gebündelt (nach Anzahl oder Zeit) und als gzip-NDJSON über eine
+    Keep-Alive-Verbindung gesendet. Zu viele offene Batches bremsen den Scraper (Backpressure).
+    """
+
+    # Konstanten
+    IMPORT_PATH = "/jobs/import/ndjson"
+    BATCH_SIZE = 200                # Jobs pro Batch
+    FLUSH_INTERVAL_SECONDS = 2.0    # Spätestens nach dieser Zeit wird ein angefangener Batch gesendet
+    MAX_IN_FLIGHT_BATCHES = 4       # Gleichzeitig gesendete Batches
+    MAX_RETRIES = 5
+    RETRY_BACKOFF_SECONDS = 1.0     # Wird pro Versuch verdoppelt
+
+    def __init__(self, api_base_url: str):
+        """
+        Konstruktor
+        :param api_base_url: Basis-URL der API, z. B. http://localhost:8000
+        """
+        self.api_base_url = api_base_url.rstrip("/")
+        self._buffer: List[dict] = []
+        self._buffer_started_at: Optional[float] = None
+        self._in_flight = asyncio.Semaphore(self.MAX_IN_FLIGHT_BATCHES)
+        self._send_tasks = set()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._flush_timer_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.pushed_count = 0
+        self.failed_count = 0
+
+
+    async def start(self):
+        """
+        Öffnet die gepoolte HTTP-Verbindung und startet den Zeit-Flush.
+        """
+        limits = httpx.Limits(max_connections=self.MAX_IN_FLIGHT_BATCHES,
+                              max_keepalive_connections=self.MAX_IN_FLIGHT_BATCHES)
+        self._client = httpx.AsyncClient(base_url=self.api_base_url, limits=limits, timeout=60)
+        self._flush_timer_task = asyncio.create_task(self._flush_timer())
+        logging.info(f"API-Push aktiv: {self.api_base_url}{self.IMPORT_PATH}")
+
+
+    async def put(self, job: dict):
+        """
+        Nimmt einen fertigen Job an. Wartet, wenn bereits MAX_IN_FLIGHT_BATCHES unterwegs sind.
+        """
+        if not self._buffer:
+            self._buffer_started_at = time.monotonic()
+        self._buffer.append(job)
+        if len(self._buffer) >= self.BATCH_SIZE:
+            await self._flush()
+
+
+    async def _flush(self):
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            self._buffer_started_at = None
+
+            # Backpressure: erst senden, wenn ein Slot frei ist
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._send_batch(batch))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+
+
+    async def _flush_timer(self):
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL_SECONDS / 2)
+            if self._buffer_started_at is not None and time.monotonic() - self._buffer_started_at >= self.FLUSH_INTERVAL_SECONDS:
+                await self._flush()
+
+
+    async def _send_batch(self, batch: List[dict]):
+        """
+        Sendet einen Batch, wiederholt bei Netzwerkfehlern und 5xx mit exponentiellem Backoff.
+        """
+        body = gzip.compress("\n".join(json.dumps(job, ensure_ascii=False) for job in batch).encode("utf-8"))
+        headers = {"Content-Encoding": "gzip", "Content-Type": "application/x-ndjson"}
+        try:
+            for attempt in range(1, self.MAX_RETRIES + 1):
+                try:
+                    response = await self._client.post(self.IMPORT_PATH, content=body, headers=headers)
+                    if response.status_code < 500:
+                        response.raise_for_status()
+                        result = response.json()
+                        self.pushed_count += result.get("imported_count", 0)
+                        if result.get("error_count"):
+                            logging.warning(f"API meldet {result['error_count']} ungültige Jobs im Batch: {result.get('errors', [])[:3]}")
+                        logging.debug(f"Batch mit {len(batch)} Jobs an API übertragen.")
+                        return
+                    error_msg = f"Status {response.status_code}"
+                except httpx.HTTPStatusError as e:
+                    # 4xx: Wiederholen bringt nichts
+                    logging.error(f"API hat Batch abgelehnt: Status {e.response.status_code} - {e.response.text[:200]}")
+                    break
+                except httpx.RequestError as e:
+                    error_msg = str(e)
+                except ValueError as e:
+                    # 2xx ohne JSON (z. B. HTML-Seite eines Proxys): Ergebnis unbekannt, nicht wiederholen
+                    logging.error(f"API-Antwort ist kein JSON (Status {response.status_code}): {e} - {response.text[:200]}")
+                    break
+
+                logging.warning(f"Batch-Push fehlgeschlagen (Versuch {attempt}/{self.MAX_RETRIES}): {error_msg}")
+                if attempt < self.MAX_RETRIES:
+                    await asyncio.sleep(self.RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+            self.failed_count += len(batch)
+            logging.error(f"Batch mit {len(batch)} Jobs konnte nicht an die API übertragen werden.")
+        finally:
+            self._in_flight.release()
+
+
+    async def close(self):
+        """
+        Sendet den Rest, wartet auf alle offenen Batches und schließt die Verbindung.
+        """
+        if self._flush_timer_task is not None:
+            self._flush_timer_task.cancel()
+            try:
+                await self._flush_timer_task
+            except asyncio.CancelledError:
+                pass
+        await self._flush()
+        if self._send_tasks:
+            await asyncio.gather(*self._send_tasks)
+        if self._client is not None:
+            await self._client.aclose()
+        logging.info(f"API-Push beendet: {self.pushed_count} Jobs übertragen, {self.failed_count} fehlgeschlagen.")
@@ -6,9 +6,21 @@ import httpx
 from bs4 import BeautifulSoup
 import json 
 import time 
-from html import unescape
-from markdownify import markdownify as md
 import logging 
+import os
+import sys
+from api_push_sink import ApiPushSink
+
+# Gemeinsame Hilfsmodule (z. B. Markdown-Cache) liegen in get_json_from_edk_api/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "get_json_from_edk_api"))
+from markdown_cache import MarkdownConversionCache
+from description_table import DescriptionTable
+from lazy_description import pack_raw_html
+from job_record import JobRecord, to_json
+
+# Ratenlimit pro Host und robots.txt (crawler/politeness.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "crawler"))
+from politeness import PolitenessScheduler
 
 
 # Konfiguration Logging System
@@ -29,38 +41,62 @@ class AsyncEdekaJobScraper:
     }
     PAGE_SIZE = 50  # Anzahl der Jobs pro API-Anfrage
     
-    # Hier starten wir ohne expliziten Delay, da Asyncio eh nicht blockiert.
-    API_LIST_REQUEST_DELAY_SECONDS = 0.0 
-    
     # Maximale Anzahl gleichzeitig aktiver HTTP-Anfragen für die Detailseiten.
     MAX_CONCURRENT_DETAIL_REQUESTS = 30 
 
+    # Höflichkeit pro Host, ein Crawl-delay aus robots.txt senkt die Rate.
+    # Standardwert, änderbar über requests_per_second bzw. EDK_REQUESTS_PER_SECOND
+    REQUESTS_PER_SECOND_PER_HOST = 20
+    OBEY_ROBOTS_TXT = True
 
-    def __init__(self, output_json_filename='edk_job_data.json'):
+
+    def __init__(self, output_json_filename='edk_job_data.json', job_sink=None, collect_jobs: bool = True,
+                 markdown_cache: Optional[MarkdownConversionCache] = None, dedupe_descriptions: bool = False,
+                 raw_html: bool = False, politeness: Optional[PolitenessScheduler] = None,
+                 requests_per_second: Optional[float] = None):
         """
         Konstruktor
+        :param job_sink: Optionaler Sink (ApiPushSink oder JobPipeline), der jeden fertigen Job sofort erhält
+        :param collect_jobs: False, wenn die Jobs nur an den Sink gestreamt und nicht in all_jobs_details gesammelt werden sollen
+        :param markdown_cache: Cache für die HTML->Markdown-Umwandlung, Standard: nur im Speicher
+        :param dedupe_descriptions: Jede Beschreibung nur einmal speichern, Jobs verweisen per Hash darauf
+        :param raw_html: Beschreibung als komprimiertes Roh-HTML speichern, Markdown erst beim Verbraucher
+        :param politeness: Scheduler für Ratenlimit pro Host und robots.txt, Standard: aus den Klassenkonstanten
+        :param requests_per_second: Ratenlimit pro Host für den Standard-Scheduler (Standard: REQUESTS_PER_SECOND_PER_HOST)
         """
         self.output_json_filename = output_json_filename
+        self.markdown_cache = markdown_cache or MarkdownConversionCache()
+        # Im Raw-Modus kostet die Beschreibung während des Crawls nur zlib statt markdownify
+        self._convert_description = pack_raw_html if raw_html else self.markdown_cache.convert
+        self.job_sink = job_sink
+        self.collect_jobs = collect_jobs
         self.all_jobs_details = []
+        self.description_table = DescriptionTable() if dedupe_descriptions else None
+        self.jobs_count = 0
         self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_DETAIL_REQUESTS)
+        self.politeness = politeness or PolitenessScheduler(
+            rate=requests_per_second or self.REQUESTS_PER_SECOND_PER_HOST, burst=self.MAX_CONCURRENT_DETAIL_REQUESTS,
+            obey_robots=self.OBEY_ROBOTS_TXT, user_agent=self.HEADERS['User-Agent'])
         self.failed_details = []    # Seiten mit Fehlern
         self.missed_descriptions = []   # Jobs ohne Beschreibung
 
 
     async def _make_request(self, client: httpx.AsyncClient, url: str, method: str = "GET", params: dict = None,
-                            delay: bool = False, use_semaphore: bool = False, job_meta_data: Optional[dict] = None) -> httpx.Response:
+                            use_semaphore: bool = False, job_meta_data: Optional[dict] = None) -> httpx.Response:
         """
         Asynchrone Helferfunktion zum Senden von HTTP-Anfragen.
+        Wartet vorher auf das Ratenlimit des Hosts und prüft robots.txt.
         : param job_meta_data: Metadaten des Jobs, falls Detailanfrage für Fehlerprotokollierung
         """
-        if delay:
-            await asyncio.sleep(self.API_LIST_REQUEST_DELAY_SECONDS)
-
         if use_semaphore:
             await self._request_semaphore.acquire()
 
         response = None
         try:
+            # Token des Hosts erst mit freiem Platz nehmen, sonst stauen sich Reservierungen
+            # hinter dem Semaphore und gehen danach gleichzeitig raus
+            if not await self.politeness.acquire(url, client):
+                return None     # Durch robots.txt gesperrt
             response = await client.request(method, url, params=params, headers=self.HEADERS, timeout=30)
             response.raise_for_status()
             response.encoding = 'utf-8'
@@ -87,7 +123,7 @@ class AsyncEdekaJobScraper:
         return response # Gibt None zurück, wenn ein Fehler auftrat
     
 
-    def _extract_job_summary(self, job_data: dict) -> dict:
+    def _extract_job_summary(self, job_data: dict) -> JobRecord:
         """
         Extrahiert die Zusammenfassung der Jobdetails aus den API-Daten.
         (Diese Funktion ist synchron, da sie keine await-Aufrufe benötigt)
@@ -101,15 +137,16 @@ class AsyncEdekaJobScraper:
         # Filtern von None/leeren Strings und Zusammenfügen mit Komma
         location = ", ".join(filter(None, location_parts)).strip()
 
-        return {
-            "url": job_data.get("detailPageUrl"),
-            "department": job_data.get("companyName", "N/A"),
-            "description": None, # Wird später gefüllt
-            "job_title": job_data.get("title", "Kein Titel vorhanden"),
-            "level": job_data.get("level", "Unbestimmt"),
-            "location": location,
-            "schedule": job_data.get("timeType", "Vollzeit/Teilzeit")
-        }
+        # JobRecord statt Dict: weniger Speicher pro Job, Abteilung/Level/Standort/Arbeitszeit interniert
+        return JobRecord(
+            url=job_data.get("detailPageUrl"),
+            department=job_data.get("companyName", "N/A"),
+            description=None, # Wird später gefüllt
+            job_title=job_data.get("title", "Kein Titel vorhanden"),
+            level=job_data.get("level", "Unbestimmt"),
+            location=location,
+            schedule=job_data.get("timeType", "Vollzeit/Teilzeit")
+        )
     
 
     def _extract_description_from_html(self, html_content: str, job_meta_data: Optional[dict] = None) -> str:
@@ -131,12 +168,8 @@ class AsyncEdekaJobScraper:
                     if json_data.get('@type') == 'JobPosting':
                         description = json_data.get('description')
                         if description:
-                            md_content = md(
-                                unescape(description),
-                                heading_style="ATX",
-                                strong_em_with_underscores=False,
-                                wrap=True
-                            ).strip() # .strip() entfernt führende/hintere Whitespaces
+                            # Gleiche Beschreibungen (viele Märkte, gleicher Text) nur einmal umwandeln
+                            md_content = self._convert_description(description)
                             description_found = True
                             return md_content
                 except json.JSONDecodeError as e:
@@ -147,12 +180,7 @@ class AsyncEdekaJobScraper:
             # 2. Fallback: Suche nach einem spezifischen Div
             description_div = soup.find("div", {"class": "job-description"})
             if description_div:
-                md_content = md(
-                    unescape(str(description_div)), # str() holt HTML-Inhalt
-                    heading_style="ATX",
-                    strong_em_with_underscores=False,
-                    wrap=True
-                ).strip()
+                md_content = self._convert_description(str(description_div)) # str() holt HTML-Inhalt
                 description_found = True
                 return md_content
 
@@ -173,7 +201,7 @@ class AsyncEdekaJobScraper:
                 self.missed_descriptions.append({"url": job_meta_data.get('url', 'N/A'), "job_title": job_meta_data.get('job_title', 'N/A'), "error": "Beschreibung nicht im HTML gefunden-", "type": "DESCRIPTION_NOT_FOUND"})
 
         
-    async def _process_job_detail(self, client: httpx.AsyncClient, job_summary: dict) -> dict:
+    async def _process_job_detail(self, client: httpx.AsyncClient, job_summary: JobRecord) -> JobRecord:
         """
         Wird von Tasks parallel ausgeführt
         """
@@ -196,6 +224,10 @@ class AsyncEdekaJobScraper:
             
             # Fehlerprotokollierung 
             self.failed_details.append({"url": "N/A", "job_title": original_title, "error": "Keine Seiten-URL vorhanden.", "type": "MISSING_URL"})
+
+        # Fertigen Job sofort weiterreichen, nicht erst am Ende des Crawls
+        if self.job_sink:
+            await self.job_sink.put(job_summary.to_dict())
         
         return job_summary
 
@@ -207,12 +239,25 @@ class AsyncEdekaJobScraper:
         page = 0
         logging.info("Starte asynchronen Job-Scraping-Prozess...")
 
+        if self.job_sink:
+            await self.job_sink.start()
+        try:
+            await self._fetch_pages(page)
+        finally:
+            if self.job_sink:
+                await self.job_sink.close()
+
+
+    async def _fetch_pages(self, page: int):
+        """
+        Holt die Listenseiten ab `page` und verarbeitet deren Detailseiten parallel.
+        """
         async with httpx.AsyncClient() as client:   # Initialisierung
             while True:
                 url = f"{self.BASE_API_URL}?page={page}&size={self.PAGE_SIZE}"
                 logging.info(f"Sammle Daten von Seite: {page} (URL: {url})")
 
-                response = await self._make_request(client, url, delay=True)
+                response = await self._make_request(client, url)
 
                 if response is None:
                     logging.error(f"Fehler beim Abrufen der Seite {page}. Abbruch.")
@@ -236,9 +281,13 @@ class AsyncEdekaJobScraper:
 
                 processed_jobs = await asyncio.gather(*tasks)
 
-                self.all_jobs_details.extend(processed_jobs)
+                self.jobs_count += len(processed_jobs)
+                if self.collect_jobs:
+                    if self.description_table is not None:
+                        processed_jobs = [self.description_table.to_reference(job) for job in processed_jobs]
+                    self.all_jobs_details.extend(processed_jobs)
 
-                logging.info(f"Bisher gesammelte Jobs: {len(self.all_jobs_details)}")
+                logging.info(f"Bisher gesammelte Jobs: {self.jobs_count}")
 
                 page += 1
                 # TESTLIMIT --- 
@@ -285,9 +334,13 @@ class AsyncEdekaJobScraper:
         if not self.all_jobs_details:
             logging.warning("Keine Jobdaten zum Speichern vorhanden.")
             return
+        output = self.all_jobs_details
+        if self.description_table is not None:
+            output = self.description_table.to_document(self.all_jobs_details)
+            logging.info(f"{len(self.all_jobs_details)} Jobs teilen sich {len(self.description_table.descriptions)} verschiedene Beschreibungen.")
         try:
             with open(self.output_json_filename, 'w', encoding='utf-8') as f:
-                json.dump(self.all_jobs_details, f, ensure_ascii=False, indent=4)
+                json.dump(output, f, ensure_ascii=False, indent=4, default=to_json)
             logging.info(f"Alle Jobdetails wurden erfolgreich in {self.output_json_filename} gespeichert!")
         except IOError as e:
             logging.error(f"Fehler beim Speichern der Datei '{self.output_json_filename}': {e}")
@@ -297,13 +350,26 @@ if __name__ == "__main__":
     start_time = time.time()
     logging.info("Programm Start")
 
-    scraper = AsyncEdekaJobScraper()
+    # Mit EDK_API_URL (z. B. http://localhost:8000) werden die Jobs während des Crawls an die API gepusht
+    api_url = os.environ.get("EDK_API_URL")
+    # Mit EDK_MARKDOWN_CACHE_FILE bleibt der Markdown-Cache über mehrere Läufe erhalten
+    markdown_cache = MarkdownConversionCache(persist_path=os.environ.get("EDK_MARKDOWN_CACHE_FILE"))
+    # Mit EDK_DEDUPE_DESCRIPTIONS=1 wird jede Beschreibung nur einmal in die JSON-Datei geschrieben
+    dedupe = os.environ.get("EDK_DEDUPE_DESCRIPTIONS") == "1"
+    # Mit EDK_RAW_HTML=1 wird das HTML gespeichert und erst später umgewandelt (render_descriptions.py, Konverter, API)
+    raw_html = os.environ.get("EDK_RAW_HTML") == "1"
+    # Mit EDK_REQUESTS_PER_SECOND wird das Ratenlimit pro Host geändert (Standard: 20)
+    rate = float(os.environ["EDK_REQUESTS_PER_SECOND"]) if os.environ.get("EDK_REQUESTS_PER_SECOND") else None
+    scraper = AsyncEdekaJobScraper(job_sink=ApiPushSink(api_url) if api_url else None, markdown_cache=markdown_cache,
+                                   dedupe_descriptions=dedupe, raw_html=raw_html, requests_per_second=rate)
 
     asyncio.run(scraper.fetch_all_jobs()) # Startet die asynchrone Hauptfunktion
 
     scraper.save_to_json() # Speichert die Daten synchron
     scraper.save_failed_details() # NEU: Fehlgeschlagene Detailanfragen speichern
     scraper.save_missed_descriptions() # NEU: Fehlende/fehlerhafte Beschreibungen speichern
+    markdown_cache.log_stats()
+    markdown_cache.close()
 
 
     end_time = time.time()
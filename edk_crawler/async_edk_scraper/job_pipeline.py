@@ -0,0 +1,186 @@
+# job_pipeline.py
+# Ein Durchlauf statt drei: Scraper -> NDJSON + CSV + Markdown + API gleichzeitig.
+# Aufruf: python job_pipeline.py --ndjson jobs.ndjson --csv jobs.csv --markdown-dir markdown_jobs --api-url http://localhost:8000
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from typing import List, Optional
+
+# Die Konverter liegen im Nachbarverzeichnis get_json_from_edk_api/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "get_json_from_edk_api"))
+
+from json_to_csv import clean_markdown
+from json_to_markdown import JsonToMarkdownConverter
+from lazy_description import render_description
+from api_push_sink import ApiPushSink
+
+
+class NdjsonFileSink:
+    """
+    Schreibt jeden Job als eine JSON-Zeile.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = None
+        self.count = 0
+
+    async def start(self):
+        self._file = open(self.filename, 'w', encoding='utf-8')
+
+    async def put(self, job: dict):
+        self._file.write(json.dumps(job, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    async def close(self):
+        if self._file:
+            self._file.close()
+        logging.info(f"NDJSON: {self.count} Jobs in '{self.filename}' geschrieben.")
+
+
+class CsvFileSink:
+    """
+    Schreibt die Jobs im selben Format wie json_to_csv.py.
+    Die Spalten werden, wie dort, aus dem ersten Job übernommen.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = None
+        self._writer = None
+        self.count = 0
+
+    async def start(self):
+        self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+
+    async def put(self, job: dict):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(job.keys()))
+            self._writer.writeheader()
+        row = dict(job)     # Kopie, der Job geht noch an andere Sinks
+        row['description'] = clean_markdown(render_description(row.get('description')) or "")
+        self._writer.writerow(row)
+        self.count += 1
+
+    async def close(self):
+        if self._file:
+            self._file.close()
+        logging.info(f"CSV: {self.count} Jobs in '{self.filename}' geschrieben.")
+
+
+class MarkdownDirSink:
+    """
+    Schreibt jeden Job als eigene Markdown-Datei (wie JsonToMarkdownConverter).
+    Eine Datei pro Job ist viel Datei-I/O, deshalb läuft das Schreiben in einem Thread.
+    """
+
+    def __init__(self, output_markdown_dir: str):
+        self.converter = JsonToMarkdownConverter(output_markdown_dir=output_markdown_dir)
+        self.count = 0
+
+    async def start(self):
+        self.converter._ensure_output_dir()
+
+    async def put(self, job: dict):
+        await asyncio.to_thread(self.converter.write_job_markdown, job, self.count)
+        self.count += 1
+
+    async def close(self):
+        logging.info(f"Markdown: {self.count} Jobs in '{self.converter.output_markdown_dir}' geschrieben.")
+
+
+class JobPipeline:
+    """
+    Verteilt jeden Job an mehrere Sinks. Jeder Sink hat eine eigene begrenzte Queue
+    und einen eigenen Task. Ist ein Sink langsam, füllt sich seine Queue und
+    put() wartet (Backpressure), statt alles im Speicher zu puffern.
+    Hat dieselbe Schnittstelle wie ein Sink (start/put/close) und kann daher
+    direkt als job_sink an den AsyncEdekaJobScraper übergeben werden.
+    """
+
+    QUEUE_SIZE = 500    # Maximal gepufferte Jobs pro Sink
+
+    def __init__(self, sinks: list):
+        self.sinks = sinks
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        for sink in self.sinks:
+            await sink.start()
+            queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+            self._queues.append(queue)
+            self._workers.append(asyncio.create_task(self._drain(sink, queue)))
+
+    async def _drain(self, sink, queue: asyncio.Queue):
+        while True:
+            job = await queue.get()
+            if job is None:     # Ende-Markierung
+                return
+            try:
+                await sink.put(job)
+            except Exception as e:
+                logging.error(f"Fehler in Sink {type(sink).__name__} für '{job.get('job_title', 'N/A')}': {e}", exc_info=True)
+
+    async def put(self, job: dict):
+        for queue in self._queues:
+            await queue.put(job)
+
+    async def close(self):
+        for queue in self._queues:
+            await queue.put(None)
+        await asyncio.gather(*self._workers)
+        for sink in self.sinks:
+            await sink.close()
+
+
+def build_sinks(ndjson: Optional[str], csv_file: Optional[str], markdown_dir: Optional[str], api_url: Optional[str]) -> list:
+    sinks = []
+    if ndjson:
+        sinks.append(NdjsonFileSink(ndjson))
+    if csv_file:
+        sinks.append(CsvFileSink(csv_file))
+    if markdown_dir:
+        sinks.append(MarkdownDirSink(markdown_dir))
+    if api_url:
+        sinks.append(ApiPushSink(api_url))
+    return sinks
+
+
+if __name__ == "__main__":
+    from async_edk_scraper import AsyncEdekaJobScraper
+    from markdown_cache import MarkdownConversionCache
+
+    parser = argparse.ArgumentParser(description="Scrapt die Edeka-Jobs und schreibt alle Ausgaben in einem Durchlauf.")
+    parser.add_argument("--ndjson", help="NDJSON-Ausgabedatei")
+    parser.add_argument("--csv", help="CSV-Ausgabedatei")
+    parser.add_argument("--markdown-dir", help="Verzeichnis für Markdown-Dateien")
+    parser.add_argument("--api-url", help="Basis-URL der Jobs-API für den Push")
+    parser.add_argument("--rate", type=float, help="Anfragen pro Sekunde an den Edeka-Host (Standard: 20)")
+    args = parser.parse_args()
+
+    sinks = build_sinks(args.ndjson, args.csv, args.markdown_dir, args.api_url)
+    if not sinks:
+        parser.error("Mindestens ein Ausgabeziel angeben (--ndjson, --csv, --markdown-dir, --api-url).")
+
+    start_time = time.time()
+    logging.info("Programm Start")
+
+    # Jobs werden nur gestreamt, nicht zusätzlich im Scraper gesammelt
+    markdown_cache = MarkdownConversionCache(persist_path=os.environ.get("EDK_MARKDOWN_CACHE_FILE"))
+    scraper = AsyncEdekaJobScraper(job_sink=JobPipeline(sinks), collect_jobs=False, markdown_cache=markdown_cache,
+                                   requests_per_second=args.rate)
+    asyncio.run(scraper.fetch_all_jobs())
+    scraper.save_failed_details()
+    scraper.save_missed_descriptions()
+    markdown_cache.log_stats()
+    markdown_cache.close()
+
+    duration = time.time() - start_time
+    logging.info(f"Programm beendet. Laufzeit: {duration:.2f} Sekunden.")
@@ -7,10 +7,15 @@ import scrapy
 
 
 class EdkCrawlerItem(scrapy.Item):
-    # define the fields for your item here like:
-    title = scrapy.Field()
-    company = scrapy.Field()
-    location = scrapy.Field()
-    description = scrapy.Field()
+    # Felder wie EdekaJob in den eigenständigen Scrapern (get_json_from_edk_api/)
     url = scrapy.Field()
+    department = scrapy.Field()
+    description = scrapy.Field()
+    job_title = scrapy.Field()
+    level = scrapy.Field()
+    location = scrapy.Field()
+    schedule = scrapy.Field()
+    # True bei Platzhaltern für nicht abrufbare Detailseiten: nicht als gesehen merken,
+    # damit der nächste Lauf die Seite erneut versucht
+    detail_failed = scrapy.Field()
     
@@ -3,11 +3,262 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy.exceptions import DropItem, NotConfigured
+from twisted.internet import task, threads
+
+
+# Spalten wie EdkCrawlerItem / EdekaJob
+JOB_COLUMNS = ("url", "department", "description", "job_title", "level", "location", "schedule")
+
+
+class NdjsonBatchWriter:
+    """
+    Hängt jeden Job als eine JSON-Zeile an die Datei an.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+
+    def open(self):
+        self._file = open(self.filename, 'a', encoding='utf-8')
+
+    def write_batch(self, jobs):
+        self._file.write("".join(json.dumps(job, ensure_ascii=False) + "\n" for job in jobs))
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class SqliteBatchWriter:
+    """
+    Schreibt die Jobs in die Tabelle "jobs", ein Batch pro Transaktion.
+    Eine bereits gespeicherte URL wird überschrieben.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._conn = None
+
+    def open(self):
+        self._conn = sqlite3.connect(self.filename)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS jobs ({', '.join(c + ' TEXT' for c in JOB_COLUMNS)}, PRIMARY KEY (url))")
+        self._conn.commit()
+
+    def write_batch(self, jobs):
+        placeholders = ", ".join("?" for _ in JOB_COLUMNS)
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({placeholders})",
+                [tuple(job.get(c) for c in JOB_COLUMNS) for job in jobs],
+            )
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+
+
+class SeenUrlStore:
+    """
+    Bereits gespeicherte URLs, dauerhaft in einer SQLite-Datei.
+    Beim Start wird alles in ein Set geladen, die Prüfung im Pipeline-Aufruf
+    braucht dadurch keinen Datenträgerzugriff. Neue URLs schreibt der Writer-Thread.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self._conn = None
+
+    def load(self):
+        if not self.filename:
+            return set()
+        with sqlite3.connect(self.filename) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS seen_urls (url TEXT PRIMARY KEY)")
+            return {row[0] for row in conn.execute("SELECT url FROM seen_urls")}
+
+    def open(self):
+        if self.filename:
+            self._conn = sqlite3.connect(self.filename)
+
+    def add_batch(self, urls):
+        if self._conn and urls:
+            with self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO seen_urls (url) VALUES (?)", [(url,) for url in urls])
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
 
 
 class EdkCrawlerPipeline:
+    """
+    Verwirft doppelte Jobs (gleiche URL, auch aus früheren Läufen) und sammelt
+    die übrigen in Batches. Geschrieben wird in einem eigenen Thread, damit der
+    Twisted-Reactor nie auf die Festplatte wartet. Ist die Warteschlange voll,
+    liefert process_item ein Deferred: Scrapy nimmt erst neue Items an, wenn
+    wieder Platz ist, der Reactor selbst läuft weiter.
+
+    Einstellungen (settings.py):
+        EDK_STORAGE_BACKEND     "ndjson" oder "sqlite"
+        EDK_STORAGE_FILE        Ausgabedatei
+        EDK_SEEN_URLS_FILE      SQLite-Datei mit den bekannten URLs (leer = nur für diesen Lauf)
+        EDK_BATCH_SIZE          Jobs pro Batch
+        EDK_FLUSH_INTERVAL      Spätestens nach so vielen Sekunden wird ein angefangener Batch geschrieben
+                                (auch wenn gerade keine Items kommen)
+    """
+
+    WRITERS = {"ndjson": NdjsonBatchWriter, "sqlite": SqliteBatchWriter}
+    QUEUE_SIZE = 50     # Maximal wartende Batches, danach wartet process_item auf ein Deferred (Backpressure)
+
+    def __init__(self, stats, backend="ndjson", storage_file="edk_jobs.ndjson", seen_urls_file=None,
+                 batch_size=200, flush_interval=2.0):
+        if backend not in self.WRITERS:
+            raise NotConfigured(f"Unbekanntes Speicherformat: {backend}")
+        self.stats = stats
+        self.writer = self.WRITERS[backend](storage_file)
+        self.seen_store = SeenUrlStore(seen_urls_file)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.seen_urls = set()
+        self._retry_urls = set()    # URLs von Platzhaltern (detail_failed), werden nicht in seen_urls gespeichert
+        self._buffer = []
+        self._last_flush = 0.0
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._thread = None
+        self._flush_timer = None
+        self._start_time = None
+        # Nur vom Writer-Thread verändert, ausgewertet nach join()
+        self._stored = 0
+        self._flush_count = 0
+        self._flush_seconds = 0.0
+        self._flush_max = 0.0
+        self._errors = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            crawler.stats,
+            backend=settings.get("EDK_STORAGE_BACKEND", "ndjson"),
+            storage_file=settings.get("EDK_STORAGE_FILE", "edk_jobs.ndjson"),
+            seen_urls_file=settings.get("EDK_SEEN_URLS_FILE"),
+            batch_size=settings.getint("EDK_BATCH_SIZE", 200),
+            flush_interval=settings.getfloat("EDK_FLUSH_INTERVAL", 2.0),
+        )
+
+    def open_spider(self, spider):
+        self.seen_urls = self.seen_store.load()
+        if self.seen_urls:
+            spider.logger.info("%d bekannte URLs aus '%s' geladen.", len(self.seen_urls), self.seen_store.filename)
+        self._start_time = self._last_flush = time.monotonic()
+        self._thread = threading.Thread(target=self._write_loop, name="EdkCrawlerPipelineWriter", daemon=True)
+        self._thread.start()
+        # Angefangene Batches auch schreiben, wenn der Crawl gerade keine Items liefert
+        self._flush_timer = task.LoopingCall(self._flush_if_due)
+        self._flush_timer.start(self.flush_interval, now=False)
+
     def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        url = adapter.get("url")
+        if url:
+            if url in self.seen_urls:
+                self.stats.inc_value("edk_pipeline/duplicates")
+                raise DropItem(f"Doppelte URL: {url}")
+            if adapter.get("detail_failed"):
+                # Platzhalter speichern, aber nicht als gesehen merken: der nächste Lauf versucht es erneut
+                self.stats.inc_value("edk_pipeline/detail_failed")
+                self._retry_urls.add(url)
+            else:
+                self.seen_urls.add(url)
+                self._retry_urls.discard(url)
+
+        self._buffer.append({column: adapter.get(column) for column in JOB_COLUMNS})
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            d = self._hand_off()
+            if d is not None:
+                self.stats.inc_value("edk_pipeline/backpressure_waits")
+                return d.addCallback(lambda _: item)
         return item
+
+    def _flush_if_due(self):
+        if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+            return self._hand_off()
+
+    def _hand_off(self):
+        """
+        Übergibt den Puffer an den Writer-Thread. Bei voller Warteschlange wird in einem
+        Thread des Reactor-Pools gewartet und das Deferred dazu zurückgegeben, sonst None.
+        """
+        batch, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        if not batch:
+            return None
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            return threads.deferToThread(self._queue.put, batch)
+        return None
+
+    def _write_loop(self):
+        # Alle Datenbank- und Dateiobjekte werden in diesem Thread geöffnet (sqlite3 erlaubt keinen Threadwechsel)
+        self.writer.open()
+        self.seen_store.open()
+        try:
+            while True:
+                batch = self._queue.get()
+                if batch is None:   # Ende-Markierung
+                    return
+                start = time.perf_counter()
+                try:
+                    self.writer.write_batch(batch)
+                    self.seen_store.add_batch([job["url"] for job in batch if job["url"] and job["url"] not in self._retry_urls])
+                except Exception as e:
+                    self._errors += len(batch)
+                    logging.error(f"Fehler beim Schreiben von {len(batch)} Jobs: {e}", exc_info=True)
+                    continue
+                elapsed = time.perf_counter() - start
+                self._stored += len(batch)
+                self._flush_count += 1
+                self._flush_seconds += elapsed
+                self._flush_max = max(self._flush_max, elapsed)
+        finally:
+            self.writer.close()
+            self.seen_store.close()
+
+    def _finish_writer(self, batch):
+        if batch:
+            self._queue.put(batch)
+        self._queue.put(None)
+        self._thread.join()
+
+    def close_spider(self, spider):
+        if self._flush_timer is not None and self._flush_timer.running:
+            self._flush_timer.stop()
+        batch, self._buffer = self._buffer, []
+        # Letzten Batch übergeben und auf den Writer-Thread warten, ohne den Reactor zu blockieren
+        d = threads.deferToThread(self._finish_writer, batch)
+        d.addCallback(lambda _: self._record_stats(spider))
+        return d
+
+    def _record_stats(self, spider):
+        duration = time.monotonic() - self._start_time
+        self.stats.set_value("edk_pipeline/items_stored", self._stored)
+        self.stats.set_value("edk_pipeline/items_failed", self._errors)
+        self.stats.set_value("edk_pipeline/batches", self._flush_count)
+        self.stats.set_value("edk_pipeline/items_per_second", round(self._stored / duration, 2) if duration > 0 else 0.0)
+        if self._flush_count:
+            self.stats.set_value("edk_pipeline/flush_latency_avg_ms", round(self._flush_seconds / self._flush_count * 1000, 2))
+            self.stats.set_value("edk_pipeline/flush_latency_max_ms", round(self._flush_max * 1000, 2))
+        spider.logger.info("%d Jobs in %d Batches nach '%s' geschrieben.", self._stored, self._flush_count, self.writer.filename)
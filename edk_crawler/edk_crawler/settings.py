@@ -7,6 +7,12 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+import sys
+
+# Gemeinsamer Bloom-Dupefilter aus scrapy_shared/ (Hauptverzeichnis des Repositorys)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scrapy_shared"))
+
 BOT_NAME = "edk_crawler"
 
 SPIDER_MODULES = ["edk_crawler.spiders"]
@@ -14,22 +20,29 @@ NEWSPIDER_MODULE = "edk_crawler.spiders"
 
 ADDONS = {}
 
+# Request-Duplikate über einen Bloom-Filter auf der Festplatte erkennen, mit JOBDIR auch über Neustarts hinweg
+# (Einstellungen siehe scrapy_shared/bloom_dupefilter.py)
+DUPEFILTER_CLASS = "bloom_dupefilter.BloomDupeFilter"
+BLOOM_DUPEFILTER_ERROR_RATE = 0.001
+
 
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
 #USER_AGENT = "edk_crawler (+http://www.yourdomain.com)"
+# Gleicher User-Agent wie die eigenständigen Scraper
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
 # Obey robots.txt rules
 ROBOTSTXT_OBEY = True
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-#CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS = 32
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
 #DOWNLOAD_DELAY = 3
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+CONCURRENT_REQUESTS_PER_DOMAIN = 16
 #CONCURRENT_REQUESTS_PER_IP = 16
 
 # Disable cookies (enabled by default)
@@ -64,20 +77,27 @@ ROBOTSTXT_OBEY = True
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "edk_crawler.pipelines.EdkCrawlerPipeline": 300,
-#}
+ITEM_PIPELINES = {
+    "edk_crawler.pipelines.EdkCrawlerPipeline": 300,
+}
+# Speicherung in EdkCrawlerPipeline (Batches aus einem Writer-Thread)
+EDK_STORAGE_BACKEND = "ndjson"          # oder "sqlite"
+EDK_STORAGE_FILE = "edk_jobs.ndjson"
+EDK_SEEN_URLS_FILE = "edk_seen_urls.sqlite"   # None = Duplikate nur innerhalb eines Laufs erkennen
+EDK_BATCH_SIZE = 200
+EDK_FLUSH_INTERVAL = 2.0
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-#AUTOTHROTTLE_ENABLED = True
+# EdkSpider fragt Listen- und Detailseiten parallel an; AutoThrottle regelt nach Antwortzeit nach
+AUTOTHROTTLE_ENABLED = True
 # The initial download delay
-#AUTOTHROTTLE_START_DELAY = 5
+AUTOTHROTTLE_START_DELAY = 0.5
 # The maximum download delay to be set in case of high latencies
-#AUTOTHROTTLE_MAX_DELAY = 60
+AUTOTHROTTLE_MAX_DELAY = 10
 # The average number of requests Scrapy should be sending in parallel to
 # each remote server
-#AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
+AUTOTHROTTLE_TARGET_CONCURRENCY = 8.0
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
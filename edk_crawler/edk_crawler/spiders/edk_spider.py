@@ -1,37 +1,169 @@
+import json
+import math
+import os
+import sys
+
 import scrapy
 from edk_crawler.items import EdkCrawlerItem
 
+# Markdown-Umwandlung wie in den eigenständigen Scrapern (get_json_from_edk_api/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "get_json_from_edk_api"))
+from markdown_cache import MarkdownConversionCache
+
 
 class EdkSpider(scrapy.Spider):
+    """
+    Holt die Stellen über dieselbe JSON-API wie die eigenständigen Scraper
+    (die Stellenbörse selbst wird erst im Browser gerendert).
+    Listenseiten werden parallel angefragt, die Zusammenfassung jedes Jobs
+    geht per cb_kwargs an den Callback der Detailseite.
+    """
     name = "edk_jobs"
-    allowed_domain = ['www.edeka.de']
-    start_urls = ['https://verbund.edeka/karriere/stellenbörse/#/']
+    allowed_domains = ['verbund.edeka']
+
+    API_URL = "https://verbund.edeka/api/v2/career/vacancies"
+    PAGE_SIZE = 50
+    PAGE_WINDOW = 8     # Listenseiten im Voraus, wenn die API keine Gesamtzahl liefert
+    MAX_PAGES = 1000    # Sicherheitsgrenze wie in den Scrapern
+    MAX_SKIPPED_PAGES = 20  # Danach keine weiteren Seiten im Fenster-Modus (API vermutlich gestört)
+    # Mögliche Felder mit der Gesamtzahl in der API-Antwort
+    TOTAL_PAGES_KEYS = ("totalPages",)
+    TOTAL_JOBS_KEYS = ("totalElements", "totalCount", "total", "count")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.markdown_cache = MarkdownConversionCache()
+        self._window_mode = False
+        self._skipped_pages = 0
 
-    def parse(self, response):
-        self.logger.info("Extrahiere Seite: %s", response.url)
+    async def start(self):
+        yield self._page_request(0)
 
-        job_posts = response.css('.o-job-board__results-l__wrapper')
+    def _page_request(self, page):
+        return scrapy.Request(
+            f"{self.API_URL}?page={page}&size={self.PAGE_SIZE}",
+            callback=self.parse_page,
+            errback=self.page_failed,
+            cb_kwargs={"page": page},
+            headers={"Accept": "application/json"},
+            # API-Seiten bei jedem Lauf neu laden, auch wenn der Dupefilter sie schon kennt
+            dont_filter=True,
+        )
 
-        if not job_posts:
-            self.logger.warning("Keine Jobs gefunden mit XPath.")
+    def _total_pages(self, data):
+        for key in self.TOTAL_PAGES_KEYS:
+            if isinstance(data.get(key), int):
+                return data[key]
+        for key in self.TOTAL_JOBS_KEYS:
+            if isinstance(data.get(key), int):
+                return math.ceil(data[key] / self.PAGE_SIZE)
+        return None
+
+    def parse_page(self, response, page):
+        try:
+            data = response.json()
+        except json.JSONDecodeError as e:
+            self.logger.error("Keine gültige JSON-Antwort auf Seite %d: %s", page, e)
+            yield from self._skip_page(page)
+            return
+
+        entries = data.get('entries')
+        if not entries:
+            self.logger.info("Keine weiteren Jobs auf Seite %d.", page)
             return
+        self.logger.info("Seite %d: %d Jobs", page, len(entries))
+
+        if page == 0:
+            total_pages = self._total_pages(data)
+            if total_pages is not None:
+                # Alle Seiten auf einmal an den Scheduler, Scrapy verteilt sie nach CONCURRENT_REQUESTS
+                for next_page in range(1, min(total_pages, self.MAX_PAGES)):
+                    yield self._page_request(next_page)
+            else:
+                # Gesamtzahl unbekannt: immer PAGE_WINDOW Seiten vorausladen, bis eine Seite leer ist
+                self._window_mode = True
+                for next_page in range(1, min(self.PAGE_WINDOW + 1, self.MAX_PAGES)):
+                    yield self._page_request(next_page)
+        else:
+            yield from self._continue_window(page)
+
+        for entry in entries:
+            summary = self._extract_job_summary(entry)
+            if summary['url']:
+                yield scrapy.Request(
+                    response.urljoin(summary['url']),
+                    callback=self.parse_job,
+                    errback=self.detail_failed,
+                    cb_kwargs={"summary": summary},
+                )
+            else:
+                self.logger.warning("Job '%s' hat keine Detail-URL.", summary['job_title'])
+                yield EdkCrawlerItem(description="Keine JobURL verfügbar.", **summary)
+
+    def _continue_window(self, page):
+        # Im Fenster-Modus plant jede Seite die Seite PAGE_WINDOW weiter ein, auch wenn sie selbst fehlschlägt
+        if self._window_mode and page + self.PAGE_WINDOW < self.MAX_PAGES:
+            yield self._page_request(page + self.PAGE_WINDOW)
+
+    def _skip_page(self, page):
+        self._skipped_pages += 1
+        self.crawler.stats.inc_value("edk/list_pages_skipped")
+        if self._skipped_pages > self.MAX_SKIPPED_PAGES:
+            self.logger.error("Mehr als %d Listenseiten fehlgeschlagen, keine weiteren Seiten nach %d.",
+                              self.MAX_SKIPPED_PAGES, page)
+            return
+        yield from self._continue_window(page)
+
+    def page_failed(self, failure):
+        page = failure.request.cb_kwargs["page"]
+        self.logger.error("Listenseite %d nicht abrufbar, Jobs dieser Seite fehlen: %s", page, failure.value)
+        yield from self._skip_page(page)
+
+    def _extract_job_summary(self, job_data):
+        """
+        Felder wie in _extract_job_summary der Scraper (EdekaJob-Schema).
+        """
+        location_parts = [
+            job_data.get("locationName", "N/A"),
+            job_data.get("locationStreet", ""),
+            job_data.get("locationZipCode", ""),
+            job_data.get("locationCity", "")
+        ]
+        return {
+            "url": job_data.get("detailPageUrl"),
+            "department": job_data.get("companyName", "N/A"),
+            "job_title": job_data.get("title", "Kein Titel vorhanden"),
+            "level": job_data.get("level", "Unbestimmt"),
+            "location": ", ".join(filter(None, location_parts)).strip(),
+            "schedule": job_data.get("timeType", "Vollzeit/Teilzeit"),
+        }
+
+    def parse_job(self, response, summary):
+        yield EdkCrawlerItem(description=self._extract_description(response), **summary)
 
+    def _extract_description(self, response):
+        # 1. Versuch JSON-LD
+        for script in response.xpath('//script[@type="application/ld+json"]/text()').getall():
+            try:
+                json_data = json.loads(script)
+            except json.JSONDecodeError as e:
+                self.logger.warning("Fehler beim Parsen von JSON-LD auf %s: %s", response.url, e)
+                continue
+            if isinstance(json_data, dict) and json_data.get('@type') == 'JobPosting' and json_data.get('description'):
+                return self.markdown_cache.convert(json_data['description'])
 
-        for job in job_posts:
-            item = EdkCrawlerItem()
+        # 2. Fallback: Div mit der Beschreibung
+        description_div = response.css('div.job-description').get()
+        if description_div:
+            return self.markdown_cache.convert(description_div)
 
-            item['title'] = job.css('a.o-job-board__results-l__title-body::text').get()
-            item['company'] = job.css('div.o-job-board__results-l__company-body::text').get()
-            item['location'] = job.css('div.o-job-board__results-l__location-body::text').get()
-            item['url'] = job.css('div.o-job-board__results-l__title-body::attr(href)').get()
-            yield scrapy.Request(response.urljoin(item['url']), callback=self.parse_job)
+        self.logger.warning("Keine Jobbeschreibung gefunden: %s", response.url)
+        return "Keine Beschreibung gefunden."
 
-        next_page = None
-        if next_page is not None:
-            yield response.follow(next_page, self.parse)
+    def detail_failed(self, failure):
+        summary = failure.request.cb_kwargs["summary"]
+        self.logger.error("Detailseite nicht abrufbar: %s (%s)", summary['url'], failure.value)
+        yield EdkCrawlerItem(description="Fehler: Detailseite nicht abrufbar.", detail_failed=True, **summary)
 
-    
-    def parse_job(self, response):
-        item = EdkCrawlerItem()
-        item['description'] = response.css('.o-m201-job-copy__inner::text').getall()
-        yield item
+    def closed(self, reason):
+        self.markdown_cache.log_stats()
@@ -0,0 +1,53 @@
+# benchmark_fast_markdown.py
+# Misst die Umwandlungszeit pro Dokument: markdownify gegen fast_markdown.
+# Korpus wie in check_fast_markdown.py.
+# Aufruf: python benchmark_fast_markdown.py [--raw-json edk_job_data_raw.json] [--repeat 5]
+
+import argparse
+import statistics
+import time
+
+from markdownify import markdownify as md
+
+from check_fast_markdown import build_corpus
+from fast_markdown import MARKDOWN_OPTIONS, html_to_markdown, parse_job_html
+
+
+def time_per_document(convert, documents, repeat: int) -> list:
+    """
+    Beste Zeit aus `repeat` Läufen pro Dokument, in Mikrosekunden.
+    """
+    timings = []
+    for html_content in documents:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            convert(html_content)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None or elapsed < best else best
+        timings.append(best * 1e6)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vergleicht die Geschwindigkeit von markdownify und fast_markdown.")
+    parser.add_argument("--raw-json", help="Scraper-Ausgabe im Raw-Modus")
+    parser.add_argument("--html-dir", help="Verzeichnis mit .html-Dateien")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen pro Dokument")
+    args = parser.parse_args()
+
+    documents = [html_content for _, html_content in build_corpus(args.raw_json, args.html_dir)]
+    fast_count = sum(1 for html_content in documents if parse_job_html(html_content) is not None)
+
+    slow = time_per_document(lambda h: md(h, **MARKDOWN_OPTIONS), documents, args.repeat)
+    fast = time_per_document(html_to_markdown, documents, args.repeat)
+    speedups = [s / f for s, f in zip(slow, fast) if f > 0]
+
+    print(f"{len(documents)} Dokumente, {fast_count} über den schnellen Weg, "
+          f"durchschnittlich {statistics.mean(len(d) for d in documents):.0f} Zeichen HTML")
+    print(f"{'':<14} | {'Median µs':>10} | {'Mittel µs':>10} | {'Summe ms':>9}")
+    print("-" * 52)
+    for name, timings in (("markdownify", slow), ("fast_markdown", fast)):
+        print(f"{name:<14} | {statistics.median(timings):>10.1f} | {statistics.mean(timings):>10.1f} | {sum(timings) / 1000:>9.1f}")
+    print(f"Beschleunigung pro Dokument: Median {statistics.median(speedups):.1f}x, "
+          f"gesamt {sum(slow) / sum(fast):.1f}x")
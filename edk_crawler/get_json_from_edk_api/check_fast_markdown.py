@@ -0,0 +1,197 @@
+# check_fast_markdown.py
+# Differenzprüfung: fast_markdown.html_to_markdown muss für jedes Dokument exakt
+# dasselbe liefern wie markdownify. Korpus-Quellen (beliebig kombinierbar):
+#   --raw-json   Scraper-Ausgabe aus dem Raw-Modus (EDK_RAW_HTML=1), echtes JobPosting-HTML
+#   --html-dir   Verzeichnis mit .html-Dateien
+#   ohne Angabe  HTML, das aus den Markdown-Beschreibungen in edk_job_data.json
+#                zurückgebaut wird, plus handgeschriebene Grenzfälle
+#   --fuzz       zufällige Dokumente aus den unterstützten Tags (Standard 500)
+# Aufruf: python check_fast_markdown.py [--raw-json edk_job_data_raw.json] [--html-dir html/]
+# Exit-Code 1 bei Abweichungen.
+
+import argparse
+import difflib
+import glob
+import json
+import os
+import random
+import re
+import sys
+from html import unescape
+from typing import List, Tuple
+
+from markdownify import markdownify as md
+
+from description_table import resolve_jobs
+from fast_markdown import MARKDOWN_OPTIONS, html_to_markdown, parse_job_html
+from lazy_description import is_raw_description, unpack_raw_html
+
+
+# Grenzfälle, die im zurückgebauten Korpus nicht vorkommen
+EDGE_CASES = [
+    "",
+    "Nur Text ohne Tags",
+    "<p>  Leerzeichen   am\n\tRand  </p>",
+    "<p>a<br>b<br/>c<br />  </p>",
+    "<p><br></p><p> </p><p> </p>",
+    "<h2>Titel mit <strong>Fett</strong><br>und Umbruch</h2>",
+    "<h3>  </h3><p>leer davor</p>",
+    "<ul><li>a<ul><li>b<ul><li>c</li></ul></li></ul></li><li>d</li></ul>Text danach",
+    "<ol><li>eins</li><li>zwei</li></ol><ol start=\"5\"><li>fünf</li><li>sechs</li></ol>",
+    "<ul>\n  <li>\n    <p>Absatz im Punkt</p>\n  </li>\n</ul>\n<p>nach der Liste</p>",
+    "<ul><li></li><li> </li><li><strong></strong></li></ul>",
+    "<p><strong> fett mit Rand </strong>und <em>kursiv</em>, <b>b</b><i>i</i></p>",
+    "<p>Sternchen * und Unter_strich _x_ **nicht fett**</p>",
+    "<div class=\"job-description\"><p>Im Div</p><div><span>span</span> text</div></div>",
+    "<p>" + "langes Wort " * 30 + "</p>",
+    "<p>" + "x" * 120 + " kurz</p>",
+    "<p>Zeile mit geschütztem Leerzeichen " + "wort " * 20 + "</p>",
+    "<P>Großbuchstaben</P><UL><LI>Punkt</LI></UL>",
+    "<p>a < b und c > d</p>",
+    "<p>Kommentar <!-- weg --> hier</p>",
+    "<p>Link <a href=\"https://example.org\">hier</a></p>",
+    "<table><tr><td>Tabelle</td></tr></table>",
+    "<p>nicht geschlossen",
+    "<p>a<ul><li>Liste im Absatz</li></ul></p>",
+    "<p>Entity &amp; &nbsp; &#x41;</p>",
+    "<p title=\"a>b\">Attribut mit &gt;</p>",
+    "<p/>selbstschließend",
+]
+
+
+def markdown_to_job_html(markdown: str, rng: random.Random) -> str:
+    """
+    Baut aus einer gespeicherten Markdown-Beschreibung HTML im Stil der JobPosting-Seiten.
+    Die Formatierung (Zeilenumbrüche, Einrückung) variiert zufällig.
+    """
+    def inline(text: str) -> str:
+        text = text.replace("\\*", "\x00").replace("\\_", "\x01")
+        text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+        text = re.sub(r"(?<![\w*])\*([^*]+?)\*", r"<em>\1</em>", text)
+        return text.replace("\x00", "*").replace("\x01", "_").strip()
+
+    sep = rng.choice(["", "\n", "\n  "])
+    parts = []
+    paragraph: List[str] = []
+    items: List[str] = []
+
+    def flush():
+        if paragraph:
+            parts.append("<p>" + "<br>".join(paragraph) + "</p>")
+            paragraph.clear()
+        if items:
+            parts.append("<ul>" + sep + sep.join(f"<li>{item}</li>" for item in items) + sep + "</ul>")
+            items.clear()
+
+    for line in markdown.split("\n"):
+        heading = re.match(r"^(#{1,6}) (.*)", line)
+        item = re.match(r"^[*+-] (.*)", line)
+        if heading:
+            flush()
+            parts.append(f"<h{len(heading.group(1))}>{inline(heading.group(2))}</h{len(heading.group(1))}>")
+        elif item:
+            if paragraph:
+                flush()
+            items.append(inline(item.group(1)))
+        elif not line.strip():
+            flush()
+            if line:
+                parts.append("<p><br></p>")
+        elif items and line.startswith("  "):
+            items[-1] += " " + inline(line)
+        else:
+            if items:
+                flush()
+            paragraph.append(inline(line))
+    flush()
+    return sep.join(parts)
+
+
+def random_job_html(rng: random.Random, depth: int = 0) -> str:
+    """
+    Zufälliges HTML aus den unterstützten Tags, mit viel Leerraum und Sonderzeichen.
+    """
+    words = ["Wir", "bieten", "Dir", "Urlaubs-", "Weihnachtsgeld", "m/w/d", "*", "_", "a_b", "\xa0",
+             "x" * rng.randint(1, 90), "1.", "#", "-", "\u00e4\u00f6\u00fc", "Teil-/Vollzeit", ":"]
+    spaces = ["", " ", "  ", "\n", " \n  ", "\t", "\r\n"]
+
+    def text() -> str:
+        return rng.choice(spaces).join(rng.choice(words) for _ in range(rng.randint(0, 25)))
+
+    def node(level: int) -> str:
+        if level > 3 or rng.random() < 0.3:
+            return text()
+        tag = rng.choice(["p", "p", "ul", "ol", "strong", "b", "em", "i", "br", "h2", "h3", "div", "span", "li"])
+        if tag == "br":
+            return rng.choice(["<br>", "<br>", "<br/>"])
+        if tag in ("ul", "ol"):
+            attrs = ' start="%d"' % rng.randint(0, 9) if tag == "ol" and rng.random() < 0.3 else ""
+            items = rng.choice(spaces).join(f"<li>{children(level + 1)}</li>" for _ in range(rng.randint(0, 4)))
+            return f"<{tag}{attrs}>{rng.choice(spaces)}{items}{rng.choice(spaces)}</{tag}>"
+        return f"<{tag}>{children(level + 1)}</{tag}>"
+
+    def children(level: int) -> str:
+        return "".join(node(level) + rng.choice(spaces) for _ in range(rng.randint(0, 4)))
+
+    return children(depth)
+
+
+def build_corpus(raw_json: str = None, html_dir: str = None, fuzz: int = 0, seed: int = 1) -> List[Tuple[str, str]]:
+    """
+    Liefert (Name, HTML)-Paare. Das HTML ist wie im Scraper bereits mit unescape() behandelt.
+    """
+    corpus = []
+    if raw_json:
+        with open(raw_json, 'r', encoding='utf-8') as f:
+            jobs = resolve_jobs(json.load(f))
+        for i, job in enumerate(jobs):
+            if is_raw_description(job.get("description")):
+                corpus.append((f"{raw_json}#{i}", unescape(unpack_raw_html(job["description"]))))
+    if html_dir:
+        for path in sorted(glob.glob(os.path.join(html_dir, "*.html"))):
+            with open(path, 'r', encoding='utf-8') as f:
+                corpus.append((path, unescape(f.read())))
+    if not corpus:
+        rng = random.Random(seed)
+        data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "edk_job_data.json")
+        with open(data_file, 'r', encoding='utf-8') as f:
+            jobs = resolve_jobs(json.load(f))
+        for i, job in enumerate(jobs):
+            description = job.get("description")
+            if description and not is_raw_description(description):
+                corpus.append((f"edk_job_data.json#{i}", markdown_to_job_html(description, rng)))
+        corpus.extend((f"edge#{i}", html) for i, html in enumerate(EDGE_CASES))
+    rng = random.Random(seed)
+    corpus.extend((f"zufall#{i}", random_job_html(rng)) for i in range(fuzz))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vergleicht fast_markdown mit markdownify auf einem HTML-Korpus.")
+    parser.add_argument("--raw-json", help="Scraper-Ausgabe im Raw-Modus")
+    parser.add_argument("--html-dir", help="Verzeichnis mit .html-Dateien")
+    parser.add_argument("--fuzz", type=int, default=500, help="Zusätzliche zufällige Dokumente aus den unterstützten Tags")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.raw_json, args.html_dir, args.fuzz, args.seed)
+    mismatches = 0
+    fast_path = 0
+    for name, html_content in corpus:
+        if parse_job_html(html_content) is not None:
+            fast_path += 1
+        expected = md(html_content, **MARKDOWN_OPTIONS)
+        actual = html_to_markdown(html_content)
+        if actual != expected:
+            mismatches += 1
+            print(f"ABWEICHUNG: {name}")
+            for line in difflib.unified_diff(expected.splitlines(), actual.splitlines(), "markdownify", "fast_markdown", lineterm="", n=1):
+                print("    " + line)
+
+    print(f"{len(corpus)} Dokumente geprüft, {fast_path} über den schnellen Weg, "
+          f"{len(corpus) - fast_path} über markdownify, {mismatches} Abweichungen.")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# description_table.py
+# Viele Stellen teilen sich denselben Beschreibungstext. Im deduplizierten Format
+# steht jeder Text nur einmal in einer Tabelle (Schlüssel = Hash des Inhalts),
+# die Jobs verweisen über "description_ref" darauf.
+#
+# Aufbau der Datei:
+#   {"format": "edk-jobs-dedup/1",
+#    "descriptions": {"<hash>": "<Markdown>", ...},
+#    "jobs": [{"url": ..., ..., "description_ref": "<hash>"}, ...]}
+
+import hashlib
+import json
+from typing import Dict, List
+
+from job_record import JobRecord
+
+
+DEDUP_FORMAT = "edk-jobs-dedup/1"
+REF_KEY = "description_ref"
+HASH_LENGTH = 32    # Hex-Zeichen (128 Bit) reichen für eindeutige Schlüssel
+
+
+def description_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def _replace_key(job: dict, old_key: str, new_key: str, value) -> dict:
+    """
+    Tauscht einen Schlüssel aus, ohne die Reihenfolge der Felder zu ändern
+    (json_to_csv nimmt die Spalten aus dem ersten Job).
+    """
+    return {(new_key if key == old_key else key): (value if key == old_key else v) for key, v in job.items()}
+
+
+class DescriptionTable:
+    """
+    Hält jede Beschreibung genau einmal. Die Scraper legen die Jobs beim Sammeln
+    schon mit Verweis ab, damit auch im Speicher keine Kopien entstehen.
+    """
+
+    def __init__(self):
+        self.descriptions: Dict[str, str] = {}
+
+    def add(self, text: str) -> str:
+        key = description_hash(text)
+        self.descriptions.setdefault(key, text)
+        return key
+
+    def to_reference(self, job: dict) -> dict:
+        """
+        Gibt eine Kopie des Jobs zurück, in der die Beschreibung durch ihren Hash ersetzt ist.
+        """
+        if isinstance(job, JobRecord):
+            return job if job.description is None else job.with_description_ref(self.add(job.description))
+        if "description" not in job or job["description"] is None:
+            return dict(job)
+        return _replace_key(job, "description", REF_KEY, self.add(job["description"]))
+
+    def to_document(self, jobs: List[dict]) -> dict:
+        return {"format": DEDUP_FORMAT, "descriptions": self.descriptions, "jobs": jobs}
+
+
+def resolve_jobs(data) -> List[dict]:
+    """
+    Liefert die Jobs immer als normale Liste mit "description".
+    Alte Dateien (einfache Liste) werden unverändert zurückgegeben.
+    """
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict) or data.get("format") != DEDUP_FORMAT:
+        raise ValueError("Unbekanntes Format der Jobdatei.")
+
+    descriptions = data["descriptions"]
+    jobs = []
+    for job in data["jobs"]:
+        if REF_KEY in job:
+            job = _replace_key(job, REF_KEY, "description", descriptions[job[REF_KEY]])
+        jobs.append(job)
+    return jobs
+
+
+def load_jobs(filename: str) -> List[dict]:
+    """
+    Liest eine Jobdatei in beiden Formaten.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        return resolve_jobs(json.load(f))
@@ -0,0 +1,255 @@
+# fast_markdown.py
+# Schneller HTML->Markdown-Konverter für die Edeka-Stellenbeschreibungen (JobPosting).
+# Die Beschreibungen nutzen nur wenige Tags (p, ul/ol/li, strong/b, em/i, br, h1-h6,
+# div, span). Dafür reicht ein einfacher Tokenizer per Regex statt BeautifulSoup;
+# die Umwandlung bildet markdownify mit MARKDOWN_OPTIONS Zeichen für Zeichen nach.
+# Alles andere (andere Tags, Kommentare, Entities, unbalancierte Tags) geht an markdownify.
+# Prüfung gegen markdownify: check_fast_markdown.py, Messung: benchmark_fast_markdown.py
+
+import re
+from textwrap import fill
+from typing import Optional
+
+from markdownify import markdownify as md
+
+
+# Einstellungen für die Umwandlung HTML -> Markdown, für beide Scraper gleich.
+# Der schnelle Weg setzt genau diese Werte um.
+MARKDOWN_OPTIONS = {
+    "heading_style": "ATX",
+    "strong_em_with_underscores": False,
+    "wrap": True,
+}
+WRAP_WIDTH = 80     # Standardwert von markdownify
+
+_HEADING_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+_BLOCK_TAGS = frozenset(("p", "div", "ul", "ol", "li")) | _HEADING_TAGS
+_INLINE_MARKUP = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+SUPPORTED_TAGS = _BLOCK_TAGS | frozenset(("br", "span")) | frozenset(_INLINE_MARKUP)
+
+_RE_TAG = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)([^<>]*)>")
+_RE_ENTITY = re.compile(r"&[#a-zA-Z]")
+_RE_OL_START = re.compile(r"""(?:^|\s)start\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>/]+))""", re.IGNORECASE)
+_RE_ALL_WHITESPACE = re.compile(r"[\t \r\n]+")
+_RE_EXTRACT_NEWLINES = re.compile(r"^(\n*)((?:.*[^\n])?)(\n*)$", flags=re.DOTALL)
+_RE_LINE_WITH_CONTENT = re.compile(r"^(.*)", flags=re.MULTILINE)
+_RE_OTHER_WHITESPACE = re.compile(r"[^\S ]")   # Leerraum außer dem normalen Leerzeichen (auch \xa0)
+_BS4_SPACES = "\x20\x0a\x09\x0c\x0d"
+_BULLETS = "*+-"
+
+
+class _Element:
+    __slots__ = ("name", "attrs", "children", "parent")
+
+    def __init__(self, name: str, attrs: str, parent: Optional["_Element"]):
+        self.name = name
+        self.attrs = attrs
+        self.children: list = []
+        self.parent = parent
+
+
+def _append_text(element: _Element, text: str):
+    # Wie BeautifulSoup: reine Leerraum-Texte werden zu "\n" bzw. " "
+    if not text.strip(_BS4_SPACES):
+        text = "\n" if "\n" in text else " "
+    element.children.append(text)
+
+
+def parse_job_html(html_content: str) -> Optional[_Element]:
+    """
+    Zerlegt das HTML in einen Baum, wenn es nur unterstützte Tags enthält und
+    sauber verschachtelt ist. Sonst None (dann übernimmt markdownify).
+    """
+    if _RE_ENTITY.search(html_content):
+        return None
+    document = _Element("[document]", "", None)
+    current = document
+    position = 0
+    tag_count = 0
+    plain_br_seen = False
+    for match in _RE_TAG.finditer(html_content):
+        tag_count += 1
+        if match.start() > position:
+            _append_text(current, html_content[position:match.start()])
+        position = match.end()
+
+        closing, name, attrs = match.groups()
+        name = name.lower()
+        if name not in SUPPORTED_TAGS or attrs.count('"') % 2 or attrs.count("'") % 2:
+            return None
+        if closing:
+            if current.name != name:
+                return None
+            current = current.parent
+        elif name == "br":
+            # BeautifulSoup lässt ein <br/> nach einem früheren <br> offen - das bilden wir nicht nach
+            if attrs.rstrip().endswith("/"):
+                if plain_br_seen:
+                    return None
+            else:
+                plain_br_seen = True
+            current.children.append(_Element(name, attrs, current))
+        elif attrs.rstrip().endswith("/"):
+            return None
+        else:
+            element = _Element(name, attrs, current)
+            current.children.append(element)
+            current = element
+
+    # Jedes "<" muss zu einem erkannten Tag gehören (sonst z. B. Kommentare oder "a < b")
+    if current is not document or html_content.count("<") != tag_count:
+        return None
+    if position < len(html_content):
+        _append_text(current, html_content[position:])
+    return document
+
+
+def _is_block(node) -> bool:
+    return type(node) is _Element and node.name in _BLOCK_TAGS
+
+
+def _escape(text: str) -> str:
+    return text.replace("*", r"\*").replace("_", r"\_")
+
+
+def _process_text(text: str, prev, nxt, remove_inside: bool) -> str:
+    text = _escape(_RE_ALL_WHITESPACE.sub(" ", text))
+    if _is_block(prev) or (remove_inside and prev is None):
+        text = text.lstrip(" \t\r\n")
+    if _is_block(nxt) or (remove_inside and nxt is None):
+        text = text.rstrip()
+    return text
+
+
+def _process_element(element: _Element, siblings: list, index: int, in_li: bool, inline: bool, ul_depth: int) -> str:
+    name = element.name
+    children = element.children
+    remove_inside = name in _BLOCK_TAGS
+    child_in_li = in_li or name == "li"
+    child_inline = inline or name in _HEADING_TAGS
+    child_ul_depth = ul_depth + (name == "ul")
+
+    strings = []
+    last = len(children) - 1
+    for i, child in enumerate(children):
+        prev = children[i - 1] if i > 0 else None
+        nxt = children[i + 1] if i < last else None
+        if type(child) is str:
+            if child.strip() == "":
+                if remove_inside and (prev is None or nxt is None):
+                    continue
+                if _is_block(prev) or _is_block(nxt):
+                    continue
+            text = _process_text(child, prev, nxt, remove_inside)
+        else:
+            text = _process_element(child, children, i, child_in_li, child_inline, child_ul_depth)
+        if text:
+            strings.append(text)
+
+    # Zeilenumbrüche an den Grenzen der Kindelemente zusammenfassen (max. 2)
+    collapsed = [""]
+    for string in strings:
+        leading, content, trailing = _RE_EXTRACT_NEWLINES.match(string).groups()
+        if collapsed[-1] and leading:
+            prev_trailing = collapsed.pop()
+            leading = "\n" * min(2, max(len(prev_trailing), len(leading)))
+        collapsed.extend((leading, content, trailing))
+    text = "".join(collapsed)
+
+    return _convert(element, text, siblings, index, in_li, inline, ul_depth)
+
+
+def _chomp_markup(text: str, markup: str) -> str:
+    prefix = " " if text and text[0] == " " else ""
+    suffix = " " if text and text[-1] == " " else ""
+    text = text.strip()
+    if not text:
+        return ""
+    return f"{prefix}{markup}{text}{markup}{suffix}"
+
+
+def _wrap_line(line: str) -> str:
+    # Kurze Zeilen, die nur normale Leerzeichen enthalten: textwrap.fill würde nur
+    # die Leerzeichen am Ende entfernen
+    if len(line) <= WRAP_WIDTH and not _RE_OTHER_WHITESPACE.search(line):
+        return line.rstrip(" ")
+    return fill(line, width=WRAP_WIDTH, break_long_words=False, break_on_hyphens=False)
+
+
+def _convert(element: _Element, text: str, siblings: list, index: int, in_li: bool, inline: bool, ul_depth: int) -> str:
+    name = element.name
+
+    if name == "[document]":
+        return text.strip("\n")
+
+    if name == "p":
+        if inline:
+            return " " + text.strip(" \t\r\n") + " "
+        text = text.strip(" \t\r\n")
+        new_lines = []
+        for line in text.split("\n"):
+            line = line.lstrip(" \t\r\n")
+            line_no_trailing = line.rstrip()
+            trailing = line[len(line_no_trailing):]
+            new_lines.append(_wrap_line(line) + trailing)
+        text = "\n".join(new_lines)
+        return f"\n\n{text}\n\n" if text else ""
+
+    if name in _INLINE_MARKUP:
+        return _chomp_markup(text, _INLINE_MARKUP[name])
+
+    if name == "br":
+        return " " if inline else "  \n"
+
+    if name in _HEADING_TAGS:
+        if inline:
+            return text
+        text = _RE_ALL_WHITESPACE.sub(" ", text.strip())
+        return f"\n\n{'#' * int(name[1])} {text}\n\n"
+
+    if name == "ul" or name == "ol":
+        before_paragraph = False
+        for sibling in siblings[index + 1:]:
+            if type(sibling) is _Element or sibling.strip() != "":
+                before_paragraph = type(sibling) is not _Element or sibling.name not in ("ul", "ol")
+                break
+        if in_li:
+            return "\n" + text.rstrip()
+        return "\n\n" + text + ("\n" if before_paragraph else "")
+
+    if name == "li":
+        text = text.strip()
+        if not text:
+            return "\n"
+        parent = element.parent
+        if parent is not None and parent.name == "ol":
+            start_match = _RE_OL_START.search(parent.attrs)
+            start_value = next((g for g in start_match.groups() if g is not None), "") if start_match else ""
+            start = int(start_value) if start_value and start_value.isnumeric() else 1
+            previous_items = sum(1 for s in siblings[:index] if type(s) is _Element and s.name == "li")
+            bullet = f"{start + previous_items}."
+        else:
+            bullet = _BULLETS[(ul_depth - 1) % len(_BULLETS)]
+        bullet += " "
+        bullet_indent = " " * len(bullet)
+        text = _RE_LINE_WITH_CONTENT.sub(lambda m: bullet_indent + m.group(1) if m.group(1) else "", text)
+        return bullet + text[len(bullet):] + "\n"
+
+    if name == "div":
+        if inline:
+            return " " + text.strip() + " "
+        text = text.strip()
+        return f"\n\n{text}\n\n" if text else ""
+
+    # span: nur der Text
+    return text
+
+
+def html_to_markdown(html_content: str) -> str:
+    """
+    Liefert dasselbe Ergebnis wie markdownify(html_content, **MARKDOWN_OPTIONS).
+    """
+    document = parse_job_html(html_content)
+    if document is None:
+        return md(html_content, **MARKDOWN_OPTIONS)
+    return _process_element(document, [document], 0, False, False, 0)
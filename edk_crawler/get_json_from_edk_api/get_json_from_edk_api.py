@@ -3,11 +3,19 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import time
-from html import unescape
-from markdownify import markdownify as md
 import logging 
+import os
+import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
+from markdown_cache import MarkdownConversionCache
+from description_table import DescriptionTable
+from lazy_description import pack_raw_html
+from job_record import JobRecord, to_json
+
+# Ratenlimit pro Host und robots.txt (crawler/politeness.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "crawler"))
+from politeness import PolitenessScheduler
 
 
 # Format Logging
@@ -26,33 +34,47 @@ class EdkJobScraper:
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     PAGE_SIZE = 50
-    REQUEST_DELAY_SECONDS = 0.2
     MAX_CONCURRENT_DETAIL_REQUESTS =30  # gleichzeitige Detailanfragen (Threads), evtl ändern
+    # Höflichkeit pro Host (statt globalem time.sleep), ein Crawl-delay aus robots.txt senkt die Rate.
+    # Standardwert, änderbar über requests_per_second bzw. EDK_REQUESTS_PER_SECOND
+    REQUESTS_PER_SECOND_PER_HOST = 20
+    OBEY_ROBOTS_TXT = True
 
     # Semaphore, um die anzahl der gleichzeitig aktiven HTTP-Anfragen zu begrenzen
     _request_semaphore = threading.Semaphore(MAX_CONCURRENT_DETAIL_REQUESTS)
 
     # Konstruktor
-    def __init__(self, output_json_filename='edk_job_data.json'):
+    def __init__(self, output_json_filename='edk_job_data.json', markdown_cache=None, dedupe_descriptions=False, raw_html=False,
+                 politeness=None, requests_per_second=None):
         self.output_json_filename = output_json_filename
+        # Gemeinsamer Scheduler für alle Threads: ein Token-Bucket pro Host
+        self.politeness = politeness or PolitenessScheduler(
+            rate=requests_per_second or self.REQUESTS_PER_SECOND_PER_HOST, burst=self.MAX_CONCURRENT_DETAIL_REQUESTS,
+            obey_robots=self.OBEY_ROBOTS_TXT, user_agent=self.HEADERS['User-Agent'])
         self.all_jobs_details = []
+        # Optional: jede Beschreibung nur einmal speichern, Jobs verweisen per Hash darauf
+        self.description_table = DescriptionTable() if dedupe_descriptions else None
+        # Gleiche Beschreibungen werden nur einmal in Markdown umgewandelt
+        self.markdown_cache = markdown_cache or MarkdownConversionCache()
+        # Raw-Modus: komprimiertes HTML speichern, Markdown erst beim Verbraucher (render_descriptions.py)
+        self._convert_description = pack_raw_html if raw_html else self.markdown_cache.convert
 
 
-    def _make_request(self, url, method="GET", params=None, delay=False, use_semaphore=False):
+    def _make_request(self, url, method="GET", params=None, use_semaphore=False):
         """
         Private Helfermethode zum senden der HTTP-Anfragen. Fehlerbehandlung.
-        :param delay: Wenn True, wird REQUEST_DELAY_SECONDS angewendet.
+        Jede Anfrage wartet auf das Ratenlimit ihres Hosts und prüft robots.txt.
         :param use_semaphore: Wenn True, wird das Request-Semaphore verwendet
         """
-        if delay:
-            time.sleep(self.REQUEST_DELAY_SECONDS)
-
         # Get a Token from Semaphore, wait if all Tokens are taken.
         if use_semaphore:
             self._request_semaphore.acquire() # Token nehmen
 
         response = None
         try:
+            # Token des Hosts erst mit freiem Platz nehmen, sonst stauen sich Reservierungen
+            if not self.politeness.wait(url):
+                return None     # Durch robots.txt gesperrt
             response = requests.request(method, url, headers=self.HEADERS, params=params, timeout=30)
             response.raise_for_status()  # Wirft automatisch Fehler
             response.encoding = 'utf-8' # Umlaute
@@ -90,15 +112,16 @@ class EdkJobScraper:
         ]
         location = ", ".join(filter(None, location_parts)).strip()
 
-        return {
-            "url": job_data.get("detailPageUrl"),
-            "department": job_data.get("companyName", "N/A"), 
-            "description": None,
-            "job_title": job_data.get("title", "Kein Titel vorhanden"),
-            "level": job_data.get("level", "Unbestimmt"), 
-            "location": location,
-            "schedule": job_data.get("timeType", "Vollzeit/Teilzeit")
-        }
+        # JobRecord statt Dict: weniger Speicher pro Job, Abteilung/Level/Standort/Arbeitszeit interniert
+        return JobRecord(
+            url=job_data.get("detailPageUrl"),
+            department=job_data.get("companyName", "N/A"), 
+            description=None,
+            job_title=job_data.get("title", "Kein Titel vorhanden"),
+            level=job_data.get("level", "Unbestimmt"), 
+            location=location,
+            schedule=job_data.get("timeType", "Vollzeit/Teilzeit")
+        )
 
     
     def _extract_description_from_html(self, html_content):
@@ -123,7 +146,7 @@ class EdkJobScraper:
                         description = json_data.get('description')
                         # print(description)
                         if description:
-                            description_text = md(unescape(description), heading_style="ATX", strong_em_with_underscores=False, wrap=True).strip()
+                            description_text = self._convert_description(description)
                             return description_text
                 except json.JSONDecodeError as e:
                     logging.warning(f"Fehler beim parsen von JSON-LD: {e}")
@@ -134,7 +157,7 @@ class EdkJobScraper:
             description_div = soup.find("div", {"class": "job-description"})  # Beispieleingabe
             if description_div:
                 raw_html_from_div = str(description_div)
-                description_text = md(unescape(raw_html_from_div), heading_style="ATX", strong_em_with_underscores=False, wrap=True).strip()
+                description_text = self._convert_description(raw_html_from_div)
                 return description_text
 
             # Wenn beides fehlschlägt
@@ -185,7 +208,7 @@ class EdkJobScraper:
             url = f"{self.BASE_API_URL}?page={page}&size={self.PAGE_SIZE}"
             logging.info(f"Sammle Daten von Seite: {page} (URL: {url})")
 
-            response = self._make_request(url, delay=True)
+            response = self._make_request(url)
 
             if response is None:  # Prüfen, ob Error
                 logging.error(f"Fehler beim Abrufen der Seite {page}. Abbruch")
@@ -214,6 +237,8 @@ class EdkJobScraper:
                     original_job_summary = futures[future]
                     try:
                         updated_job_summary = future.result()
+                        if self.description_table is not None:
+                            updated_job_summary = self.description_table.to_reference(updated_job_summary)
                         self.all_jobs_details.append(updated_job_summary)
                     except Exception as e:
                         logging.error(f"Job-Beschreibung Verarbeitung für '{original_job_summary.get('job_title', 'Unbekannt')}' Fehler: {e}", exc_info=True)
@@ -234,9 +259,13 @@ class EdkJobScraper:
             logging.warning("Keine Jobdaten zum Speichern vorhanden.")
             return 
         
+        output = self.all_jobs_details
+        if self.description_table is not None:
+            output = self.description_table.to_document(self.all_jobs_details)
+            logging.info(f"{len(self.all_jobs_details)} Jobs teilen sich {len(self.description_table.descriptions)} verschiedene Beschreibungen.")
         try:
             with open(self.output_json_filename, 'w', encoding='utf-8') as f:
-                json.dump(self.all_jobs_details, f, ensure_ascii=False, indent=4)
+                json.dump(output, f, ensure_ascii=False, indent=4, default=to_json)
             logging.info(f"Alle Jobdetails wurden erfolgreich in {self.output_json_filename} gespeichert!")
         except IOError as e:
             logging.error(f"Fehler beim speichern der Datei '{self.output_json_filename}': {e}")
@@ -246,12 +275,23 @@ if __name__ == "__main__":
     start_time = time.time()
     logging.info("Programm Start")
 
-    scraper = EdkJobScraper()
+    # Mit EDK_MARKDOWN_CACHE_FILE bleibt der Markdown-Cache über mehrere Läufe erhalten
+    markdown_cache = MarkdownConversionCache(persist_path=os.environ.get("EDK_MARKDOWN_CACHE_FILE"))
+    # Mit EDK_DEDUPE_DESCRIPTIONS=1 wird jede Beschreibung nur einmal in die JSON-Datei geschrieben
+    # Mit EDK_RAW_HTML=1 wird das HTML gespeichert und erst später umgewandelt
+    # Mit EDK_REQUESTS_PER_SECOND wird das Ratenlimit pro Host geändert (Standard: 20)
+    rate = float(os.environ["EDK_REQUESTS_PER_SECOND"]) if os.environ.get("EDK_REQUESTS_PER_SECOND") else None
+    scraper = EdkJobScraper(markdown_cache=markdown_cache,
+                            dedupe_descriptions=os.environ.get("EDK_DEDUPE_DESCRIPTIONS") == "1",
+                            raw_html=os.environ.get("EDK_RAW_HTML") == "1",
+                            requests_per_second=rate)
 
     # Starte Hauptprozess
     scraper.fetch_all_jobs()
     # Daten speichern
     scraper.save_to_json()
+    markdown_cache.log_stats()
+    markdown_cache.close()
 
     end_time = time.time()
     duration = end_time - start_time
@@ -0,0 +1,83 @@
+# job_record.py
+# Kompakte Darstellung eines Jobs für die Scraper. Bei zehntausenden Jobs kostet
+# ein Dict mit 7 Schlüsseln pro Job spürbar Speicher; JobRecord nutzt __slots__
+# und interniert die Felder mit wenigen verschiedenen Werten (Abteilung, Level,
+# Standort, Arbeitszeit), die sonst in jedem Job als eigene Kopie liegen.
+# Verhält sich lesend wie ein Dict (Mapping) und wird mit to_dict() bzw.
+# json.dump(..., default=to_json) im bisherigen Format (EdekaJob) geschrieben.
+
+import sys
+from collections.abc import Mapping
+
+
+# Reihenfolge wie bisher in _extract_job_summary (bestimmt auch die CSV-Spalten)
+JOB_FIELDS = ("url", "department", "description", "job_title", "level", "location", "schedule")
+# Im deduplizierten Format (description_table.py) steht statt "description" der Verweis
+REF_FIELDS = tuple("description_ref" if field == "description" else field for field in JOB_FIELDS)
+INTERNED_FIELDS = frozenset(("department", "level", "location", "schedule"))
+
+
+class JobRecord(Mapping):
+    """
+    Ein Job mit festen Feldern. Lesen wie bei einem Dict (job["url"], job.get(...),
+    job.items()), Schreiben nur für bekannte Felder (job["description"] = ...).
+    """
+
+    __slots__ = JOB_FIELDS + ("description_ref",)
+
+    def __init__(self, url=None, department=None, description=None, job_title=None,
+                 level=None, location=None, schedule=None):
+        self.url = url
+        self.department = _intern(department)
+        self.description = description
+        self.job_title = job_title
+        self.level = _intern(level)
+        self.location = _intern(location)
+        self.schedule = _intern(schedule)
+        self.description_ref = None
+
+    def _fields(self) -> tuple:
+        return JOB_FIELDS if self.description_ref is None else REF_FIELDS
+
+    def __getitem__(self, key):
+        if key in self._fields():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in JOB_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+
+    def __iter__(self):
+        return iter(self._fields())
+
+    def __len__(self):
+        return len(JOB_FIELDS)
+
+    def __repr__(self):
+        return f"JobRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self._fields()}
+
+    def with_description_ref(self, description_ref: str) -> "JobRecord":
+        """
+        Kopie, die statt der Beschreibung nur deren Hash hält.
+        """
+        record = JobRecord(self.url, self.department, None, self.job_title, self.level, self.location, self.schedule)
+        record.description_ref = description_ref
+        return record
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def to_json(obj):
+    """
+    Für json.dump(..., default=to_json): schreibt JobRecords als normales Objekt.
+    """
+    if isinstance(obj, JobRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -1,6 +1,7 @@
-import json
 import csv
 import time
+from description_table import load_jobs
+from lazy_description import render_description
 
 # Function to clean and format the Markdown text for CSV
 def clean_markdown(text):
@@ -11,9 +12,8 @@ def clean_markdown(text):
 
 # Function to convert JSON to CSV
 def json_to_csv(json_file, csv_file):
-    # Read the JSON data
-    with open(json_file, 'r', encoding='utf-8') as f:
-        job_data = json.load(f)
+    # Read the JSON data (plain list or deduplicated descriptions)
+    job_data = load_jobs(json_file)
 
     # Check if job_data is not empty
     if not job_data:
@@ -32,18 +32,19 @@ def json_to_csv(json_file, csv_file):
         # Clean and format each job entry before writing
         for job in job_data:
             # Clean the description and other fields as needed
-            job['description'] = clean_markdown(job['description'])
+            job['description'] = clean_markdown(render_description(job['description']))
             writer.writerow(job)  # Write the job data
 
     print(f"Data successfully written to {csv_file}")
 
-# Specify the input JSON file and output CSV file
-json_file = 'edk_job_1000.json'  # Change this to your JSON file path
-csv_file = 'edk_jobs_1000.csv'      # Desired output CSV file name
+if __name__ == "__main__":
+    # Specify the input JSON file and output CSV file
+    json_file = 'edk_job_1000.json'  # Change this to your JSON file path
+    csv_file = 'edk_jobs_1000.csv'      # Desired output CSV file name
 
-# Call the function to convert JSON to CSV
-start_time = time.time()
-json_to_csv(json_file, csv_file)
-end_time = time.time()
+    # Call the function to convert JSON to CSV
+    start_time = time.time()
+    json_to_csv(json_file, csv_file)
+    end_time = time.time()
 
-print(f"Programm did run for {(end_time - start_time):.6f} seconds")
+    print(f"Programm did run for {(end_time - start_time):.6f} seconds")
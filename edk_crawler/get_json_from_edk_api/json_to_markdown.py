@@ -4,6 +4,8 @@ import json
 import os
 import re # Für die Bereinigung von Dateinamen
 import logging
+from description_table import resolve_jobs
+from lazy_description import render_description
 
 # Konfiguriere das Logging-System für dieses Skript
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -33,7 +35,8 @@ class JsonToMarkdownConverter:
 
         try:
             with open(self.input_json_filename, 'r', encoding='utf-8') as f:
-                self.job_data = json.load(f)
+                # Verweise auf deduplizierte Beschreibungen werden hier aufgelöst
+                self.job_data = resolve_jobs(json.load(f))
             logging.info(f"Jobdaten erfolgreich aus '{self.input_json_filename}' geladen.")
             if not self.job_data:
                 logging.warning("JSON-Datei enthält keine Jobdaten.")
@@ -42,6 +45,9 @@ class JsonToMarkdownConverter:
         except json.JSONDecodeError as e:
             logging.error(f"Fehler beim Parsen der JSON-Datei '{self.input_json_filename}': {e}")
             return False
+        except (KeyError, ValueError) as e:
+            logging.error(f"Ungültiges Format der JSON-Datei '{self.input_json_filename}': {e}")
+            return False
         except Exception as e:
             logging.error(f"Unerwarteter Fehler beim Laden der JSON-Datei '{self.input_json_filename}': {e}")
             return False
@@ -69,52 +75,65 @@ class JsonToMarkdownConverter:
             
         return sanitized
 
-    def convert_and_save(self):
+    def _ensure_output_dir(self):
         """
-        Führt den Konvertierungsprozess von JSON zu Markdown aus.
+        Erstellt das Ausgabe-Verzeichnis, falls es nicht existiert.
         """
-        if not self._load_job_data():
-            return
-
-        # Erstelle das Ausgabe-Verzeichnis, falls es nicht existiert
         if not os.path.exists(self.output_markdown_dir):
             os.makedirs(self.output_markdown_dir)
             logging.info(f"Ausgabeverzeichnis für Markdown erstellt: '{self.output_markdown_dir}'")
         else:
             logging.info(f"Ausgabeverzeichnis für Markdown existiert bereits: '{self.output_markdown_dir}'")
 
+    def write_job_markdown(self, job, i):
+        """
+        Schreibt einen einzelnen Job als Markdown-Datei.
+        :param i: Laufende Nummer, nur für Fallback-Namen
+        """
+        job_title = job.get('job_title', f'Unbenannter Job {i}')
+        location = job.get('location', 'Unbekannt')
+        
+        # Dateiname bilden und bereinigen
+        filename_base = self._sanitize_filename(f"{job_title} - {location}")
+        # Fallback, falls der bereinigte Name leer wird
+        if not filename_base:
+            filename_base = f"job_{i}"
+
+        file_path = os.path.join(self.output_markdown_dir, f"{filename_base}.md")
+
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(f"# {job_title}\n\n")
+                f.write(f"**Standort:** {job.get('location', 'Unbestimmt')}\n")
+                f.write(f"**Abteilung:** {job.get('department', 'Unbestimmt')}\n")
+                f.write(f"**URL:** {job.get('url', 'Nicht verfügbar')}\n")
+                f.write(f"**Zeitart:** {job.get('schedule', 'Unbestimmt')}\n\n")
+                f.write("---\n\n") # Trennlinie
+
+                f.write("## Beschreibung\n\n")
+                # Python wandelt hier die '\n' Escape-Sequenzen beim Laden des JSON automatisch um.
+                # Roh-HTML (Raw-Modus des Scrapers) wird erst hier in Markdown umgewandelt.
+                f.write(render_description(job.get('description', 'Keine Beschreibung vorhanden.')))
+                f.write("\n") # Sicherstellen, dass am Ende ein Umbruch ist
+
+            logging.info(f"Job '{job_title}' als Markdown gespeichert: {file_path}")
+        except IOError as e:
+            logging.error(f"Fehler beim Speichern von Markdown für '{job_title}' in '{file_path}': {e}")
+        except Exception as e:
+            logging.error(f"Unerwarteter Fehler beim Schreiben von Markdown für '{job_title}': {e}")
+
+    def convert_and_save(self):
+        """
+        Führt den Konvertierungsprozess von JSON zu Markdown aus.
+        """
+        if not self._load_job_data():
+            return
+
+        self._ensure_output_dir()
+
         logging.info(f"Beginne mit dem Speichern von {len(self.job_data)} Jobs als Markdown-Dateien.")
         for i, job in enumerate(self.job_data):
-            job_title = job.get('job_title', f'Unbenannter Job {i}')
-            location = job.get('location', 'Unbekannt')
-            
-            # Dateiname bilden und bereinigen
-            filename_base = self._sanitize_filename(f"{job_title} - {location}")
-            # Fallback, falls der bereinigte Name leer wird
-            if not filename_base:
-                filename_base = f"job_{i}"
-
-            file_path = os.path.join(self.output_markdown_dir, f"{filename_base}.md")
-
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"# {job_title}\n\n")
-                    f.write(f"**Standort:** {job.get('location', 'Unbestimmt')}\n")
-                    f.write(f"**Abteilung:** {job.get('department', 'Unbestimmt')}\n")
-                    f.write(f"**URL:** {job.get('url', 'Nicht verfügbar')}\n")
-                    f.write(f"**Zeitart:** {job.get('schedule', 'Unbestimmt')}\n\n")
-                    f.write("---\n\n") # Trennlinie
-
-                    f.write("## Beschreibung\n\n")
-                    # Python wandelt hier die '\n' Escape-Sequenzen beim Laden des JSON automatisch um.
-                    f.write(job.get('description', 'Keine Beschreibung vorhanden.'))
-                    f.write("\n") # Sicherstellen, dass am Ende ein Umbruch ist
-
-                logging.info(f"Job '{job_title}' als Markdown gespeichert: {file_path}")
-            except IOError as e:
-                logging.error(f"Fehler beim Speichern von Markdown für '{job_title}' in '{file_path}': {e}")
-            except Exception as e:
-                logging.error(f"Unerwarteter Fehler beim Schreiben von Markdown für '{job_title}': {e}")
+            self.write_job_markdown(job, i)
 
         logging.info("Speichern der Markdown-Dateien abgeschlossen.")
 
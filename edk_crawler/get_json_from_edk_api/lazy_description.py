@@ -0,0 +1,73 @@
+# lazy_description.py
+# Roh-HTML statt Markdown speichern: Im Raw-Modus legt der Scraper das HTML der
+# Beschreibung komprimiert im Feld "description" ab (Präfix + zlib + base64).
+# Die Umwandlung in Markdown übernehmen erst die Verbraucher (Konverter, API,
+# render_descriptions.py) - Formatierungsänderungen brauchen so keinen neuen Crawl.
+
+import base64
+import binascii
+import logging
+import zlib
+from typing import List, Optional
+
+from markdown_cache import MarkdownConversionCache
+
+
+# Muss mit fastAPI/description_rendering.py übereinstimmen
+RAW_HTML_PREFIX = "raw-html+zlib:"
+MAX_RAW_HTML_BYTES = 5 * 1024 * 1024    # Größer ist keine echte Stellenbeschreibung (Schutz vor zlib-Bomben)
+
+
+def pack_raw_html(html_content: str) -> str:
+    return RAW_HTML_PREFIX + base64.b64encode(zlib.compress(html_content.encode("utf-8"))).decode("ascii")
+
+
+def is_raw_description(description) -> bool:
+    return isinstance(description, str) and description.startswith(RAW_HTML_PREFIX)
+
+
+def unpack_raw_html(description: str) -> str:
+    """
+    Entpackt das Roh-HTML. Wirft ValueError bei kaputten oder zu großen Daten.
+    """
+    try:
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(base64.b64decode(description[len(RAW_HTML_PREFIX):], validate=True),
+                                       MAX_RAW_HTML_BYTES)
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Entpacktes HTML größer als {MAX_RAW_HTML_BYTES} Bytes")
+        if not decompressor.eof:
+            raise ValueError("zlib-Daten unvollständig")
+        return data.decode("utf-8")
+    except (binascii.Error, zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Ungültige Roh-HTML-Beschreibung: {e}") from e
+
+
+def render_description(description, markdown_cache: Optional[MarkdownConversionCache] = None):
+    """
+    Gibt Markdown zurück. Bereits umgewandelte Beschreibungen bleiben unverändert.
+    """
+    if not is_raw_description(description):
+        return description
+    try:
+        html_content = unpack_raw_html(description)
+    except ValueError as e:
+        logging.warning(f"{e}, Beschreibung bleibt unverändert.")
+        return description
+    if markdown_cache is None:
+        markdown_cache = _default_cache
+    return markdown_cache.convert(html_content)
+
+
+def render_jobs(jobs: List[dict], markdown_cache: Optional[MarkdownConversionCache] = None) -> List[dict]:
+    """
+    Wandelt die Roh-HTML-Beschreibungen einer Jobliste um (in place).
+    """
+    for job in jobs:
+        if is_raw_description(job.get("description")):
+            job["description"] = render_description(job["description"], markdown_cache)
+    return jobs
+
+
+# Für Aufrufer ohne eigenen Cache; gleiche Beschreibungen werden trotzdem nur einmal umgewandelt
+_default_cache = MarkdownConversionCache()
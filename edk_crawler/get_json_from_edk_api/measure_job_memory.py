@@ -0,0 +1,101 @@
+# measure_job_memory.py
+# Misst mit tracemalloc den Speicher pro gesammeltem Job: bisheriges Dict gegen JobRecord.
+# Simuliert einen Crawl: API-Seiten werden wie im Scraper einzeln per JSON geparst
+# (jede Seite bringt eigene String-Objekte mit), die Jobs gesammelt, die Seiten verworfen.
+# Aufruf: python measure_job_memory.py --jobs 50000
+
+import argparse
+import json
+import random
+import tracemalloc
+
+from get_json_from_edk_api import EdkJobScraper
+
+
+PAGE_SIZE = 100
+
+
+def make_api_pages(job_count: int, seed: int = 1):
+    """
+    Erzeugt API-Antworten als JSON-Text, mit ähnlicher Verteilung wie bei Edeka:
+    viele Märkte, wenige Level und Arbeitszeitmodelle.
+    """
+    rng = random.Random(seed)
+    markets = [(f"EDEKA Markt {i}", f"Hauptstraße {i}", f"{10000 + i * 7}", f"Stadt {i % 800}") for i in range(2500)]
+    companies = [f"EDEKA Handelsgesellschaft {i} GmbH" for i in range(300)]
+    levels = ["Berufserfahrene", "Schüler:innen", "Studierende", "Ausbildung", "Führungskräfte"]
+    time_types = ["Vollzeit", "Teilzeit", "Vollzeit/Teilzeit", "Minijob"]
+    for page_start in range(0, job_count, PAGE_SIZE):
+        entries = []
+        for i in range(page_start, min(job_count, page_start + PAGE_SIZE)):
+            name, street, zip_code, city = rng.choice(markets)
+            entries.append({
+                "detailPageUrl": f"https://verbund.edeka/karriere/stellenboerse/job-{i}",
+                "companyName": rng.choice(companies),
+                "title": f"Verkäufer (m/w/d) Frische {i}",
+                "level": rng.choice(levels),
+                "locationName": name,
+                "locationStreet": street,
+                "locationZipCode": zip_code,
+                "locationCity": city,
+                "timeType": rng.choice(time_types),
+            })
+        yield json.dumps({"entries": entries})
+
+
+def summary_as_dict(job_data: dict) -> dict:
+    """
+    Bisherige Darstellung aus _extract_job_summary (zum Vergleich).
+    """
+    location_parts = [
+        job_data.get("locationName", "N/A"),
+        job_data.get("locationStreet", ""),
+        job_data.get("locationZipCode", ""),
+        job_data.get("locationCity", "")
+    ]
+    return {
+        "url": job_data.get("detailPageUrl"),
+        "department": job_data.get("companyName", "N/A"),
+        "description": None,
+        "job_title": job_data.get("title", "Kein Titel vorhanden"),
+        "level": job_data.get("level", "Unbestimmt"),
+        "location": ", ".join(filter(None, location_parts)).strip(),
+        "schedule": job_data.get("timeType", "Vollzeit/Teilzeit")
+    }
+
+
+def measure(extract, job_count: int, descriptions: list) -> int:
+    """
+    Bytes, die nach dem "Crawl" für die gesammelten Jobs belegt sind.
+    """
+    pages = list(make_api_pages(job_count))
+    collected = []
+    tracemalloc.start()
+    for i, page in enumerate(pages):
+        for j, entry in enumerate(json.loads(page)["entries"]):
+            job = extract(entry)
+            # Beschreibungen kommen aus dem Markdown-Cache und sind geteilte Objekte
+            job["description"] = descriptions[(i * PAGE_SIZE + j) % len(descriptions)]
+            collected.append(job)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(collected) == job_count
+    return current
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speicher pro Job: Dict gegen JobRecord.")
+    parser.add_argument("--jobs", type=int, default=50000)
+    args = parser.parse_args()
+
+    descriptions = [f"### Beschreibung {i}\n\n" + "Text " * 400 for i in range(500)]
+    scraper = EdkJobScraper()
+
+    results = {
+        "dict": measure(summary_as_dict, args.jobs, descriptions),
+        "JobRecord": measure(scraper._extract_job_summary, args.jobs, descriptions),
+    }
+    print(f"{args.jobs} Jobs (ohne die geteilten Beschreibungstexte):")
+    for name, size in results.items():
+        print(f"  {name:<10} {size / 1024 / 1024:8.1f} MB  {size / args.jobs:7.0f} Bytes/Job")
+    print(f"  Einsparung: {1 - results['JobRecord'] / results['dict']:.0%}")
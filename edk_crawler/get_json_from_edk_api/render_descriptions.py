@@ -0,0 +1,51 @@
+# render_descriptions.py
+# Offline-Schritt für Dateien aus dem Raw-Modus (EDK_RAW_HTML=1): wandelt alle
+# Roh-HTML-Beschreibungen in Markdown um, ohne neu zu crawlen.
+# Deduplizierte Dateien bleiben dedupliziert, umgewandelt wird dann nur die Beschreibungstabelle.
+# Aufruf: python render_descriptions.py edk_job_data.json edk_job_data_md.json
+
+import argparse
+import json
+import logging
+import os
+import time
+
+from description_table import DEDUP_FORMAT
+from lazy_description import render_description
+from markdown_cache import MarkdownConversionCache
+
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def render_file(input_filename: str, output_filename: str, markdown_cache: MarkdownConversionCache):
+    with open(input_filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and data.get("format") == DEDUP_FORMAT:
+        descriptions = data["descriptions"]
+        for key, description in descriptions.items():
+            descriptions[key] = render_description(description, markdown_cache)
+        logging.info(f"{len(descriptions)} Beschreibungen für {len(data['jobs'])} Jobs umgewandelt.")
+    else:
+        for job in data:
+            job["description"] = render_description(job.get("description"), markdown_cache)
+        logging.info(f"{len(data)} Jobs umgewandelt.")
+
+    with open(output_filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    logging.info(f"Ergebnis gespeichert in '{output_filename}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wandelt Roh-HTML-Beschreibungen einer Jobdatei in Markdown um.")
+    parser.add_argument("input", help="JSON-Datei aus dem Scraper")
+    parser.add_argument("output", help="Ausgabedatei (darf gleich der Eingabe sein)")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    markdown_cache = MarkdownConversionCache(persist_path=os.environ.get("EDK_MARKDOWN_CACHE_FILE"))
+    render_file(args.input, args.output, markdown_cache)
+    markdown_cache.log_stats()
+    markdown_cache.close()
+    logging.info(f"Laufzeit: {time.time() - start_time:.2f} Sekunden.")
@@ -0,0 +1,185 @@
+# benchmark_storage.py
+# Misst Import- und Lese-Durchsatz des SQLite-Backends bei steigender Anzahl uvicorn-Worker.
+# Aufruf aus dem Verzeichnis fastAPI/:  python benchmark_storage.py --workers 1 2 4
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+import httpx
+
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger("httpx").setLevel(logging.WARNING)  # Kein Log pro Anfrage
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port() -> int:
+    """
+    Sucht einen freien lokalen TCP-Port.
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_uvicorn(port: int, workers: int = 1, env: Optional[dict] = None) -> subprocess.Popen:
+    """
+    Startet die API (main:app) als eigenen uvicorn-Prozess.
+    """
+    server_env = dict(os.environ)
+    server_env.update(env or {})
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning"
+    ]
+    logging.info(f"Starte Server: {' '.join(cmd)}")
+    return subprocess.Popen(cmd, cwd=API_DIR, env=server_env)
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    """
+    Wartet, bis der Server auf Anfragen antwortet.
+    """
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get(f"{base_url}/docs", timeout=1)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server unter {base_url} nicht erreichbar.")
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def make_fake_jobs(count: int, description_size: int = 2000, prefix: str = "bench") -> list:
+    """
+    Erzeugt synthetische Jobs im Format des Scrapers.
+    """
+    description = "Beschreibung " * (description_size // 13)
+    return [
+        {
+            "url": f"https://verbund.edeka/karriere/stelle-{prefix}-{i}",
+            "department": f"Markt {i % 500}",
+            "description": description,
+            "job_title": f"Mitarbeiter (m/w/d) {i}",
+            "level": "Berufserfahrene",
+            "location": f"Markt {i % 500}, Hauptstraße 1, {10000 + i % 500}, Stadt",
+            "schedule": "Vollzeit"
+        }
+        for i in range(count)
+    ]
+
+
+def to_gzip_ndjson(jobs: list) -> bytes:
+    return gzip.compress("\n".join(json.dumps(job, ensure_ascii=False) for job in jobs).encode("utf-8"))
+
+
+async def run_import_phase(base_url: str, jobs: list, batch_size: int, concurrency: int) -> float:
+    """
+    Importiert alle Jobs in gzip-NDJSON-Batches, gibt Jobs/Sekunde zurück.
+    """
+    batches = [to_gzip_ndjson(jobs[i:i + batch_size]) for i in range(0, len(jobs), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def post_batch(body: bytes):
+            async with semaphore:
+                response = await client.post(
+                    "/jobs/import/ndjson", content=body,
+                    headers={"Content-Encoding": "gzip", "Content-Type": "application/x-ndjson"}
+                )
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post_batch(body) for body in batches))
+        duration = time.perf_counter() - start
+
+    return len(jobs) / duration
+
+
+async def run_read_phase(base_url: str, urls: list, duration: float, concurrency: int) -> float:
+    """
+    Mischt Seitenabfragen und URL-Lookups für `duration` Sekunden, gibt Anfragen/Sekunde zurück.
+    """
+    request_count = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        async def reader():
+            nonlocal request_count
+            while time.perf_counter() < deadline:
+                if random.random() < 0.5:
+                    response = await client.get("/jobs", params={"offset": random.randrange(len(urls)), "limit": 20})
+                else:
+                    response = await client.get("/jobs/by-url", params={"url": random.choice(urls)})
+                response.raise_for_status()
+                request_count += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(reader() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return request_count / elapsed
+
+
+async def benchmark(worker_counts: list, job_count: int, batch_size: int, concurrency: int, read_seconds: float):
+    results = []
+    jobs = make_fake_jobs(job_count)
+    urls = [job["url"] for job in jobs]
+
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = start_uvicorn(port, workers, env={
+                "JOBS_STORAGE_BACKEND": "sqlite",
+                "JOBS_SQLITE_PATH": os.path.join(tmp_dir, "bench.db"),
+            })
+            try:
+                await wait_until_ready(base_url)
+                import_rate = await run_import_phase(base_url, jobs, batch_size, concurrency)
+                read_rate = await run_read_phase(base_url, urls, read_seconds, concurrency)
+            finally:
+                stop_server(server)
+
+        logging.info(f"{workers} Worker: Import {import_rate:.0f} Jobs/s, Lesen {read_rate:.0f} Anfragen/s")
+        results.append({"workers": workers, "import_jobs_per_s": import_rate, "read_requests_per_s": read_rate})
+
+    print(f"\n{'Worker':>6} | {'Import (Jobs/s)':>15} | {'Lesen (Req/s)':>13}")
+    print("-" * 42)
+    for r in results:
+        print(f"{r['workers']:>6} | {r['import_jobs_per_s']:>15.0f} | {r['read_requests_per_s']:>13.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark des SQLite-Storage-Backends mit mehreren uvicorn-Workern.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Zu testende Worker-Anzahlen")
+    parser.add_argument("--jobs", type=int, default=20000, help="Anzahl synthetischer Jobs")
+    parser.add_argument("--batch-size", type=int, default=500, help="Jobs pro Import-Request")
+    parser.add_argument("--concurrency", type=int, default=16, help="Gleichzeitige Client-Verbindungen")
+    parser.add_argument("--read-seconds", type=float, default=10.0, help="Dauer der Lesephase")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.workers, args.jobs, args.batch_size, args.concurrency, args.read_seconds))
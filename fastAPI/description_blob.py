@@ -0,0 +1,177 @@
+# description_blob.py
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from typing import Iterator, Optional, Tuple
+
+
+class DescriptionBlobStore:
+    """
+    Append-only Datei für die (mehrere KB großen) Markdown-Beschreibungen.
+    Im Speicher bleibt pro Job nur (offset, length); gelesen wird per mmap,
+    und zwar nur, wenn eine Antwort die Beschreibung wirklich enthält.
+    Gespeichert wird das JSON-String-Literal, so können Beschreibungen aus
+    Scraper-Dateien unverändert (ohne Dekodieren) übernommen werden.
+    """
+
+    def __init__(self, path: str):
+        # Der Index lebt nur im Prozess, deshalb beginnt die Datei bei jedem Start leer
+        self.path = path
+        self._file = open(path, "w+b")
+        # Gleich wieder aus dem Verzeichnis entfernen: Die geöffnete Datei bleibt nutzbar und
+        # verschwindet mit dem Prozess, auch nach einem Absturz. Unter Windows geht das nicht,
+        # dort wird sie in close() gelöscht.
+        try:
+            os.unlink(path)
+            self._unlinked = True
+        except OSError:
+            self._unlinked = False
+        self._size = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    def append_literal(self, literal: bytes) -> Tuple[int, int]:
+        """
+        Hängt ein JSON-String-Literal (inkl. Anführungszeichen) an und gibt (offset, length) zurück.
+        """
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(literal)
+            self._size += len(literal)
+        return offset, len(literal)
+
+    def append_text(self, text: str) -> Tuple[int, int]:
+        return self.append_literal(json.dumps(text, ensure_ascii=False).encode("utf-8"))
+
+    def read(self, ref: Tuple[int, int]) -> str:
+        offset, length = ref
+        with self._lock:
+            if self._mmap is None or offset + length > len(self._mmap):
+                # Datei ist gewachsen: Puffer schreiben und neu mappen
+                self._file.flush()
+                if self._mmap is not None:
+                    self._mmap.close()
+                self._mmap = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            literal = self._mmap[offset:offset + length]
+        return json.loads(literal)
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._mmap is not None:
+                self._mmap.close()
+            self._file.close()
+            if not self._unlinked:
+                try:
+                    os.remove(self.path)
+                except OSError as e:
+                    logging.warning(f"Beschreibungsdatei '{self.path}' konnte nicht gelöscht werden: {e}")
+
+
+# JSON-Strings (mit Escapes) oder geschweifte Klammern
+_TOKEN_PATTERN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]')
+_DESCRIPTION_KEY = b'"description"'
+# Muss mit edk_crawler/get_json_from_edk_api/description_table.py übereinstimmen
+DEDUP_FORMAT = "edk-jobs-dedup/1"
+DEDUP_REF_KEY = "description_ref"
+
+
+def iter_raw_jobs(path: str) -> Iterator[Tuple[dict, Optional[bytes]]]:
+    """
+    Liest Jobs aus einer Scraper-Ausgabe (JSON-Liste wie edk_job_data.json oder NDJSON),
+    ohne die Beschreibungen zu dekodieren. Liefert (metadaten, beschreibung_als_json_literal).
+    Die Datei wird per mmap gelesen und nie komplett in den Speicher geladen.
+    Ausnahme ist das deduplizierte Format (ein einziges Objekt mit "format"): Das wird
+    als Ganzes gelesen und die Verweise werden über die Beschreibungstabelle aufgelöst.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            depth = 0
+            object_start = 0
+            description_span = None
+            previous_token = None
+            previous_end = 0
+
+            for match in _TOKEN_PATTERN.finditer(data):
+                token = match.group()
+                if token == b"{":
+                    if depth == 0:
+                        object_start = match.start()
+                        description_span = None
+                    depth += 1
+                elif token == b"}":
+                    depth -= 1
+                    if depth == 0:
+                        metadata, description_literal = _decode_object(data, object_start, match.end(), description_span)
+                        if "format" in metadata:
+                            yield from _iter_dedup_jobs(metadata, path)
+                        else:
+                            yield metadata, description_literal
+                elif (depth == 1 and previous_token == _DESCRIPTION_KEY
+                      and data[previous_end:match.start()].strip() == b":"):
+                    # String-Wert des Schlüssels "description" merken, aber nicht dekodieren
+                    description_span = (match.start(), match.end())
+                previous_token = token
+                previous_end = match.end()
+
+
+def _decode_object(data, start: int, end: int, description_span: Optional[Tuple[int, int]]) -> Tuple[dict, Optional[bytes]]:
+    if description_span is None:
+        return json.loads(data[start:end]), None
+    desc_start, desc_end = description_span
+    # Nur die kleinen Metadaten parsen, die Beschreibung durch null ersetzen
+    metadata = json.loads(data[start:desc_start] + b"null" + data[desc_end:end])
+    return metadata, data[desc_start:desc_end]
+
+
+def _iter_dedup_jobs(document: dict, path: str) -> Iterator[Tuple[dict, Optional[bytes]]]:
+    if document.get("format") != DEDUP_FORMAT:
+        raise ValueError(f"Unbekanntes Format der Jobdatei '{path}': {document.get('format')!r}")
+
+    descriptions = document.get("descriptions") or {}
+    literals = {}   # Geteilte Beschreibungen nur einmal kodieren
+    for job in document.get("jobs") or []:
+        ref = job.pop(DEDUP_REF_KEY, None)
+        description = job.get("description")
+        job["description"] = None      # Wie bei _decode_object: Metadaten ohne Beschreibung
+        if ref is None:
+            yield job, (json.dumps(description, ensure_ascii=False).encode("utf-8") if description is not None else None)
+            continue
+        if ref not in descriptions:
+            raise ValueError(f"Jobdatei '{path}': Beschreibung '{ref}' fehlt in der Tabelle.")
+        if ref not in literals:
+            literals[ref] = json.dumps(descriptions[ref], ensure_ascii=False).encode("utf-8")
+        yield job, literals[ref]
+
+
+def load_scraper_file(storage, path: str, batch_size: int = 1000) -> int:
+    """
+    Warmstart: übernimmt die Jobs aus einer Scraper-Ausgabe in den Speicher.
+    """
+    if not os.path.exists(path):
+        logging.warning(f"Warmstart-Datei '{path}' nicht gefunden.")
+        return 0
+
+    loaded = 0
+    skipped = 0
+    batch = []
+    for metadata, description_literal in iter_raw_jobs(path):
+        if not metadata.get("job_title"):
+            skipped += 1
+            continue
+        batch.append((metadata, description_literal))
+        if len(batch) >= batch_size:
+            loaded += storage.add_raw_jobs(batch)
+            batch = []
+    if batch:
+        loaded += storage.add_raw_jobs(batch)
+
+    logging.info(f"Warmstart aus '{path}': {loaded} Jobs geladen, {skipped} ohne Titel übersprungen.")
+    return loaded
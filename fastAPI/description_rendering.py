@@ -0,0 +1,92 @@
+# description_rendering.py
+# Jobs aus dem Raw-Modus des Scrapers (EDK_RAW_HTML=1) enthalten in "description"
+# komprimiertes Roh-HTML. Gespeichert wird es unverändert, in Markdown umgewandelt
+# wird erst beim Lesen - mit LRU-Cache, da viele Jobs denselben Text haben.
+
+import base64
+import binascii
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from html import unescape
+from typing import List, Optional
+
+from markdownify import markdownify as md
+
+
+# Muss mit edk_crawler/get_json_from_edk_api/lazy_description.py übereinstimmen
+RAW_HTML_PREFIX = "raw-html+zlib:"
+MAX_RAW_HTML_BYTES = 5 * 1024 * 1024    # Größer ist keine echte Stellenbeschreibung (Schutz vor zlib-Bomben)
+MARKDOWN_OPTIONS = {"heading_style": "ATX", "strong_em_with_underscores": False, "wrap": True}
+
+
+def is_raw_description(description) -> bool:
+    return isinstance(description, str) and description.startswith(RAW_HTML_PREFIX)
+
+
+def unpack_raw_html(description: str) -> str:
+    """
+    Entpackt das Roh-HTML. Wirft ValueError bei kaputten oder zu großen Daten.
+    """
+    try:
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(base64.b64decode(description[len(RAW_HTML_PREFIX):], validate=True),
+                                       MAX_RAW_HTML_BYTES)
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Entpacktes HTML größer als {MAX_RAW_HTML_BYTES} Bytes")
+        if not decompressor.eof:
+            raise ValueError("zlib-Daten unvollständig")
+        return data.decode("utf-8")
+    except (binascii.Error, zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Ungültige Roh-HTML-Beschreibung: {e}") from e
+
+
+class DescriptionRenderer:
+    """
+    Wandelt Roh-HTML-Beschreibungen beim Lesen in Markdown um. Thread-sicher
+    (SQLite-Abfragen laufen teils in Threads).
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, description: Optional[str]) -> Optional[str]:
+        if not is_raw_description(description):
+            return description
+        with self._lock:
+            markdown = self._entries.get(description)
+            if markdown is not None:
+                self._entries.move_to_end(description)
+                self.hits += 1
+                return markdown
+
+        try:
+            html_content = unpack_raw_html(description)
+        except ValueError as e:
+            # Kaputte Daten (z. B. aus einem Import) nicht als 500 enden lassen: gespeicherten Text ausliefern
+            logging.warning(f"{e}, Beschreibung wird unverändert ausgeliefert.")
+            return description
+        markdown = md(unescape(html_content), **MARKDOWN_OPTIONS).strip()
+
+        with self._lock:
+            self.misses += 1
+            self._entries[description] = markdown
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return markdown
+
+    def render_job(self, job: Optional[dict]) -> Optional[dict]:
+        """
+        Gibt den Job mit Markdown-Beschreibung zurück (Kopie nur, wenn nötig).
+        """
+        if job is None or not is_raw_description(job.get("description")):
+            return job
+        return {**job, "description": self.render(job["description"])}
+
+    def render_jobs(self, jobs: List[dict]) -> List[dict]:
+        return [self.render_job(job) for job in jobs]
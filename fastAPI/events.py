@@ -0,0 +1,193 @@
+# events.py
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+
+# Felder, die in der Historie pro Event aufbewahrt werden (ohne die mehrere KB große Beschreibung)
+SUMMARY_FIELDS = ("url", "job_title")
+
+
+class JobEvent:
+    """
+    Ein Änderungsereignis (insert, update oder delete) mit fortlaufender ID.
+    Mit summary=True enthält data nur die Felder aus SUMMARY_FIELDS (Eintrag der Historie).
+    """
+    __slots__ = ("seq", "action", "data", "summary")
+
+    def __init__(self, seq: int, action: str, data: dict, summary: bool = False):
+        self.seq = seq
+        self.action = action
+        self.data = data
+        self.summary = summary
+
+    def to_summary(self) -> "JobEvent":
+        return JobEvent(self.seq, self.action, {field: self.data.get(field) for field in SUMMARY_FIELDS}, summary=True)
+
+
+class Subscription:
+    """
+    Ein verbundener Client. Neue Events landen in einem begrenzten Puffer;
+    läuft er über, wird die Verbindung beendet und der Client holt die
+    verpassten Events beim Reconnect über die Last-Event-ID nach.
+    """
+
+    def __init__(self, buffer_size: int, replay: List[JobEvent], reset_required: bool, start_seq: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.replay = replay
+        self.reset_required = reset_required
+        self.start_seq = start_seq  # Letzte Sequenznummer beim Verbinden
+        self.overflowed = False
+
+    def push(self, event: JobEvent):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class JobEventBroker:
+    """
+    Verteilt Änderungen am Jobbestand an alle SSE-Abonnenten.
+    Die letzten `history_size` Events werden aufbewahrt, damit Clients nach einem
+    Reconnect genau die verpassten Events nachgeliefert bekommen. In der Historie
+    steht nur ID, Art und URL/Titel; beim Nachliefern wird der Job über `load_job`
+    aus dem Speicher geladen (also im aktuellen Stand).
+    Gilt pro Prozess: bei mehreren uvicorn-Workern sieht ein Abonnent nur die
+    Importe, die sein Worker verarbeitet hat.
+    """
+
+    def __init__(self, history_size: int = 10000, subscriber_buffer: int = 1000,
+                 render_job: Optional[Callable[[dict], dict]] = None,
+                 load_job: Optional[Callable[[str], Optional[dict]]] = None):
+        """
+        :param render_job: Wird beim Senden auf jeden Job angewendet (z. B. Roh-HTML -> Markdown)
+        :param load_job: Lädt einen Job über seine URL für nachgelieferte Events (z. B. JobStorage.get_job_by_url)
+        """
+        self.subscriber_buffer = subscriber_buffer
+        self.render_job = render_job
+        self.load_job = load_job
+        # Epoche trennt Event-IDs verschiedener Prozessläufe (IDs beginnen nach Neustart wieder bei 1)
+        self.epoch = format(time.time_ns(), "x")
+        self._history: deque = deque(maxlen=history_size)
+        self._seq = 0
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        Event-Loop, in dem die Abonnenten laufen. publish() kann aus beliebigen Threads kommen.
+        """
+        self._loop = loop
+
+    def event_id(self, event: JobEvent) -> str:
+        return f"{self.epoch}-{event.seq}"
+
+    def _parse_event_id(self, last_event_id: Optional[str]) -> Optional[int]:
+        """
+        Gibt die Sequenznummer zurück, oder None wenn die ID aus einem anderen Prozesslauf stammt.
+        """
+        epoch, _, seq = (last_event_id or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, changes: List[Tuple[str, dict]]):
+        """
+        Veröffentlicht Änderungen als (action, job)-Paare. Thread-sicher.
+        """
+        if not changes:
+            return
+        with self._lock:
+            events = []
+            for action, job in changes:
+                self._seq += 1
+                events.append(JobEvent(self._seq, action, job))
+            self._history.extend(event.to_summary() for event in events)
+
+            if self._loop is None or not self._subscribers:
+                return
+            for subscription in self._subscribers:
+                for event in events:
+                    self._loop.call_soon_threadsafe(subscription.push, event)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Registriert einen Abonnenten. Mit `last_event_id` werden alle danach
+        veröffentlichten Events aus der Historie nachgeliefert. Ist das nicht
+        möglich (zu alt oder anderer Prozesslauf), wird ein Reset signalisiert.
+        """
+        with self._lock:
+            replay = []
+            reset_required = False
+            if last_event_id:
+                last_seq = self._parse_event_id(last_event_id)
+                oldest_seq = self._history[0].seq if self._history else self._seq + 1
+                if last_seq is None or last_seq < oldest_seq - 1:
+                    reset_required = True
+                else:
+                    replay = [event for event in self._history if event.seq > last_seq]
+
+            subscription = Subscription(self.subscriber_buffer, replay, reset_required, self._seq)
+            self._subscribers.append(subscription)
+        logging.info(f"SSE-Abonnent verbunden ({len(self._subscribers)} aktiv, {len(replay)} Events nachgeliefert).")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+        logging.info(f"SSE-Abonnent getrennt ({len(self._subscribers)} aktiv).")
+
+    def _event_job(self, event: JobEvent) -> dict:
+        """
+        Job eines Events. Für nachgelieferte insert/update-Events aus dem Speicher geladen;
+        gibt es den Job nicht mehr (später gelöscht), bleibt es bei URL und Titel.
+        """
+        if not event.summary or event.action == "delete" or self.load_job is None or not event.data.get("url"):
+            return event.data
+        try:
+            job = self.load_job(event.data["url"])
+        except Exception as e:
+            logging.error(f"Job für nachgeliefertes Event nicht ladbar: {e}", exc_info=True)
+            job = None
+        return job if job is not None else event.data
+
+    def format_sse(self, event: JobEvent) -> str:
+        job = self._event_job(event)
+        job = self.render_job(job) if self.render_job else job
+        data = json.dumps(job, ensure_ascii=False, separators=(",", ":"))
+        return f"id: {self.event_id(event)}\nevent: {event.action}\ndata: {data}\n\n"
+
+    async def stream(self, subscription: Subscription, keepalive_seconds: float = 15.0):
+        """
+        Erzeugt den SSE-Text für einen Abonnenten (für StreamingResponse).
+        """
+        try:
+            yield "retry: 3000\n\n"
+            if subscription.reset_required:
+                # Client muss einmal komplett neu laden (/jobs/all) und danach ab der aktuellen ID lesen
+                yield f"id: {self.epoch}-{subscription.start_seq}\nevent: reset\ndata: {{}}\n\n"
+            for event in subscription.replay:
+                yield self.format_sse(event)
+            subscription.replay = []
+
+            while True:
+                if subscription.overflowed and subscription.queue.empty():
+                    logging.warning("SSE-Puffer eines Abonnenten übergelaufen, Verbindung wird beendet.")
+                    return
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"     # Kommentarzeile hält Proxies und Verbindung offen
+                    continue
+                yield self.format_sse(event)
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,188 @@
+# ingestion.py
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+
+class IngestionQueue:
+    """
+    In-Process-Warteschlange für Hintergrund-Importe.
+    Der Endpunkt legt nur den Roh-Payload ab und antwortet sofort (202),
+    ein Hintergrund-Worker validiert und speichert die Jobs in Batches.
+    Liegen mehrere Payloads in der Queue, werden sie gemeinsam gespeichert.
+    """
+
+    def __init__(self, store_jobs: Callable[[List[dict]], int], job_adapter: TypeAdapter,
+                 batch_size: int = 1000, max_queued: int = 100, max_tracked: int = 1000):
+        """
+        :param store_jobs: Funktion zum Speichern eines Batches (z. B. JobStorage.add_jobs)
+        :param job_adapter: TypeAdapter für einen einzelnen Job
+        :param max_queued: Maximale Anzahl wartender Payloads, danach wird abgelehnt
+        :param max_tracked: Anzahl der Statuseinträge, die aufbewahrt werden
+        """
+        self.store_jobs = store_jobs
+        self.job_adapter = job_adapter
+        self.batch_size = batch_size
+        self.max_tracked = max_tracked
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._status: "OrderedDict[str, dict]" = OrderedDict()
+        self._worker_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._worker_task is None:
+            self._worker_task = asyncio.create_task(self._worker())
+            logging.info("Ingestion-Worker gestartet.")
+
+    async def stop(self):
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+            logging.info("Ingestion-Worker beendet.")
+
+    def submit(self, payload: bytes) -> dict:
+        """
+        Legt einen Roh-Payload (JSON-Liste von Jobs) in die Queue.
+        Wirft asyncio.QueueFull, wenn die Queue voll ist.
+        """
+        ingestion_id = uuid.uuid4().hex
+        status = {
+            "ingestion_id": ingestion_id,
+            "status": "queued",
+            "total": None,
+            "processed": 0,
+            "imported_count": 0,
+            "error_count": 0,
+            "errors": [],
+            "submitted_at": time.time(),
+            "finished_at": None,
+        }
+        self._queue.put_nowait((ingestion_id, payload))
+        self._status[ingestion_id] = status
+        while len(self._status) > self.max_tracked:
+            self._status.popitem(last=False)
+        return status
+
+    def get_status(self, ingestion_id: str) -> Optional[dict]:
+        return self._status.get(ingestion_id)
+
+    def _parse_payload(self, ingestion_id: str, payload: bytes) -> List[dict]:
+        """
+        Parst den Payload und validiert jeden Job einzeln.
+        Ungültige Jobs werden im Status vermerkt, der Rest wird importiert.
+        """
+        status = self._status.get(ingestion_id, {})
+        try:
+            raw_jobs = json.loads(payload)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Kein gültiges JSON: {e}")
+        if not isinstance(raw_jobs, list):
+            raise ValueError("Erwartet wird eine JSON-Liste von Jobs.")
+
+        status["total"] = len(raw_jobs)
+        jobs = []
+        for index, raw_job in enumerate(raw_jobs):
+            try:
+                jobs.append(self.job_adapter.validate_python(raw_job).model_dump())
+            except ValidationError as e:
+                status["error_count"] = status.get("error_count", 0) + 1
+                if len(status.get("errors", [])) < 100:
+                    status["errors"].append({"line": index + 1, "error": str(e)})
+        return jobs
+
+    def _collect_pending(self, first_item: tuple) -> List[tuple]:
+        """
+        Nimmt zusätzlich alle bereits wartenden Payloads mit, um über Requests hinweg zu batchen.
+        """
+        items = [first_item]
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return items
+
+    def _fail(self, ingestion_id: str, message: str):
+        status = self._status.get(ingestion_id, {})
+        status.update({"status": "failed", "finished_at": time.time()})
+        status.setdefault("errors", []).append({"line": 0, "error": message})
+
+    def _is_failed(self, ingestion_id: str) -> bool:
+        return self._status.get(ingestion_id, {}).get("status") == "failed"
+
+    async def _worker(self):
+        while True:
+            first_item = await self._queue.get()
+            items = self._collect_pending(first_item)
+            try:
+                await self._process_items(items)
+            except Exception as e:
+                # Unerwarteter Fehler: betroffene Imports als fehlgeschlagen melden, der Worker läuft weiter
+                logging.error(f"Fehler im Ingestion-Worker: {e}", exc_info=True)
+                for ingestion_id, _ in items:
+                    if self._status.get(ingestion_id, {}).get("status") in ("queued", "running"):
+                        self._fail(ingestion_id, f"Interner Fehler: {e}")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    async def _process_items(self, items: List[tuple]):
+        # (ingestion_id, validierte Jobs) für alle gesammelten Payloads
+        parsed = []
+        for ingestion_id, payload in items:
+            status = self._status.get(ingestion_id, {})
+            status["status"] = "running"
+            try:
+                jobs = await asyncio.to_thread(self._parse_payload, ingestion_id, payload)
+                parsed.append((ingestion_id, jobs))
+            except ValueError as e:
+                self._fail(ingestion_id, str(e))
+                logging.warning(f"Ingestion {ingestion_id} fehlgeschlagen: {e}")
+            except Exception as e:
+                self._fail(ingestion_id, f"Interner Fehler: {e}")
+                logging.error(f"Ingestion {ingestion_id} fehlgeschlagen: {e}", exc_info=True)
+
+        # Jobs aller Payloads gemeinsam in Batches speichern
+        batch, batch_owners = [], []
+        for ingestion_id, jobs in parsed:
+            for job in jobs:
+                if self._is_failed(ingestion_id):
+                    break   # Nach einem Speicherfehler keine weiteren Jobs dieses Imports
+                batch.append(job)
+                batch_owners.append(ingestion_id)
+                if len(batch) >= self.batch_size:
+                    await self._store_batch(batch, batch_owners)
+                    batch, batch_owners = [], []
+        if batch:
+            await self._store_batch(batch, batch_owners)
+
+        for ingestion_id, jobs in parsed:
+            status = self._status.get(ingestion_id, {})
+            if status.get("status") == "running":
+                status.update({"status": "done", "processed": status.get("total") or 0, "finished_at": time.time()})
+                logging.info(f"Ingestion {ingestion_id} abgeschlossen: {status.get('imported_count')} Jobs importiert.")
+
+    async def _store_batch(self, batch: List[dict], batch_owners: List[str]):
+        try:
+            await asyncio.to_thread(self.store_jobs, batch)
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern eines Ingestion-Batches: {e}", exc_info=True)
+            for ingestion_id in set(batch_owners):
+                if not self._is_failed(ingestion_id):
+                    self._fail(ingestion_id, f"Speicherfehler: {e}")
+            return
+
+        for ingestion_id in batch_owners:
+            if self._is_failed(ingestion_id):
+                continue    # Fehlgeschlagene Imports nicht weiterzählen
+            status = self._status.get(ingestion_id, {})
+            status["imported_count"] = status.get("imported_count", 0) + 1
+            status["processed"] = status["imported_count"] + status.get("error_count", 0)
@@ -0,0 +1,264 @@
+# load_test.py
+# Lasttest für die FastAPI-Anwendung: startet uvicorn lokal, erzeugt gemischte Last
+# und schreibt die Ergebnisse als JSON, damit Commits miteinander verglichen werden können.
+# Aufruf aus dem Verzeichnis fastAPI/:
+#   python load_test.py --duration 30 --concurrency 32 --output results.json
+#   python load_test.py --compare alt.json neu.json
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmark_storage import free_port, make_fake_jobs, start_uvicorn, stop_server, wait_until_ready
+
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger("httpx").setLevel(logging.WARNING)  # Kein Log pro Anfrage
+
+# Gewichtung der Szenarien im Mix
+DEFAULT_SCENARIO_WEIGHTS = {
+    "bulk_import": 1,
+    "paginated_read": 10,
+    "all_jobs": 2,
+    "password_burst": 4,
+}
+IMPORT_BATCH_SIZE = 200     # Jobs pro /jobs/import-Aufruf
+PASSWORD_BURST_SIZE = 20    # Anfragen pro /generate-password-Burst
+RSS_SAMPLE_INTERVAL = 0.5   # Sekunden
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def read_rss_kb(pid: int) -> Optional[int]:
+    """
+    RSS eines Prozesses und aller Kindprozesse (uvicorn-Worker) in KB, über /proc (Linux).
+    """
+    total = 0
+    pids = [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            if current == pid:
+                return None
+    return total
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class LoadTestStats:
+    """
+    Sammelt Latenzen und Fehler pro Szenario.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.rss_samples: List[dict] = []
+
+    def record(self, scenario: str, latency: float, ok: bool):
+        self.latencies.setdefault(scenario, []).append(latency)
+        if not ok:
+            self.errors[scenario] = self.errors.get(scenario, 0) + 1
+
+    def summary(self, duration: float) -> dict:
+        scenarios = {}
+        for scenario, values in self.latencies.items():
+            values = sorted(values)
+            errors = self.errors.get(scenario, 0)
+            scenarios[scenario] = {
+                "requests": len(values),
+                "rps": len(values) / duration,
+                "error_rate": errors / len(values),
+                "latency_ms": {
+                    "p50": percentile(values, 50) * 1000,
+                    "p90": percentile(values, 90) * 1000,
+                    "p95": percentile(values, 95) * 1000,
+                    "p99": percentile(values, 99) * 1000,
+                    "max": values[-1] * 1000,
+                },
+            }
+        total_requests = sum(s["requests"] for s in scenarios.values())
+        total_errors = sum(self.errors.values())
+        rss_values = [sample["rss_kb"] for sample in self.rss_samples if sample["rss_kb"] is not None]
+        return {
+            "total_requests": total_requests,
+            "total_rps": total_requests / duration,
+            "error_rate": total_errors / total_requests if total_requests else 0.0,
+            "peak_rss_kb": max(rss_values) if rss_values else None,
+            "scenarios": scenarios,
+            "rss_timeline": self.rss_samples,
+        }
+
+
+async def timed_request(client: httpx.AsyncClient, stats: LoadTestStats, scenario: str, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    ok = False
+    try:
+        response = await client.request(method, url, **kwargs)
+        ok = response.status_code < 400
+    except httpx.HTTPError as e:
+        logging.debug(f"Fehler bei {scenario}: {e}")
+    stats.record(scenario, time.perf_counter() - start, ok)
+
+
+async def run_scenario(client: httpx.AsyncClient, stats: LoadTestStats, scenario: str, import_counter: list):
+    if scenario == "bulk_import":
+        import_counter[0] += 1
+        jobs = make_fake_jobs(IMPORT_BATCH_SIZE, prefix=f"load-{import_counter[0]}")
+        await timed_request(client, stats, scenario, "POST", "/jobs/import", json=jobs)
+    elif scenario == "paginated_read":
+        await timed_request(client, stats, scenario, "GET", "/jobs",
+                            params={"offset": random.randrange(0, 5000), "limit": 50})
+    elif scenario == "all_jobs":
+        await timed_request(client, stats, scenario, "GET", "/jobs/all")
+    elif scenario == "password_burst":
+        for _ in range(PASSWORD_BURST_SIZE):
+            await timed_request(client, stats, scenario, "GET", "/generate-password", params={"length": 32})
+    else:
+        raise ValueError(f"Unbekanntes Szenario: {scenario}")
+
+
+async def sample_rss(server_pid: int, stats: LoadTestStats, start: float, stop_event: asyncio.Event):
+    while not stop_event.is_set():
+        stats.rss_samples.append({"t": round(time.perf_counter() - start, 2), "rss_kb": read_rss_kb(server_pid)})
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=RSS_SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load_test(base_url: str, server_pid: int, duration: float, concurrency: int, weights: Dict[str, int]) -> dict:
+    stats = LoadTestStats()
+    scenarios = list(weights)
+    scenario_weights = [weights[s] for s in scenarios]
+    import_counter = [0]
+    stop_event = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        # Vorbefüllen, damit Lese-Szenarien Daten finden
+        await client.post("/jobs/import", json=make_fake_jobs(1000, prefix="seed"))
+
+        start = time.perf_counter()
+        deadline = start + duration
+        rss_task = asyncio.create_task(sample_rss(server_pid, stats, start, stop_event))
+
+        async def virtual_user():
+            while time.perf_counter() < deadline:
+                scenario = random.choices(scenarios, scenario_weights)[0]
+                await run_scenario(client, stats, scenario, import_counter)
+
+        await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stop_event.set()
+        await rss_task
+
+    return stats.summary(elapsed)
+
+
+def print_summary(result: dict):
+    print(f"\nGesamt: {result['total_requests']} Anfragen, {result['total_rps']:.1f} RPS, "
+          f"Fehlerquote {result['error_rate']:.2%}, Peak-RSS {result['peak_rss_kb']} KB")
+    print(f"{'Szenario':<16} | {'Anfr.':>7} | {'RPS':>8} | {'Fehler':>7} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}")
+    print("-" * 80)
+    for name, s in result["scenarios"].items():
+        lat = s["latency_ms"]
+        print(f"{name:<16} | {s['requests']:>7} | {s['rps']:>8.1f} | {s['error_rate']:>7.2%} | "
+              f"{lat['p50']:>8.2f} | {lat['p95']:>8.2f} | {lat['p99']:>8.2f}")
+
+
+def compare_results(old_path: str, new_path: str):
+    """
+    Vergleicht zwei Ergebnisdateien (RPS und p95 pro Szenario).
+    """
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"Vergleich {old.get('commit')} -> {new.get('commit')}")
+    print(f"{'Szenario':<16} | {'RPS alt':>9} | {'RPS neu':>9} | {'p95 alt':>9} | {'p95 neu':>9} | {'p95 Δ':>8}")
+    print("-" * 75)
+    for name, new_s in new["result"]["scenarios"].items():
+        old_s = old["result"]["scenarios"].get(name)
+        if old_s is None:
+            continue
+        old_p95, new_p95 = old_s["latency_ms"]["p95"], new_s["latency_ms"]["p95"]
+        change = (new_p95 - old_p95) / old_p95 if old_p95 else 0.0
+        print(f"{name:<16} | {old_s['rps']:>9.1f} | {new_s['rps']:>9.1f} | {old_p95:>9.2f} | {new_p95:>9.2f} | {change:>+8.1%}")
+
+
+async def main(args):
+    weights = dict(DEFAULT_SCENARIO_WEIGHTS)
+    if args.scenarios:
+        weights = {name: weights[name] for name in args.scenarios}
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_uvicorn(port, args.workers)
+    try:
+        await wait_until_ready(base_url)
+        logging.info(f"Lasttest läuft {args.duration}s mit {args.concurrency} virtuellen Nutzern: {weights}")
+        result = await run_load_test(base_url, server.pid, args.duration, args.concurrency, weights)
+    finally:
+        stop_server(server)
+
+    print_summary(result)
+    report = {
+        "commit": current_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "weights": weights,
+            "storage_backend": os.environ.get("JOBS_STORAGE_BACKEND", "memory"),
+        },
+        "result": result,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    logging.info(f"Ergebnisse gespeichert in '{args.output}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lasttest für die Jobs- und Passwort-API.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Dauer in Sekunden")
+    parser.add_argument("--concurrency", type=int, default=32, help="Anzahl virtueller Nutzer")
+    parser.add_argument("--workers", type=int, default=1, help="Anzahl uvicorn-Worker")
+    parser.add_argument("--scenarios", nargs="+", choices=list(DEFAULT_SCENARIO_WEIGHTS), help="Nur diese Szenarien ausführen")
+    parser.add_argument("--output", default="load_test_results.json", help="Ergebnisdatei (JSON)")
+    parser.add_argument("--compare", nargs=2, metavar=("ALT", "NEU"), help="Zwei Ergebnisdateien vergleichen statt zu messen")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+    else:
+        asyncio.run(main(args))
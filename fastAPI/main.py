@@ -1,21 +1,50 @@
 # main.py
-from fastapi import FastAPI, Query, HTTPException, status 
-from pydantic import BaseModel, Field 
-import random 
+from fastapi import FastAPI, Query, HTTPException, Request, status 
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError 
+import os
+import itertools
+import json
 import string 
 import logging
+import zlib
+import asyncio
+from contextlib import asynccontextmanager
 from typing import List, Optional, Union
+from fastapi.responses import JSONResponse, StreamingResponse
+from storage import create_storage
+from response_cache import ResponseCache, cached_json_response
+from ingestion import IngestionQueue
+from events import JobEventBroker
+from description_rendering import DescriptionRenderer
 
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startet beim Hochfahren den Hintergrund-Worker für asynchrone Importe
+    und beendet ihn beim Herunterfahren wieder, danach wird der Speicher geschlossen.
+    """
+    _event_broker.bind_loop(asyncio.get_running_loop())
+    _ingestion_queue.start()
+    yield
+    await _ingestion_queue.stop()
+    _job_storage.close()
+
 # 1. FastAPI-Instanz erstellen, 'app' ist Hauptobjekt.
 app = FastAPI(
     title="Passwort Generator API",
     description="Eine einfache API zum Generieren von sicheren Passwörtern.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Komprimiert alle übrigen größeren Antworten. Antworten, die schon eine
+# Content-Encoding haben (gecachte Job-Listen), werden nicht erneut komprimiert.
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # 2. Zeichensets definieren
 CHAR_SETS = {
     "lower": string.ascii_lowercase,
@@ -24,6 +53,26 @@ CHAR_SETS = {
     "special": string.punctuation # Sonderzeichen
 }
 
+# Alle 15 möglichen Zeichenpools einmalig vorberechnen, Schlüssel (lower, upper, digits, special).
+# Pro Pool eine Übersetzungstabelle: Zufallsbyte -> Zeichen, zu große Bytes werden verworfen
+# (Rejection Sampling), damit jedes Zeichen exakt gleich wahrscheinlich ist.
+CHAR_POOLS = {}
+for _flags in itertools.product((True, False), repeat=4):
+    _names = [name for name, enabled in zip(CHAR_SETS, _flags) if enabled]
+    if not _names:
+        continue
+    _pool = "".join(CHAR_SETS[name] for name in _names).encode("ascii")
+    _limit = 256 - (256 % len(_pool))
+    CHAR_POOLS[_flags] = {
+        "chars_used": ", ".join(_names),
+        "table": bytes(_pool[b % len(_pool)] for b in range(_limit)) + bytes(256 - _limit),
+        "reject": bytes(range(_limit, 256)),
+        "acceptance": _limit / 256,
+    }
+
+PASSWORD_STREAM_THRESHOLD = 1000    # Ab dieser Anzahl wird NDJSON gestreamt
+PASSWORD_CHUNK_SIZE = 1000          # Passwörter pro Zufallspuffer beim Streamen
+
 # 3. Pydantic-Modell für die Antwort in JSON
 class PasswordResponse(BaseModel):
     """
@@ -33,12 +82,19 @@ class PasswordResponse(BaseModel):
     length: int = Field(..., description="Länge des Passworts")
     chars_used: str = Field(..., description="Verwendete Zeichentypen")
 
+# Antwortmodell für mehrere Passwörter
+class BatchPasswordResponse(BaseModel):
+    passwords: List[str] = Field(..., description="Die generierten Passwörter")
+    count: int = Field(..., description="Anzahl der Passwörter")
+    length: int = Field(..., description="Länge jedes Passworts")
+    chars_used: str = Field(..., description="Verwendete Zeichentypen")
+
 # 4. Pydantic Modell für die Jobdaten
 # Modell für einen einzelnen Job-Eintrag
 class EdekaJob(BaseModel):
     url: Optional[str] = None # Optional, da es "Keine URL vorhanden" geben könnte
     department: Optional[str] = None
-    description: Optional[str] = None # Dieses Feld enthält das Markdown
+    description: Optional[str] = None # Dieses Feld enthält das Markdown (oder Roh-HTML aus dem Raw-Modus, siehe description_rendering.py)
     job_title: str # Ein JobTitel sollte immer vorhanden sein
     level: Optional[str] = None # Optional, da es "None" oder "Unbestimmt" sein kann
     # location kann ein String oder eine Liste von Strings sein (je nachdem, wie du es ursprünglich gescrapt hast)
@@ -52,9 +108,54 @@ class ImportResponse(BaseModel):
     message: str 
     imported_count: int = 0
 
-# Speicherung importierter Daten in Liste
-# In echt in einer Datenbank
-_imported_jobs_storage = []
+# Ein einzelner Fehler beim zeilenweisen Import
+class ImportLineError(BaseModel):
+    line: int = Field(..., description="Zeilennummer im NDJSON-Payload (ab 1)")
+    error: str = Field(..., description="Validierungs- bzw. Parserfehler")
+
+# Antwortmodell für den NDJSON-Bulk-Import
+class BulkImportResponse(ImportResponse):
+    error_count: int = 0
+    errors: List[ImportLineError] = Field(default_factory=list, description="Die ersten fehlerhaften Zeilen")
+
+# Status eines Hintergrund-Imports
+class IngestionStatus(BaseModel):
+    ingestion_id: str
+    status: str = Field(..., description="queued, running, done oder failed")
+    total: Optional[int] = Field(None, description="Anzahl Jobs im Payload (nach dem Parsen bekannt)")
+    processed: int = 0
+    imported_count: int = 0
+    error_count: int = 0
+    errors: List[ImportLineError] = Field(default_factory=list)
+    submitted_at: float
+    finished_at: Optional[float] = None
+
+# Speicherung importierter Daten, Backend über JOBS_STORAGE_BACKEND wählbar
+# (memory = Liste im Prozess, sqlite = gemeinsame Datenbank für mehrere Worker)
+_job_storage = create_storage()
+
+# Roh-HTML-Beschreibungen (Raw-Modus des Scrapers) werden erst beim Lesen in Markdown umgewandelt
+_description_renderer = DescriptionRenderer()
+
+# Änderungs-Events (insert/update/delete) für /jobs/stream
+_event_broker = JobEventBroker(render_job=_description_renderer.render_job, load_job=_job_storage.get_job_by_url)
+_job_storage.add_listener(_event_broker.publish)
+
+# Serialisierte Antworten der Lese-Endpunkte pro (Endpunkt, Parameter, Store-Version)
+_response_cache = ResponseCache()
+
+# Wiederverwendbarer Validator für einzelne NDJSON-Zeilen.
+# validate_json() parst und validiert in einem Schritt im Rust-Kern von pydantic.
+_edeka_job_adapter = TypeAdapter(EdekaJob)
+
+IMPORT_BATCH_SIZE = 1000        # Jobs pro Speicher-Commit beim NDJSON-Import
+MAX_REPORTED_IMPORT_ERRORS = 100  # Maximal zurückgemeldete Fehlerzeilen
+GZIP_MAGIC = b"\x1f\x8b"
+MAX_NDJSON_DECOMPRESSED_BYTES = 512 * 1024 * 1024   # Obergrenze für entpackte gzip-Bodys (Schutz vor gzip-Bomben)
+GZIP_OUTPUT_CHUNK = 64 * 1024                       # Höchstens so viele entpackte Bytes pro decompress()-Aufruf
+
+# Warteschlange für Hintergrund-Importe, wird im lifespan gestartet
+_ingestion_queue = IngestionQueue(_job_storage.add_jobs, _edeka_job_adapter, batch_size=IMPORT_BATCH_SIZE)
 
 @app.post(
         "/jobs/import",
@@ -72,6 +173,7 @@ async def import_jobs(job_list_data: List[EdekaJob]): # Hier wird das Pydantic-M
     logging.info(f"Anfrage zum Importieren von {len(job_list_data)} Jobs enthalten")
 
     imported_count = 0
+    jobs_to_store = []
     for job_data in job_list_data:
         # Hier würde die Logik zur Verarbeitung jedes Jobs stehen:
         # - Datenbank-Speicherung
@@ -80,10 +182,13 @@ async def import_jobs(job_list_data: List[EdekaJob]): # Hier wird das Pydantic-M
         
         # logging.info(f"DEBUGGING DESCRIPTION for job '{job_data.job_title}':\n---START---\n{job_data.description}\n---ENDE---")
         # Für diese Übung: Füge den Job einfach zu unserem simulierten Speicher hinzu
-        _imported_jobs_storage.append(job_data.dict()) # .dict() konvertiert Pydantic-Modell zurück in ein Python-Dictionary
+        jobs_to_store.append(job_data.model_dump()) # model_dump() konvertiert Pydantic-Modell zurück in ein Python-Dictionary
         imported_count += 1
         # logging.debug(f"Job {job_data.job_title} importiert.") # Nur für Debugging
 
+    # Alle Jobs in einem Batch speichern (bei SQLite eine Transaktion)
+    _job_storage.add_jobs(jobs_to_store)
+
     logging.info(f"Erfolgreich {imported_count} Jobs importiert.")
 
     return {
@@ -92,10 +197,301 @@ async def import_jobs(job_list_data: List[EdekaJob]): # Hier wird das Pydantic-M
         "imported_count": imported_count
     }
 
+@app.post(
+        "/jobs/import/async",
+        status_code=status.HTTP_202_ACCEPTED,
+        response_model=IngestionStatus,
+        summary="Nimmt eine Liste von Edk-Jobs zur Verarbeitung im Hintergrund an.",
+        description="""
+    Wie `/jobs/import`, aber der Payload wird nur in eine Warteschlange gelegt und sofort mit 202
+    beantwortet. Validierung und Speicherung übernimmt ein Hintergrund-Worker.
+    Fortschritt und Ergebnis liefert `/jobs/import/{ingestion_id}`.
+    """
+)
+async def import_jobs_async(request: Request):
+    """
+    Antwortzeit hängt nicht von der Anzahl der Jobs ab, nur vom Upload selbst.
+    """
+    payload = await request.body()
+    try:
+        ingestion = _ingestion_queue.submit(payload)
+    except asyncio.QueueFull:
+        logging.warning("Ingestion-Queue voll, Import abgelehnt.")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Zu viele ausstehende Importe, bitte später erneut versuchen.",
+            headers={"Retry-After": "5"}
+        )
+
+    logging.info(f"Import {ingestion['ingestion_id']} in die Warteschlange gelegt ({len(payload)} Bytes).")
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=ingestion,
+        headers={"Location": f"/jobs/import/{ingestion['ingestion_id']}"}
+    )
+
+@app.get(
+        "/jobs/import/{ingestion_id}",
+        response_model=IngestionStatus,
+        summary="Gibt Fortschritt und Ergebnis eines Hintergrund-Imports zurück."
+)
+async def get_ingestion_status(ingestion_id: str):
+    ingestion = _ingestion_queue.get_status(ingestion_id)
+    if ingestion is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unbekannte Ingestion-ID."
+        )
+    return ingestion
+
+
+class DecompressedBodyTooLarge(Exception):
+    pass
+
+
+class _GzipStreamDecoder:
+    """
+    Entpackt einen gzip-Stream stückweise. Mehrere gzip-Members hintereinander
+    (z. B. aneinandergehängte .gz-Dateien) werden nacheinander entpackt, die
+    entpackte Gesamtgröße ist auf max_output Bytes begrenzt.
+    """
+
+    def __init__(self, max_output: Optional[int] = None):
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.max_output = max_output or MAX_NDJSON_DECOMPRESSED_BYTES
+        self.total_output = 0
+
+    def _count(self, data: bytes) -> bytes:
+        self.total_output += len(data)
+        if self.total_output > self.max_output:
+            raise DecompressedBodyTooLarge(f"Entpackter Body größer als {self.max_output} Bytes.")
+        return data
+
+    def decompress(self, data: bytes):
+        while data:
+            if self._decompressor.eof:
+                # Voriges Member ist fertig, Rest gehört zum nächsten
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            out = self._decompressor.decompress(data, GZIP_OUTPUT_CHUNK)
+            data = self._decompressor.unused_data if self._decompressor.eof else self._decompressor.unconsumed_tail
+            if out:
+                yield self._count(out)
+
+    def finish(self) -> bytes:
+        if not self._decompressor.eof:
+            raise zlib.error("gzip-Stream ist unvollständig (abgeschnitten)")
+        return self._count(self._decompressor.flush())
+
+
+async def _iter_ndjson_lines(request: Request):
+    """
+    Liest den Request-Body stückweise, entpackt ihn bei Bedarf (gzip)
+    und liefert einzelne Zeilen als Bytes. Der Body wird nie komplett gepuffert.
+    """
+    decoder = None
+    is_gzip = request.headers.get("content-encoding", "").lower() == "gzip"
+    first_chunk = True
+    partial = []    # Teile der aktuellen, noch unvollständigen Zeile
+
+    def split_lines(data):
+        # Nur das neue Stück durchsuchen, lange Zeilen werden erst am Zeilenende zusammengefügt
+        if b"\n" not in data:
+            partial.append(data)
+            return []
+        lines = data.split(b"\n")
+        partial.append(lines[0])
+        lines[0] = b"".join(partial)
+        partial[:] = [lines.pop()]
+        return lines
+
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        if first_chunk:
+            first_chunk = False
+            # Auch gzip-Dateien ohne Content-Encoding-Header erkennen
+            if is_gzip or chunk.startswith(GZIP_MAGIC):
+                decoder = _GzipStreamDecoder()
+        pieces = decoder.decompress(chunk) if decoder is not None else (chunk,)
+        for piece in pieces:
+            for line in split_lines(piece):
+                yield line
+
+    if decoder is not None:
+        for line in split_lines(decoder.finish()):
+            yield line
+    rest = b"".join(partial)
+    if rest:
+        yield rest
+
+
+@app.post(
+        "/jobs/import/ndjson",
+        response_model=BulkImportResponse,
+        summary="Importiert Edk-Jobs als (gzip-komprimiertes) NDJSON.",
+        description="""
+    Dieser Endpunkt empfängt einen NDJSON-Stream (ein Job pro Zeile), optional gzip-komprimiert
+    (`Content-Encoding: gzip`). Jede Zeile wird einzeln validiert, gültige Jobs werden in Batches
+    gespeichert. Fehlerhafte Zeilen werden gemeldet, ohne den restlichen Import abzubrechen.
+    """
+)
+async def import_jobs_ndjson(request: Request):
+    """
+    Zeilenweiser Import: Speicherbedarf hängt nur von der Batchgröße ab, nicht vom Payload.
+    """
+    imported_count = 0
+    error_count = 0
+    errors = []
+    batch = []
+
+    try:
+        line_number = 0
+        async for line in _iter_ndjson_lines(request):
+            line_number += 1
+            if not line.strip():
+                continue    # Leerzeilen ignorieren
+            try:
+                job = _edeka_job_adapter.validate_json(line)
+            except ValidationError as e:
+                error_count += 1
+                if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                    errors.append({"line": line_number, "error": str(e)})
+                continue
+
+            batch.append(job.model_dump())
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported_count += _job_storage.add_jobs(batch)
+                batch = []
+    except zlib.error as e:
+        # Der angefangene Batch wird verworfen, vollständige Batches sind bereits gespeichert
+        logging.warning(f"Ungültiger gzip-Stream nach {imported_count} gespeicherten Jobs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Ungültiger gzip-Stream: {e}. {imported_count} Jobs aus vollständigen Batches "
+                   f"wurden bereits gespeichert, {len(batch)} weitere verworfen."
+        )
+    except DecompressedBodyTooLarge as e:
+        logging.warning(f"NDJSON-Import abgebrochen nach {imported_count} gespeicherten Jobs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"{e} {imported_count} Jobs aus vollständigen Batches wurden bereits gespeichert, "
+                   f"{len(batch)} weitere verworfen."
+        )
+
+    if batch:
+        imported_count += _job_storage.add_jobs(batch)
+
+    logging.info(f"NDJSON-Import: {imported_count} Jobs importiert, {error_count} fehlerhafte Zeilen.")
+
+    return {
+        "status": "success" if error_count == 0 else "partial",
+        "message": f"Erfolgreich {imported_count} Jobs importiert, {error_count} Zeilen fehlerhaft.",
+        "imported_count": imported_count,
+        "error_count": error_count,
+        "errors": errors
+    }
+
+# Push-Feed statt Polling von /jobs/all
+@app.get(
+        "/jobs/stream",
+        summary="Server-Sent-Events-Feed neuer, geänderter und gelöschter Jobs.",
+        description="""
+    Liefert jede Änderung am Jobbestand als SSE-Event (`insert`, `update`, `delete`) mit dem Job als JSON.
+    Nach einem Verbindungsabbruch sendet der Browser automatisch den Header `Last-Event-ID`,
+    dann werden nur die verpassten Events nachgeliefert. Ist das nicht mehr möglich,
+    kommt ein `reset`-Event: der Client sollte dann einmal `/jobs/all` laden.
+    """
+)
+async def stream_job_events(
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="Alternative zum Header Last-Event-ID"),
+):
+    resume_from = request.headers.get("last-event-id") or last_event_id
+    subscription = _event_broker.subscribe(resume_from)
+    return StreamingResponse(
+        _event_broker.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Endpunkt um die importierten Jobs anzuzeigen
 @app.get("/jobs/all", response_model=List[EdekaJob], summary="Gibt alle importierten Jobs zurück.")
-async def get_all_imported_jobs():
-    return _imported_jobs_storage
+async def get_all_imported_jobs(
+    request: Request,
+    include_description: bool = Query(True, description="Markdown-Beschreibung mitliefern?"),
+):
+    # Unveränderte Abfragen (If-None-Match) werden mit 304 ohne Body beantwortet
+    return cached_json_response(
+        request, _response_cache, ("/jobs/all", include_description), _job_storage.get_version(),
+        lambda: _description_renderer.render_jobs(_job_storage.get_all_jobs(include_description=include_description))
+    )
+
+# Seitenweises Lesen, damit Clients nicht immer den kompletten Datenbestand laden müssen
+@app.get("/jobs", response_model=List[EdekaJob], summary="Gibt eine Seite der importierten Jobs zurück.")
+async def get_jobs_page(
+    request: Request,
+    offset: int = Query(0, ge=0, description="Anzahl der zu überspringenden Jobs"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximale Anzahl Jobs pro Seite"),
+    include_description: bool = Query(True, description="Markdown-Beschreibung mitliefern?"),
+):
+    return cached_json_response(
+        request, _response_cache, ("/jobs", offset, limit, include_description), _job_storage.get_version(),
+        lambda: _description_renderer.render_jobs(
+            _job_storage.get_jobs(offset=offset, limit=limit, include_description=include_description)
+        )
+    )
+
+# Einzelnen Job über seine URL abfragen (indizierter Lookup)
+@app.get("/jobs/by-url", response_model=EdekaJob, summary="Gibt einen Job anhand seiner URL zurück.")
+async def get_job_by_url(url: str = Query(..., description="Detail-URL des Jobs")):
+    job = _description_renderer.render_job(_job_storage.get_job_by_url(url))
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Kein Job mit dieser URL gefunden."
+        )
+    return job
+
+# Job löschen (erzeugt ein delete-Event im Stream)
+@app.delete("/jobs/by-url", response_model=ImportResponse, summary="Löscht einen Job anhand seiner URL.")
+async def delete_job_by_url(url: str = Query(..., description="Detail-URL des Jobs")):
+    if not _job_storage.delete_job(url):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Kein Job mit dieser URL gefunden."
+        )
+    logging.info(f"Job gelöscht: {url}")
+    return {"status": "success", "message": "Job gelöscht.", "imported_count": 0}
+
+
+def _get_char_pool(include_lower: bool, include_upper: bool, include_digits: bool, include_special: bool) -> dict:
+    """
+    Gibt den vorberechneten Zeichenpool zurück oder wirft 400, wenn kein Zeichentyp gewählt ist.
+    """
+    pool = CHAR_POOLS.get((include_lower, include_upper, include_digits, include_special))
+    if pool is None:
+        logging.warning("Kein Zeichentyp ausgewählt.")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Mindestens ein Zeichentyp muss ausgewäht werden."
+        )
+    return pool
+
+
+def _generate_passwords(pool: dict, length: int, count: int) -> List[str]:
+    """
+    Erzeugt `count` Passwörter aus einem einzigen os.urandom-Puffer (kryptographisch sicher).
+    bytes.translate bildet alle Bytes in C auf den Pool ab und verwirft die abgelehnten.
+    """
+    needed = length * count
+    chars = b""
+    while len(chars) < needed:
+        missing = needed - len(chars)
+        # Etwas mehr anfordern, als nach dem Verwerfen im Mittel übrig bleibt
+        buffer = os.urandom(int(missing / pool["acceptance"]) + 16)
+        chars += buffer.translate(pool["table"], pool["reject"])
+    text = chars[:needed].decode("ascii")
+    return [text[i:i + length] for i in range(0, needed, length)]
 
 
 # 5. API-Route definieren
@@ -128,41 +524,61 @@ async def generate_password(
     """
     logging.info(f"Anfrage zum Generieren eines Passworts: Länge={length}, Lower={include_lower}, Upper={include_upper}, Digits={include_digits}, Specials={include_special}")
 
-    # 6. Zeichenpool basierend auf Anfrageparameter zusammenstellen
-    char_pool = ""
-    chars_used_info = [] 
-
-    if include_lower:
-        char_pool += CHAR_SETS["lower"]
-        chars_used_info.append("lower")
-    if include_upper:
-        char_pool += CHAR_SETS["upper"]
-        chars_used_info.append("upper")
-    if include_digits:
-        char_pool += CHAR_SETS["digits"]
-        chars_used_info.append("digits")
-    if include_special:
-        char_pool += CHAR_SETS["special"]
-        chars_used_info.append("special")
-
-    # 7. Fehlerbehandlung
-    if not char_pool:
-        logging.warning("Kein Zeichentyp ausgewählt.")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Mindestens ein Zeichentyp muss ausgewäht werden."
-        )
+    # 6. Vorberechneten Zeichenpool wählen, 7. Fehlerbehandlung falls keiner gewählt
+    pool = _get_char_pool(include_lower, include_upper, include_digits, include_special)
 
     # 8. Passwort generieren
-    password = ''.join(random.choice(char_pool) for _ in range(length))
+    password = _generate_passwords(pool, length, 1)[0]
     logging.info("Passwort erfolgreich generiert.")
 
     # 9. Antwort zurückgeben
     return {
         "password": password,
         "length": length,
-        "chars_used": ", ".join(chars_used_info) if chars_used_info else "none"
+        "chars_used": pool["chars_used"]
     }
+
+# Viele Passwörter pro Anfrage, z. B. für Provisionierungs-Jobs
+@app.get(
+    "/generate-passwords",
+    response_model=BatchPasswordResponse,
+    summary="Generiert viele sichere Passwörter in einer Anfrage",
+    description=f"""
+    Wie `/generate-password`, aber für `count` Passwörter auf einmal.
+    Ab {PASSWORD_STREAM_THRESHOLD} Passwörtern (oder mit `Accept: application/x-ndjson`)
+    wird die Antwort als NDJSON gestreamt, ein `{{"password": ...}}` pro Zeile.
+    """
+)
+async def generate_passwords(
+    request: Request,
+    count: int = Query(10, ge=1, le=1_000_000, description="Anzahl der Passwörter"),
+    length: int = Query(12, ge=4, le=128, description="Die gewünschte Länge jedes Passworts. Zwischen 4 und 128 Zeichen."),
+    include_lower: bool = Query(True, description="Sollen Kleinbuchstaben (a-z) enthalten sein?"),
+    include_upper: bool = Query(True, description="Sollen Großbuchstaben (A-Z) enthalten sein?"),
+    include_digits: bool = Query(True, description="Sollen Ziffern (0-9) enthalten sein?"),
+    include_special: bool = Query(True, description="Sollen Sonderzeichen (!@#$...) enthalten sein?"),
+):
+    logging.info(f"Anfrage zum Generieren von {count} Passwörtern: Länge={length}, Lower={include_lower}, Upper={include_upper}, Digits={include_digits}, Specials={include_special}")
+    pool = _get_char_pool(include_lower, include_upper, include_digits, include_special)
+
+    wants_ndjson = "application/x-ndjson" in request.headers.get("accept", "")
+    if count < PASSWORD_STREAM_THRESHOLD and not wants_ndjson:
+        return {
+            "passwords": _generate_passwords(pool, length, count),
+            "count": count,
+            "length": length,
+            "chars_used": pool["chars_used"]
+        }
+
+    def ndjson_chunks():
+        remaining = count
+        while remaining > 0:
+            chunk_size = min(PASSWORD_CHUNK_SIZE, remaining)
+            passwords = _generate_passwords(pool, length, chunk_size)
+            yield "".join(json.dumps({"password": password}) + "\n" for password in passwords)
+            remaining -= chunk_size
+
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
     
     # FastAPI fügt von sich aus einen Endpunkt für Dokumenatation hinzu
 
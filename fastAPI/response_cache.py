@@ -0,0 +1,130 @@
+# response_cache.py
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from fastapi import Request, Response, status
+
+try:
+    import brotli   # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+
+GZIP_COMPRESS_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class CachedBody:
+    """
+    Fertig serialisierter Antwort-Body für einen bestimmten Datenstand (Version).
+    Komprimierte Varianten werden erst bei Bedarf erzeugt und dann wiederverwendet.
+    """
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._encoded = {"identity": body}
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            if encoding == "br":
+                self._encoded[encoding] = brotli.compress(self.body, quality=BROTLI_QUALITY)
+            elif encoding == "gzip":
+                self._encoded[encoding] = gzip.compress(self.body, compresslevel=GZIP_COMPRESS_LEVEL)
+            else:
+                raise ValueError(f"Unbekannte Kodierung: {encoding}")
+        return self._encoded[encoding]
+
+
+def make_etag(cache_key: tuple, version: int) -> str:
+    """
+    ETag aus Endpunkt/Parametern und Store-Version. Ohne Serialisierung berechenbar.
+    """
+    key_hash = hashlib.sha1(repr(cache_key).encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{key_hash}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Prüft den If-None-Match-Header (auch Listen, schwache ETags und '*').
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def negotiate_encoding(request: Request) -> str:
+    """
+    Wählt anhand von Accept-Encoding brotli (falls installiert), gzip oder keine Kompression.
+    """
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+
+class ResponseCache:
+    """
+    Cache für serialisierte Antworten, Schlüssel (Endpunkt, Parameter), gültig für eine Store-Version.
+    Ändert sich die Version (neuer Import), wird der Eintrag beim nächsten Zugriff neu gebaut.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: tuple, version: int) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry[1]
+
+    def put(self, cache_key: tuple, version: int, cached: CachedBody):
+        with self._lock:
+            self._entries[cache_key] = (version, cached)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def cached_json_response(request: Request, cache: ResponseCache, cache_key: tuple, version: int,
+                         build: Callable[[], object]) -> Response:
+    """
+    Liefert eine JSON-Antwort mit ETag:
+    - 304 ohne Body, wenn der Client den aktuellen Stand schon hat,
+    - sonst den (gecachten) serialisierten und passend komprimierten Body.
+    `build` wird nur aufgerufen, wenn für diese Version noch nichts im Cache liegt.
+    """
+    etag = make_etag(cache_key, version)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = cache.get(cache_key, version)
+    if cached is None:
+        body = json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        cached = CachedBody(body, etag)
+        cache.put(cache_key, version, cached)
+
+    encoding = negotiate_encoding(request)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=cached.encoded(encoding), media_type="application/json", headers=headers)
@@ -0,0 +1,445 @@
+# storage.py
+import json
+import os
+import sys
+import sqlite3
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from description_blob import DescriptionBlobStore, load_scraper_file
+
+
+# Reihenfolge der Spalten entspricht den Feldern von EdekaJob
+JOB_FIELDS = ("url", "department", "description", "job_title", "level", "location", "schedule")
+
+
+class JobStorage:
+    """
+    Schnittstelle für die Speicherung der importierten Jobs.
+    Konkrete Backends: InMemoryJobStorage und SQLiteJobStorage.
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[List[Tuple[str, dict]]], None]] = []
+
+    def add_listener(self, listener: Callable[[List[Tuple[str, dict]]], None]):
+        """
+        Registriert eine Funktion, die nach jedem Schreibvorgang die Änderungen
+        als Liste von (action, job)-Paaren erhält, action ist insert, update oder delete.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, changes: List[Tuple[str, dict]]):
+        for listener in self._listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                logging.error(f"Fehler in Storage-Listener: {e}", exc_info=True)
+
+    def add_jobs(self, jobs: List[dict]) -> int:
+        """
+        Speichert eine Liste von Jobs (Dictionaries) und gibt die Anzahl zurück.
+        Jobs mit bereits bekannter URL werden aktualisiert statt dupliziert.
+        """
+        raise NotImplementedError
+
+    def delete_job(self, url: str) -> bool:
+        """
+        Löscht den Job mit der URL. Gibt False zurück, wenn es ihn nicht gab.
+        """
+        raise NotImplementedError
+
+    def add_raw_jobs(self, raw_jobs: List[Tuple[dict, Optional[bytes]]]) -> int:
+        """
+        Speichert Jobs aus einer Scraper-Datei als (metadaten, beschreibung_als_json_literal).
+        Standard: Beschreibung dekodieren und normal speichern.
+        """
+        jobs = []
+        for metadata, description_literal in raw_jobs:
+            job = {field: metadata.get(field) for field in JOB_FIELDS}
+            job["description"] = json.loads(description_literal) if description_literal else None
+            jobs.append(job)
+        return self.add_jobs(jobs)
+
+    def get_all_jobs(self, include_description: bool = True) -> List[dict]:
+        """
+        Mit include_description=False bleibt das Feld description leer (None).
+        """
+        raise NotImplementedError
+
+    def get_jobs(self, offset: int = 0, limit: int = 100, include_description: bool = True) -> List[dict]:
+        """
+        Gibt eine Seite von Jobs in Importreihenfolge zurück.
+        """
+        raise NotImplementedError
+
+    def get_job_by_url(self, url: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def get_version(self) -> int:
+        """
+        Versionszähler des Datenbestands, wird bei jedem Import erhöht.
+        Dient als Grundlage für ETags und den Antwort-Cache.
+        """
+        raise NotImplementedError
+
+    def claim_warm_start(self, source_mtime: int) -> bool:
+        """
+        Soll dieser Prozess die Warmstart-Datei (Stand source_mtime) laden?
+        Der Speicher gehört nur diesem Prozess, also immer ja.
+        """
+        return True
+
+    def finish_warm_start(self, source_mtime: int, success: bool):
+        """
+        Wird nach dem Laden aufgerufen (success=False bei Fehler).
+        """
+        pass
+
+    def close(self):
+        pass
+
+
+class InMemoryJobStorage(JobStorage):
+    """
+    Speichert die Jobs im Prozess als kompakte Tupel (Reihenfolge wie JOB_FIELDS).
+    Mit einem DescriptionBlobStore liegen die Beschreibungen nicht im Speicher,
+    sondern in einer Datei; im Tupel steht dann nur (offset, length).
+    Jeder uvicorn-Worker hat seine eigene Kopie, nach einem Neustart ist alles weg.
+    """
+
+    _DESCRIPTION_INDEX = JOB_FIELDS.index("description")
+    # Felder mit wenigen verschiedenen Werten, die über viele Jobs geteilt werden
+    _INTERNED_FIELDS = frozenset(("department", "level", "location", "schedule"))
+
+    def __init__(self, description_blob: Optional[DescriptionBlobStore] = None):
+        super().__init__()
+        self._records: List[tuple] = []
+        self._index_by_url: Dict[str, int] = {}
+        self._description_blob = description_blob
+        # Startwert aus der Uhrzeit, damit ETags nach einem Neustart nicht mit alten kollidieren
+        self._version = time.time_ns()
+        self._lock = threading.Lock()
+
+    def _to_record(self, job: dict, description_ref=None) -> tuple:
+        values = []
+        for field in JOB_FIELDS:
+            value = job.get(field)
+            if field == "description":
+                if description_ref is not None:
+                    value = description_ref
+                elif self._description_blob is not None and value is not None:
+                    value = self._description_blob.append_text(value)
+            elif field in self._INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            values.append(value)
+        return tuple(values)
+
+    def _to_job(self, record: tuple, include_description: bool = True) -> dict:
+        job = dict(zip(JOB_FIELDS, record))
+        description = record[self._DESCRIPTION_INDEX]
+        if not include_description:
+            job["description"] = None
+        elif self._description_blob is not None and description is not None:
+            job["description"] = self._description_blob.read(description)
+        return job
+
+    def _store_record(self, record: tuple) -> str:
+        """
+        Fügt einen Datensatz ein oder ersetzt den mit gleicher URL. Erwartet gehaltenen Lock.
+        """
+        url = record[0]
+        if url is not None and url in self._index_by_url:
+            self._records[self._index_by_url[url]] = record
+            return "update"
+        if url is not None:
+            self._index_by_url[url] = len(self._records)
+        self._records.append(record)
+        return "insert"
+
+    def add_jobs(self, jobs: List[dict]) -> int:
+        changes = []
+        with self._lock:
+            for job in jobs:
+                changes.append((self._store_record(self._to_record(job)), job))
+            if jobs:
+                self._version += 1
+        self._notify(changes)
+        return len(jobs)
+
+    def add_raw_jobs(self, raw_jobs: List[Tuple[dict, Optional[bytes]]]) -> int:
+        if self._description_blob is None:
+            return super().add_raw_jobs(raw_jobs)
+
+        # Beschreibung als Literal direkt in die Blob-Datei, ohne sie zu dekodieren.
+        # Warmstart-Daten erzeugen keine Änderungs-Events.
+        with self._lock:
+            for metadata, description_literal in raw_jobs:
+                description_ref = self._description_blob.append_literal(description_literal) if description_literal else None
+                self._store_record(self._to_record(metadata, description_ref))
+            if raw_jobs:
+                self._version += 1
+        return len(raw_jobs)
+
+    def delete_job(self, url: str) -> bool:
+        with self._lock:
+            index = self._index_by_url.pop(url, None)
+            if index is None:
+                return False
+            job = self._to_job(self._records.pop(index))
+            # Nachfolgende Positionen verschieben sich um eins
+            for other_url, other_index in self._index_by_url.items():
+                if other_index > index:
+                    self._index_by_url[other_url] = other_index - 1
+            self._version += 1
+        self._notify([("delete", job)])
+        return True
+
+    def get_all_jobs(self, include_description: bool = True) -> List[dict]:
+        return [self._to_job(record, include_description) for record in self._records]
+
+    def get_jobs(self, offset: int = 0, limit: int = 100, include_description: bool = True) -> List[dict]:
+        return [self._to_job(record, include_description) for record in self._records[offset:offset + limit]]
+
+    def get_job_by_url(self, url: str) -> Optional[dict]:
+        index = self._index_by_url.get(url)
+        return self._to_job(self._records[index]) if index is not None else None
+
+    def count(self) -> int:
+        return len(self._records)
+
+    def get_version(self) -> int:
+        return self._version
+
+    def close(self):
+        if self._description_blob is not None:
+            self._description_blob.close()
+
+
+class SQLiteJobStorage(JobStorage):
+    """
+    Speichert die Jobs in einer SQLite-Datenbank im WAL-Modus.
+    WAL erlaubt parallele Leser neben einem Schreiber, dadurch können mehrere
+    uvicorn-Worker (Prozesse) dieselbe Datei konsistent nutzen.
+    Jeder Prozess und Thread öffnet seine eigene Verbindung.
+    """
+
+    def __init__(self, db_path: str = "jobs.db"):
+        super().__init__()
+        self.db_path = db_path
+        self._local = threading.local()
+        self._create_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Gibt die Verbindung des aktuellen Workers/Threads zurück.
+        Nach einem fork() (uvicorn --workers) wird eine neue Verbindung geöffnet,
+        da SQLite-Verbindungen nicht zwischen Prozessen geteilt werden dürfen.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")   # Im WAL-Modus sicher und deutlich schneller
+        conn.execute("PRAGMA busy_timeout=30000")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        logging.debug(f"SQLite-Verbindung geöffnet (PID {os.getpid()}): {self.db_path}")
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT UNIQUE,
+                department TEXT,
+                description TEXT,
+                job_title TEXT NOT NULL,
+                level TEXT,
+                location TEXT,
+                schedule TEXT
+            );
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0);
+        """)  # url UNIQUE legt automatisch einen Index für Lookups und Upserts an
+
+    def add_jobs(self, jobs: List[dict]) -> int:
+        if not jobs:
+            return 0
+        rows = [tuple(job.get(field) for field in JOB_FIELDS) for job in jobs]
+        update_clause = ", ".join(f"{field}=excluded.{field}" for field in JOB_FIELDS if field != "url")
+
+        conn = self._connect()
+        # Ein Batch = eine Transaktion = ein fsync
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing_urls = self._existing_urls(conn, [job.get("url") for job in jobs]) if self._listeners else set()
+            conn.executemany(
+                f"INSERT INTO jobs ({', '.join(JOB_FIELDS)}) VALUES ({', '.join('?' for _ in JOB_FIELDS)}) "
+                f"ON CONFLICT(url) DO UPDATE SET {update_clause}",
+                rows
+            )
+            # Version in derselben Transaktion erhöhen, damit alle Worker sie konsistent sehen
+            conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if self._listeners:
+            changes = []
+            for job in jobs:
+                url = job.get("url")
+                changes.append(("update" if url in existing_urls else "insert", job))
+                if url is not None:
+                    existing_urls.add(url)  # Duplikate innerhalb des Batches sind Updates
+            self._notify(changes)
+        return len(rows)
+
+    def _existing_urls(self, conn: sqlite3.Connection, urls: List[Optional[str]]) -> set:
+        """
+        Welche der URLs sind schon gespeichert? Wird nur für Änderungs-Events benötigt.
+        """
+        urls = [url for url in set(urls) if url is not None]
+        existing = set()
+        for i in range(0, len(urls), 500):  # Unter dem Parameterlimit von SQLite bleiben
+            chunk = urls[i:i + 500]
+            cursor = conn.execute(f"SELECT url FROM jobs WHERE url IN ({', '.join('?' for _ in chunk)})", chunk)
+            existing.update(row[0] for row in cursor)
+        return existing
+
+    def delete_job(self, url: str) -> bool:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job = self.get_job_by_url(url)
+            if job is not None:
+                conn.execute("DELETE FROM jobs WHERE url = ?", (url,))
+                conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if job is None:
+            return False
+        self._notify([("delete", job)])
+        return True
+
+    def _select(self, where: str = "", params: tuple = (), include_description: bool = True) -> List[dict]:
+        # Ohne Beschreibung wird die große Spalte gar nicht erst gelesen
+        columns = ", ".join(field if include_description or field != "description" else "NULL AS description"
+                            for field in JOB_FIELDS)
+        cursor = self._connect().execute(f"SELECT {columns} FROM jobs {where}", params)
+        return [dict(row) for row in cursor]
+
+    def get_all_jobs(self, include_description: bool = True) -> List[dict]:
+        return self._select("ORDER BY id", include_description=include_description)
+
+    def get_jobs(self, offset: int = 0, limit: int = 100, include_description: bool = True) -> List[dict]:
+        return self._select("ORDER BY id LIMIT ? OFFSET ?", (limit, offset), include_description)
+
+    def get_job_by_url(self, url: str) -> Optional[dict]:
+        rows = self._select("WHERE url = ?", (url,))
+        return rows[0] if rows else None
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def get_version(self) -> int:
+        return self._connect().execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+
+    # Ein Claim ohne Abschluss (Worker beim Laden abgestürzt) blockiert spätere Starts nur so lange
+    WARM_START_CLAIM_TIMEOUT = 600
+
+    def claim_warm_start(self, source_mtime: int) -> bool:
+        """
+        Alle Worker teilen sich die Datenbank: Nur der erste Prozess lädt eine Warmstart-Datei,
+        und nur, wenn sie sich seit dem letzten erfolgreichen Warmstart geändert hat (Stand in store_meta).
+        Der Stand wird erst von finish_warm_start eingetragen, bis dahin sperrt 'warm_start_claim'.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")     # Sperrt gegen gleichzeitig startende Worker
+        try:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = 'warm_start_mtime'").fetchone()
+            claim = conn.execute("SELECT value FROM store_meta WHERE key = 'warm_start_claim'").fetchone()
+            now = int(time.time())
+            if (row is not None and row[0] == source_mtime) or \
+                    (claim is not None and now - claim[0] < self.WARM_START_CLAIM_TIMEOUT):
+                conn.execute("COMMIT")
+                return False
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('warm_start_claim', ?)", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def finish_warm_start(self, source_mtime: int, success: bool):
+        """
+        Gibt den Claim frei und merkt sich den Stand der Datei nur nach erfolgreichem Laden,
+        damit ein abgebrochener Warmstart beim nächsten Start wiederholt wird.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if success:
+                conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('warm_start_mtime', ?)",
+                             (source_mtime,))
+            conn.execute("DELETE FROM store_meta WHERE key = 'warm_start_claim'")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+def create_storage() -> JobStorage:
+    """
+    Wählt das Backend über Umgebungsvariablen:
+    JOBS_STORAGE_BACKEND=memory (Standard) oder sqlite, JOBS_SQLITE_PATH=<Datei>.
+    JOBS_DESCRIPTION_BLOB=<Datei> lagert beim Memory-Backend die Beschreibungen in eine
+    mmap-Datei aus (pro Worker-Prozess eine eigene, Endung .<pid>, ohne Verzeichniseintrag).
+    JOBS_WARM_START_FILE=<Datei> lädt beim Start eine Scraper-Ausgabe (JSON-Liste oder NDJSON),
+    beim SQLite-Backend nur einmal für alle Worker und nur, wenn sich die Datei geändert hat.
+    """
+    backend = os.environ.get("JOBS_STORAGE_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        db_path = os.environ.get("JOBS_SQLITE_PATH", "jobs.db")
+        logging.info(f"Verwende SQLite-Speicher: {db_path}")
+        storage = SQLiteJobStorage(db_path)
+    else:
+        if backend != "memory":
+            logging.warning(f"Unbekanntes Storage-Backend '{backend}', verwende In-Memory-Speicher.")
+        blob_path = os.environ.get("JOBS_DESCRIPTION_BLOB")
+        description_blob = DescriptionBlobStore(f"{blob_path}.{os.getpid()}") if blob_path else None
+        if description_blob is not None:
+            logging.info(f"Beschreibungen werden ausgelagert nach: {description_blob.path}")
+        storage = InMemoryJobStorage(description_blob)
+
+    warm_start_file = os.environ.get("JOBS_WARM_START_FILE")
+    if warm_start_file:
+        if not os.path.exists(warm_start_file):
+            logging.warning(f"Warmstart-Datei '{warm_start_file}' nicht gefunden.")
+        else:
+            source_mtime = int(os.path.getmtime(warm_start_file))
+            if storage.claim_warm_start(source_mtime):
+                success = False
+                try:
+                    load_scraper_file(storage, warm_start_file)
+                    success = True
+                finally:
+                    storage.finish_warm_start(source_mtime, success)
+            else:
+                logging.info(f"Warmstart aus '{warm_start_file}' übersprungen: "
+                             f"bereits in der Datenbank oder von einem anderen Worker in Arbeit.")
+    return storage
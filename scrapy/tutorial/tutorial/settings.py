@@ -7,6 +7,12 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+import sys
+
+# Gemeinsamer Bloom-Dupefilter aus scrapy_shared/ (Hauptverzeichnis des Repositorys)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scrapy_shared"))
+
 BOT_NAME = "tutorial"
 
 SPIDER_MODULES = ["tutorial.spiders"]
@@ -14,6 +20,11 @@ NEWSPIDER_MODULE = "tutorial.spiders"
 
 ADDONS = {}
 
+# Request-Duplikate über einen Bloom-Filter auf der Festplatte erkennen, mit JOBDIR auch über Neustarts hinweg
+# (Einstellungen siehe scrapy_shared/bloom_dupefilter.py)
+DUPEFILTER_CLASS = "bloom_dupefilter.BloomDupeFilter"
+BLOOM_DUPEFILTER_ERROR_RATE = 0.001
+
 
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
 #USER_AGENT = "tutorial (+http://www.yourdomain.com)"
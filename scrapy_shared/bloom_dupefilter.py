@@ -0,0 +1,208 @@
+# bloom_dupefilter.py
+# Gemeinsamer Dupefilter für die Scrapy-Projekte (scrapeme, tutorial, edk_crawler).
+# Statt aller Request-Fingerprints im Speicher (Scrapy-Standard, wächst mit jeder URL)
+# ein skalierbarer Bloom-Filter in memory-mapped Dateien: fester Platz pro URL
+# (etwa 1,44 * log2(1/p) Bit), das Betriebssystem hält nur die benutzten Seiten im RAM.
+# Mit JOBDIR (pausierbarer Crawl) bleibt der Filter erhalten, beim Fortsetzen sind alle
+# bereits gesehenen Requests noch bekannt. Ohne JOBDIR beginnt jeder Lauf mit leerem Filter.
+#
+# Einbinden in settings.py:
+#   sys.path.insert(0, "<Pfad zu>/scrapy_shared")
+#   DUPEFILTER_CLASS = "bloom_dupefilter.BloomDupeFilter"
+#
+# Einstellungen:
+#   BLOOM_DUPEFILTER_DIR         Verzeichnis der Filterdateien (Standard: <JOBDIR>/bloom, ohne JOBDIR
+#                                .scrapy/bloom/<Spidername>)
+#   BLOOM_DUPEFILTER_CAPACITY    Einträge im ersten Teilfilter (Standard: 100000)
+#   BLOOM_DUPEFILTER_ERROR_RATE  Gesamte Falsch-Positiv-Rate (Standard: 0.001)
+#   BLOOM_DUPEFILTER_PERSIST     True = Filter vom letzten Lauf weiterverwenden (Standard: nur mit JOBDIR)
+#
+# Ein Falsch-Positiv bedeutet, dass eine noch nicht besuchte Seite übersprungen wird.
+# Bei persistentem Filter wird alles übersprungen, was ein früherer Lauf schon angefragt hat.
+# Listen- und API-Seiten, die bei jedem Lauf neu geladen werden müssen (Preise, neue Stellen),
+# brauchen deshalb dont_filter=True (siehe pagination.py und edk_spider.py).
+
+import json
+import logging
+import math
+import mmap
+import os
+import shutil
+
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.utils.project import data_path
+
+
+class BloomSlice:
+    """
+    Ein einzelner Bloom-Filter fester Größe in einer memory-mapped Datei.
+    """
+
+    def __init__(self, filename: str, capacity: int, error_rate: float, count: int = 0):
+        self.filename = filename
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = count
+        # Optimale Bitzahl und Anzahl Hashfunktionen für capacity Einträge bei error_rate
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, math.ceil(-math.log2(error_rate)))
+        size = (self.bits + 7) // 8
+
+        self._file = open(filename, 'a+b')
+        if os.path.getsize(filename) != size:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def _positions(self, h1: int, h2: int):
+        # Double Hashing (Kirsch/Mitzenmacher): k Positionen aus zwei Hashwerten
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def contains(self, h1: int, h2: int) -> bool:
+        m = self._map
+        return all(m[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(h1, h2))
+
+    def add(self, h1: int, h2: int):
+        m = self._map
+        for pos in self._positions(h1, h2):
+            m[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+
+class ScalableBloomFilter:
+    """
+    Skalierbarer Bloom-Filter (Almeida et al. 2007): Ist ein Teilfilter voll, kommt ein
+    neuer mit GROWTH-facher Kapazität und strengerer Fehlerrate dazu. Die Summe der
+    Fehlerraten bleibt unter error_rate, egal wie viele URLs es werden.
+    Parameter und Füllstände stehen in meta.json, die Bits in slice-<n>.bin.
+    """
+
+    GROWTH = 2          # Kapazität jedes weiteren Teilfilters
+    TIGHTENING = 0.5    # Fehlerrate jedes weiteren Teilfilters
+    META_FILE = "meta.json"
+
+    def __init__(self, directory: str, capacity: int = 100000, error_rate: float = 0.001):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta = self._load_meta()
+        if meta:
+            # Gespeicherte Parameter gewinnen, sonst passen die Bits nicht mehr
+            if (meta["capacity"], meta["error_rate"]) != (capacity, error_rate):
+                logging.warning(f"Bloom-Filter in '{directory}' nutzt die gespeicherten Parameter "
+                                f"(Kapazität {meta['capacity']}, Fehlerrate {meta['error_rate']}).")
+            capacity, error_rate = meta["capacity"], meta["error_rate"]
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.slices = [self._open_slice(i, count) for i, count in enumerate(meta["counts"] if meta else [0])]
+
+    def _load_meta(self):
+        try:
+            with open(os.path.join(self.directory, self.META_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _open_slice(self, index: int, count: int = 0) -> BloomSlice:
+        # Fehlerraten p0 * r^i summieren sich zu höchstens error_rate
+        slice_error = self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** index
+        return BloomSlice(os.path.join(self.directory, f"slice-{index}.bin"),
+                          self.capacity * self.GROWTH ** index, slice_error, count)
+
+    @staticmethod
+    def _hash_pair(key: bytes):
+        # Der Request-Fingerprint ist bereits ein SHA-1-Hash, seine Bytes sind gleichverteilt
+        return int.from_bytes(key[:8], "little"), int.from_bytes(key[8:16], "little") | 1
+
+    def add(self, key: bytes) -> bool:
+        """
+        Fügt key hinzu. Gibt True zurück, wenn key (wahrscheinlich) schon enthalten war.
+        """
+        h1, h2 = self._hash_pair(key)
+        if any(s.contains(h1, h2) for s in self.slices):
+            return True
+        if self.slices[-1].full:
+            self.slices[-1].flush()
+            self.slices.append(self._open_slice(len(self.slices)))
+            self.save_meta()
+        self.slices[-1].add(h1, h2)
+        return False
+
+    def __len__(self):
+        return sum(s.count for s in self.slices)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum((s.bits + 7) // 8 for s in self.slices)
+
+    def save_meta(self):
+        meta = {"capacity": self.capacity, "error_rate": self.error_rate, "counts": [s.count for s in self.slices]}
+        tmp_path = os.path.join(self.directory, self.META_FILE + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.directory, self.META_FILE))
+
+    def close(self):
+        for s in self.slices:
+            s.close()
+        self.save_meta()
+
+
+class BloomDupeFilter(RFPDupeFilter):
+    """
+    Ersetzt das Fingerprint-Set von RFPDupeFilter durch einen ScalableBloomFilter.
+    Logging und die Statistik "dupefilter/filtered" kommen unverändert von RFPDupeFilter.
+    """
+
+    SAVE_EVERY = 1000   # Füllstände regelmäßig sichern, damit ein Abbruch wenig verliert
+
+    def __init__(self, directory: str, capacity: int = 100000, error_rate: float = 0.001,
+                 persist: bool = False, debug: bool = False, *, fingerprinter=None):
+        super().__init__(None, debug, fingerprinter=fingerprinter)
+        if not persist and os.path.isdir(directory):
+            shutil.rmtree(directory)
+        self.bloom = ScalableBloomFilter(directory, capacity, error_rate)
+        self._added = 0
+        if len(self.bloom):
+            self.logger.info("Bloom-Dupefilter: %d bekannte Requests aus '%s' geladen.", len(self.bloom), directory)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        jobdir = settings.get("JOBDIR")
+        directory = settings.get("BLOOM_DUPEFILTER_DIR")
+        if not directory:
+            directory = os.path.join(jobdir, "bloom") if jobdir else data_path(os.path.join("bloom", crawler.spidercls.name))
+        return cls(
+            directory,
+            capacity=settings.getint("BLOOM_DUPEFILTER_CAPACITY", 100000),
+            error_rate=settings.getfloat("BLOOM_DUPEFILTER_ERROR_RATE", 0.001),
+            # Nur ein fortgesetzter Crawl (JOBDIR) soll bereits gesehene Requests überspringen
+            persist=settings.getbool("BLOOM_DUPEFILTER_PERSIST", bool(jobdir)),
+            debug=settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=crawler.request_fingerprinter,
+        )
+
+    def request_seen(self, request) -> bool:
+        if self.bloom.add(self.fingerprinter.fingerprint(request)):
+            return True
+        self._added += 1
+        if self._added % self.SAVE_EVERY == 0:
+            self.bloom.save_meta()
+        return False
+
+    def close(self, reason: str) -> None:
+        self.bloom.close()
+        self.logger.info("Bloom-Dupefilter: %d Requests in %d Teilfiltern, %.1f MB auf der Festplatte.",
+                         len(self.bloom), len(self.bloom.slices), self.bloom.size_bytes / 1024 / 1024)
@@ -0,0 +1,58 @@
+# pagination.py
+# Listenseiten eines WooCommerce-Shops (z. B. scrapeme.live) auf einmal einplanen.
+# Statt Seite für Seite dem "next"-Link zu folgen, wird die letzte Seitenzahl aus dem
+# Paginierungs-Widget der ersten Seite gelesen:
+#   <a class="page-numbers" href=".../shop/page/48/">48</a>
+# und alle Seiten-URLs nach demselben Muster gebaut. Dann kann Scrapy sie parallel laden.
+
+import re
+
+PAGE_NUMBER_XPATH = '//*[contains(concat(" ", normalize-space(@class), " "), " page-numbers ")]'
+NEXT_PAGE_XPATH = '//a[@class="next page-numbers"]/@href'
+PAGE_IN_URL = re.compile(r'(/page/)(\d+)(/?)')
+
+
+def last_page_link(response):
+    """
+    Liefert (Seitenzahl, URL) der höchsten verlinkten Seite oder None, wenn es kein Widget gibt.
+    """
+    best = None
+    for link in response.xpath(f'{PAGE_NUMBER_XPATH}[self::a]'):
+        text = (link.xpath('normalize-space(.)').get() or "").replace(".", "")
+        href = link.xpath('@href').get()
+        if text.isdigit() and href and (best is None or int(text) > best[0]):
+            best = (int(text), response.urljoin(href))
+    return best
+
+
+def listing_page_urls(response):
+    """
+    URLs der Seiten 2 bis N. Leere Liste, wenn Widget oder URL-Muster fehlen
+    (dann bleibt nur der "next"-Link).
+    """
+    last = last_page_link(response)
+    if last is None:
+        return []
+    last_page, last_url = last
+    if not PAGE_IN_URL.search(last_url):
+        return []
+    return [PAGE_IN_URL.sub(lambda m: f"{m.group(1)}{page}{m.group(3)}", last_url, count=1)
+            for page in range(2, last_page + 1)]
+
+
+def follow_listing_pages(response, callback):
+    """
+    Auf der ersten Listenseite: Requests für alle weiteren Seiten (cb_kwargs fan_out=False,
+    damit diese Seiten nicht erneut verteilen). Ohne Widget wird dem "next"-Link gefolgt.
+    Listenseiten haben dont_filter=True: Sie sollen bei jedem Lauf neu geladen werden,
+    auch mit einem Dupefilter, der sich an frühere Läufe erinnert.
+    """
+    urls = listing_page_urls(response)
+    if urls:
+        for url in urls:
+            yield response.follow(url, callback, cb_kwargs={"fan_out": False}, dont_filter=True)
+        return
+
+    next_page = response.xpath(NEXT_PAGE_XPATH).get()
+    if next_page:
+        yield response.follow(next_page, callback, dont_filter=True)